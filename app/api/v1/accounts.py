@@ -3,17 +3,22 @@ from typing import Annotated
 
 from app.schemas.account import AccountCreate, AccountResponse
 from app.services.account.accounts_service import account_service
-from app.db.session import get_db 
+from app.db.session import DBSession
 from app.db.models.User.user_core import User
 from app.auth.dependencies import get_current_user 
-from sqlalchemy.orm import Session
+from app.core.security.request_rate_limit import RateLimitRule, rate_limit
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
-@router.post("/", response_model=AccountResponse)
+_account_limits = rate_limit(
+    RateLimitRule("accounts:user", limit=5, window=3600, key_by=("user",), algorithm="sliding_log"),
+    RateLimitRule("accounts:ip", limit=30, window=60, key_by=("ip",)),
+)
+
+@router.post("/", response_model=AccountResponse, dependencies=[_account_limits])
 async def create_account(
     account_data: AccountCreate,
-    db: Annotated[Session, Depends(get_db)],
+    db: DBSession,
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     account = await account_service.create_account(
@@ -1,5 +1,4 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.schemas.User.login import LoginRequestOTP as RequestOTP, LoginVerifyOTP as VerifyOTP
 from app.orchestration.UserOnboarding import UserOnboarding
@@ -11,7 +10,7 @@ from app.schemas.User.signup import (
     OTPVerifyResponse, 
     SetPasswordRequest
 )
-from app.db.session import get_db
+from app.db.session import DBSession
 from app.auth.dependencies import get_verified_phone
 
 from app.orchestration.UserOnboarding import (
@@ -20,17 +19,27 @@ from app.orchestration.UserOnboarding import (
 )    
 
 from app.domain.auth.otp_purpose import OTPPurpose
+from app.core.security.request_rate_limit import RateLimitRule, rate_limit
 
 
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+# Guessing is already capped per phone by the OTP lockout; these limits
+# stop a client from spraying guesses across many phones
+_verify_otp_limits = rate_limit(
+    RateLimitRule("verify_otp:phone", limit=10, window=600, key_by=("phone",), algorithm="sliding_log"),
+    RateLimitRule("verify_otp:ip", limit=60, window=60, key_by=("ip",)),
+    RateLimitRule("verify_otp:device", limit=30, window=60, key_by=("device",)),
+)
+
 @router.post("/send-otp")
-async def send_otp_route(payload: RequestOTP):
-    await send_otp(payload.phone, OTPPurpose.LOGIN)
+async def send_otp_route(payload: RequestOTP, request: Request):
+    client_ip = request.client.host if request.client else None
+    await send_otp(payload.phone, OTPPurpose.LOGIN, client_ip)
     return {"status": "otp_sent"}
 
-@router.post("/verify-otp")
+@router.post("/verify-otp", dependencies=[_verify_otp_limits])
 async def verify_otp_route(payload: VerifyOTP):
     valid = await verify_otp(payload.phone, payload.otp, OTPPurpose.LOGIN)
 
@@ -39,14 +48,19 @@ async def verify_otp_route(payload: VerifyOTP):
     return {"valid": True}
 
 @router.post("/signup/phone", response_model=PhoneSubmitResponse)
-async def submit_phone(payload: PhoneSubmitRequest):
-    return await UserOnboarding.submit_phone(payload.phone)
+async def submit_phone(payload: PhoneSubmitRequest, request: Request):
+    client_ip = request.client.host if request.client else None
+    return await UserOnboarding.submit_phone(payload.phone, client_ip=client_ip)
 
 
-@router.post("/signup/verify-otp", response_model=OTPVerifyResponse)
+@router.post(
+    "/signup/verify-otp",
+    response_model=OTPVerifyResponse,
+    dependencies=[_verify_otp_limits],
+)
 async def verify_otp_endpoint(
     payload: OTPVerifyRequest,
-    db: AsyncSession = Depends(get_db)
+    db: DBSession,
 ):
     return await UserOnboarding.verify_otp_and_create_preuser(
         db=db,
@@ -57,7 +71,7 @@ async def verify_otp_endpoint(
 @router.post("/signup/set-password", status_code=204)
 async def set_signup_password(
     payload: SetPasswordRequest,
-    db: AsyncSession = Depends(get_db),
+    db: DBSession,
     phone: str = Depends(get_verified_phone),  # OTP context
 ):
     try:
@@ -1,12 +1,18 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 from app.schemas.transactions import TransactionCreate, TransactionOut
 from app.services.transaction_service import create_transaction
-from app.db.session import get_db
+from app.db.session import DBSession
+from app.core.security.request_rate_limit import RateLimitRule, rate_limit
 
 router = APIRouter(prefix="/transactions",tags=["Transaction"])
 
-@router.post("/", response_model=TransactionOut)
-def post_transaction(payload: TransactionCreate, db: Session = Depends(get_db)):
-    tx = create_transaction(db, payload)
+_transaction_limits = rate_limit(
+    RateLimitRule("transactions:user", limit=60, window=60, key_by=("user",)),
+    RateLimitRule("transactions:ip", limit=120, window=60, key_by=("ip",)),
+    RateLimitRule("transactions:device", limit=60, window=60, key_by=("device",)),
+)
+
+@router.post("/", response_model=TransactionOut, dependencies=[_transaction_limits])
+async def post_transaction(payload: TransactionCreate, db: DBSession):
+    tx = await create_transaction(db, payload)
     return tx
@@ -0,0 +1,209 @@
+"""
+The OTP engine: issuing and verifying one-time passwords.
+
+Login (`/auth/send-otp`, `/auth/verify-otp`) and signup
+(`UserOnboarding`) both go through one OTPEngine, so there is a single
+set of counters per phone and purpose: resend cooldown, burst window,
+daily quota and prefix/IP aggregates on send; failure counter and
+lockout on verify.
+
+Storage is pluggable through the OTPStore protocol; the app uses the
+Redis layouts in `otp_store` behind the Redis circuit breaker. Tests and
+benchmarks run the same store over `InMemoryRedis` to need no server.
+
+Store round trips per operation:
+    send    2   send-limit script, save (on Redis Cluster, plus two
+                rounds of concurrent calls, one per aggregate limit:
+                check before the send-limit script, count after it)
+    verify  1   verify script (compare, count failure, lock)
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Awaitable, Callable
+
+from app.auth.OTP.otp_exceptions import (
+    OTPExpired,
+    OTPLocked,
+    OTPMismatch,
+    OTPRateLimitExceeded,
+    OTPServiceUnavailable,
+)
+from app.core.circuit_breaker import DependencyUnavailable
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security.hashing.otp import hash_otp
+from app.core.security.masking import _mask_phone
+from app.core.security.otp import (
+    DEFAULT_OTP_LENGTH,
+    OTP_EXPIRY,
+    OTP_LOCKOUT_TTL,
+    OTP_VERIFY_MAX_ATTEMPTS,
+    OTP_VERIFY_WINDOW,
+    generate_otp,
+)
+from app.core.security.otp_store import OTPStore, get_otp_store
+from app.core.security.rate_limit import enforce_otp_rate_limit
+from app.core.security.verify_rate_limit import verify_otp_attempt
+from app.core.Utils.phone import normalize_phone
+from app.domain.auth.otp_purpose import OTPPurpose
+from app.domain.auth.otp_state import OTPVerifyStatus
+from app.interegation.SMS.delivery import deliver_sms
+
+logger = get_logger(__name__)
+
+SMSSender = Callable[..., Awaitable[None]]
+
+
+class OTPEngine:
+    """
+    Issue and verify OTPs against one OTPStore.
+
+    Args:
+        store: Storage backend for OTP hashes and counters.
+        deliver: Coroutine sending the SMS, called as
+            `deliver(phone, body, lane=purpose.value)`. Defaults to
+            `deliver_sms`.
+        otp_length: Digits per OTP.
+    """
+
+    def __init__(
+        self,
+        store: OTPStore,
+        *,
+        deliver: SMSSender | None = None,
+        otp_length: int = DEFAULT_OTP_LENGTH,
+    ) -> None:
+        self.store = store
+        self._deliver = deliver
+        self._otp_length = otp_length
+
+    async def send(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        *,
+        client_ip: str | None = None,
+    ) -> None:
+        """
+        Rate-limit, generate, store and deliver an OTP.
+
+        Raises:
+            InvalidPhoneNumber: If the phone cannot be normalized.
+            OTPRateLimitExceeded: If a send limit is hit.
+            OTPServiceUnavailable: If the OTP could not be stored.
+            SMSQueueFull: If SMS delivery is saturated.
+        """
+        phone = normalize_phone(phone)
+        masked_phone = _mask_phone(phone)
+
+        logger.info(
+            "OTP request initiated",
+            extra={"phone": masked_phone, "purpose": purpose}
+        )
+
+        try:
+            await enforce_otp_rate_limit(phone, purpose, client_ip, store=self.store)
+        except OTPRateLimitExceeded:
+            logger.warning(
+                "OTP rate limit exceeded",
+                extra={"phone": masked_phone, "purpose": purpose}
+            )
+            raise
+
+        otp = generate_otp(self._otp_length)
+        otp_hash = hash_otp(otp=otp, identifier=phone)
+
+        try:
+            await self.store.save_otp(phone, purpose, otp_hash, ttl=OTP_EXPIRY)
+        except DependencyUnavailable as exc:
+            logger.error(
+                "OTP could not be stored",
+                extra={"phone": masked_phone, "purpose": purpose}
+            )
+            raise OTPServiceUnavailable(
+                "OTP service is temporarily unavailable.",
+                retry_after=math.ceil(settings.REDIS_BREAKER_RESET_TIMEOUT),
+            ) from exc
+
+        deliver = self._deliver or deliver_sms
+        await deliver(phone, f"Your OTP is {otp}", lane=purpose.value)
+
+        logger.info(
+            "OTP generated and queued for delivery",
+            extra={"phone": masked_phone, "purpose": purpose}
+        )
+
+    async def verify(self, phone: str, otp: str, purpose: OTPPurpose) -> None:
+        """
+        Verify an OTP; the stored OTP is consumed on success.
+
+        Raises:
+            InvalidPhoneNumber: If the phone cannot be normalized.
+            OTPLocked: If verification is locked, or this attempt used up
+                the allowed failures.
+            OTPExpired: If no OTP is pending (expired or never issued).
+            OTPMismatch: If the OTP is wrong (or malformed).
+            OTPServiceUnavailable: If OTP state could not be read.
+        """
+        phone = normalize_phone(phone)
+        masked_phone = _mask_phone(phone)
+
+        try:
+            otp_hash = hash_otp(otp=otp, identifier=phone)
+        except ValueError:
+            # Malformed input never matches but still counts as a failure
+            otp_hash = ""
+
+        result = await verify_otp_attempt(
+            phone=phone,
+            purpose=purpose,
+            otp_hash=otp_hash,
+            max_attempts=OTP_VERIFY_MAX_ATTEMPTS,
+            fail_ttl=OTP_VERIFY_WINDOW,
+            lock_ttl=OTP_LOCKOUT_TTL,
+            store=self.store,
+        )
+
+        if result.status == OTPVerifyStatus.LOCKED:
+            logger.warning(
+                "OTP verification blocked due to lockout",
+                extra={"phone": masked_phone, "purpose": purpose}
+            )
+            raise OTPLocked()
+
+        if result.status == OTPVerifyStatus.EXPIRED:
+            logger.warning(
+                "OTP expired or missing",
+                extra={"phone": masked_phone, "purpose": purpose}
+            )
+            raise OTPExpired()
+
+        if result.status == OTPVerifyStatus.LOCKOUT:
+            logger.warning(
+                "OTP verification failed: lockout triggered",
+                extra={"phone": masked_phone, "purpose": purpose}
+            )
+            raise OTPLocked()
+
+        if result.status == OTPVerifyStatus.MISMATCH:
+            logger.warning(
+                "OTP verification failed",
+                extra={
+                    "phone": masked_phone,
+                    "purpose": purpose,
+                    "fail_count": result.fail_count
+                }
+            )
+            raise OTPMismatch()
+
+        logger.info(
+            "OTP verified successfully",
+            extra={"phone": masked_phone, "purpose": purpose}
+        )
+
+
+def get_otp_engine() -> OTPEngine:
+    """Engine over the configured Redis store."""
+    return OTPEngine(get_otp_store())
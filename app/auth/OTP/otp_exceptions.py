@@ -1,6 +1,3 @@
-class OTPRateLimitExceeded(Exception):
-    """Raised when the user exceeds the allowed OTP request limit."""
-
 class OTPException(Exception):
     """Base OTP exception."""
 
@@ -18,17 +15,14 @@ class OTPMismatch(OTPException):
 
 class OTPRateLimitExceeded(Exception):
     """Raised when the user exceeds the allowed OTP request limit."""
-    pass
-
-class OTPVerificationLocked(Exception):
-    """Raised when phone is temporarily locked due to too many failed verifications."""
-    pass
 
+    def __init__(self, message: str = "", *, retry_after: int | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
-class OTPVerificationAttemptsExceeded(Exception):
-    """Raised when user exceeds the allowed OTP verification attempts."""
-    pass
+class OTPServiceUnavailable(Exception):
+    """Raised when OTP state cannot be read or written (Redis unavailable)."""
 
-class OTPInvalid(Exception):
-    """Raised when OTP does not match the stored hash."""
-    pass
\ No newline at end of file
+    def __init__(self, message: str = "", *, retry_after: int | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
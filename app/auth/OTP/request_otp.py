@@ -1,9 +1,9 @@
-from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from passlib.context import CryptContext
 
 from app.db.models.User.user_core import User
+from app.db.statements import USER_BY_PHONE
 from app.schemas.User.signup import SignupRequestOTP    
 
 
@@ -11,10 +11,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 async def request_otp(data: SignupRequestOTP, db: AsyncSession) -> User:
 
-    stmt = select(User).where(
-        (User.phone == data.phone) 
-    )
-    result = await db.execute(stmt)
+    result = await db.execute(USER_BY_PHONE, {"phone": data.phone})
     existing_user = result.scalar_one_or_none()
 
     if existing_user:
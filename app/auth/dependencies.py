@@ -6,10 +6,8 @@ from typing import Annotated
 
 from jose import jwt, JWTError
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import DBSession, READ_REPLICA
 from app.db.models.User.user_core import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login")
@@ -23,7 +21,7 @@ credentials_exception = HTTPException(
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: DBSession,
 ) -> User:
     try:
         payload = jwt.decode(
@@ -42,8 +40,9 @@ async def get_current_user(
         # JWT invalid OR UUID parse failed
         raise credentials_exception
 
-    # Fast primary-key fetch
-    user = await db.get(User, user_uuid)
+    # Fast primary-key fetch; on the replica, since the token already
+    # proves the user exists
+    user = await db.get(User, user_uuid, execution_options=READ_REPLICA)
     if user is None:
         raise credentials_exception
 
@@ -45,3 +45,22 @@ def normalize_phone(phone: str) -> str:
         raise InvalidPhoneNumber("Invalid phone number length")
 
     return f"+{digits}"
+
+
+# Country code + leading subscriber digits identifying the operator and
+# circle (e.g. the 4-digit mobile series in India)
+OPERATOR_PREFIX_DIGITS = 4
+
+
+def phone_prefix(phone: str, digits: int = OPERATOR_PREFIX_DIGITS) -> str:
+    """
+    Number range of a normalized phone: country code + operator digits.
+
+    Example:
+        "+919876543210" -> "+919876"
+
+    Args:
+        phone (str): Output of `normalize_phone`.
+        digits (int): Subscriber digits to keep after the country code.
+    """
+    return phone[: 1 + len(DEFAULT_COUNTRY_CODE) + digits]
@@ -0,0 +1,163 @@
+"""
+Circuit breaker for calls to shared infrastructure (Redis).
+
+Without one, a stalled Redis makes every OTP and rate-limit call wait out
+socket timeouts and retries, and the API stops responding. The breaker
+bounds each call with a timeout and counts consecutive failures:
+
+    closed      calls go through; `failure_threshold` consecutive
+                failures open the circuit
+    open        calls fail immediately with CircuitOpen for
+                `reset_timeout` seconds
+    half-open   one probe call is let through; success closes the
+                circuit, failure opens it again. Other calls keep
+                failing fast while the probe is in flight
+
+Callers catch DependencyUnavailable (raised both for open circuits and
+for failed calls) and degrade: rate limits fall back to in-process
+buckets, OTP storage and verification fail closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from prometheus_client import Counter, Gauge
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["name"],
+)
+CIRCUIT_REJECTED = Counter(
+    "circuit_breaker_rejected_total",
+    "Calls failed fast because the circuit was open",
+    ["name"],
+)
+
+
+class DependencyUnavailable(Exception):
+    """Raised when a guarded dependency failed or is being avoided."""
+
+
+class CircuitOpen(DependencyUnavailable):
+    """Raised without calling the dependency while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for async calls.
+
+    Args:
+        name: Label for logs and metrics.
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_timeout: Seconds the circuit stays open before a probe.
+        call_timeout: Upper bound on each call, in seconds.
+        failures: Exception types counted as dependency failures; other
+            exceptions pass through untouched and count as success.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int,
+        reset_timeout: float,
+        call_timeout: float,
+        failures: tuple[type[BaseException], ...] = (Exception,),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._call_timeout = call_timeout
+        self._failures = failures + (asyncio.TimeoutError,)
+        self._clock = clock
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        CIRCUIT_STATE.labels(name=name).set(0)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.warning(
+                "Circuit breaker state changed",
+                extra={"breaker": self.name, "from": self._state, "to": state},
+            )
+        self._state = state
+        CIRCUIT_STATE.labels(name=self.name).set(_STATE_VALUES[state])
+
+    def _admit(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._set_state(HALF_OPEN)
+            self._probing = True
+            return True
+        return False
+
+    def _on_success(self) -> None:
+        self._consecutive_failures = 0
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+
+    def _on_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+            self._set_state(OPEN)
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """
+        Await `fn(*args, **kwargs)` through the breaker.
+
+        Raises:
+            CircuitOpen: If the circuit is open (fn is not called).
+            DependencyUnavailable: If fn timed out or raised one of the
+                failure types; the original error is chained.
+        """
+        if not self._admit():
+            CIRCUIT_REJECTED.labels(name=self.name).inc()
+            raise CircuitOpen(f"{self.name} circuit is open")
+
+        probe = self._state == HALF_OPEN
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), self._call_timeout)
+        except self._failures as exc:
+            self._on_failure()
+            raise DependencyUnavailable(f"{self.name} call failed") from exc
+        except asyncio.CancelledError:
+            if probe:
+                # Inconclusive probe: stay open, let the next call probe
+                self._set_state(OPEN)
+            raise
+        except Exception:
+            # The dependency answered; the error is the caller's concern
+            self._on_success()
+            raise
+        else:
+            self._on_success()
+            return result
+        finally:
+            if probe:
+                self._probing = False
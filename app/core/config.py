@@ -3,10 +3,54 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     PROJECT_NAME: str = "FinGuard"
     DATABASE_URL: str 
+    # Streaming replica for opted-in reads (see app.db.session); reads go
+    # to DATABASE_URL when unset. Uses the same DB_POOL_* settings.
+    DATABASE_REPLICA_URL: str | None = None
     REDIS_URL: str 
+    # "redis", or "memory" for the in-process InMemoryRedis (tests and
+    # benchmarks only: state is per process)
+    REDIS_BACKEND: str = "redis"
+    # Connect with RedisCluster and hash-tag OTP keys by phone
+    REDIS_CLUSTER: bool = False
+    # Connection pool (max connections is per node in cluster mode)
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 2.0
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 1.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_RETRY_ON_TIMEOUT: bool = True
+    REDIS_RETRY_ATTEMPTS: int = 2
+    # Coalesce concurrent Redis commands into shared pipelines
+    # (window 0 = flush once per event-loop tick)
+    REDIS_AUTO_BATCH: bool = False
+    REDIS_AUTO_BATCH_WINDOW_US: int = 0
+    REDIS_AUTO_BATCH_MAX: int = 512
+    # Circuit breaker around OTP/rate-limit Redis calls: opens after
+    # FAILURE_THRESHOLD consecutive failures or timeouts, probes again
+    # after RESET_TIMEOUT seconds
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_RESET_TIMEOUT: float = 5.0
+    REDIS_BREAKER_CALL_TIMEOUT: float = 0.5
     ENVIRONMENT: str = "development"
 
+    # Database connection pool, per process: with N uvicorn workers the
+    # database sees up to N * (POOL_SIZE + MAX_OVERFLOW) connections.
+    # Connections are replaced after POOL_RECYCLE seconds instead of
+    # being pinged on every checkout (set POOL_PRE_PING to also ping).
+    # WARMUP connections are opened at startup.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_WARMUP: int = 5
+    # asyncpg prepared statements cached per connection (0 behind
+    # PgBouncer in transaction mode)
+    DB_STATEMENT_CACHE_SIZE: int = 500
+
     CELERY_RESULT_BACKEND: str 
+    # Defaults to REDIS_URL
+    CELERY_BROKER_URL: str | None = None
 
     POSTGRES_USER:str
     POSTGRES_PASSWORD:str
@@ -20,6 +64,58 @@ class Settings(BaseSettings):
     PEPPER_ENV_KEY:str 
     OTP_SECRET_KEY: str
     ALGORITHM: str = "HS256"
+
+    # Argon2 hashing pool (0 workers = single background thread)
+    HASHING_POOL_WORKERS: int = 2
+    HASHING_POOL_QUEUE_SIZE: int = 32
+    # Argon2 memory admission control (shared across password/PIN/secret)
+    HASHING_MEMORY_BUDGET_MB: int = 512
+    HASHING_MAX_WAIT_SECONDS: float = 2.0
+
+    # Request rate limiting (see app.core.security.request_rate_limit):
+    # each Redis check leases ~LOCAL_SHARE of a rule's limit to serve
+    # locally for up to LEASE_TTL seconds
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOCAL_SHARE: float = 0.1
+    RATE_LIMIT_LEASE_TTL: float = 1.0
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10_000
+    RATE_LIMIT_DEVICE_HEADER: str = "X-Device-ID"
+    # While Redis is unavailable each worker enforces this share of every
+    # limit on its own
+    RATE_LIMIT_FALLBACK_SHARE: float = 0.25
+
+    # OTP state storage layout in Redis: "keys" or "hash" (compact)
+    OTP_STATE_LAYOUT: str = "keys"
+
+    # SMS provider, by its name in the SMS registry: "console", "http",
+    # "http_secondary" or "hedged"
+    SMS_PROVIDER: str = "console"
+    # HTTP gateway provider (SMS_PROVIDER=http)
+    SMS_HTTP_BASE_URL: str = "http://localhost:9000"
+    SMS_HTTP_API_KEY: str = ""
+    SMS_HTTP_TIMEOUT: float = 2.0
+    SMS_HTTP_MAX_CONNECTIONS: int = 20
+    SMS_HTTP_MAX_CONCURRENCY: int = 20
+    SMS_HTTP_SECONDARY_BASE_URL: str | None = None
+    SMS_HTTP_SECONDARY_API_KEY: str = ""
+    # Hedged dispatch (SMS_PROVIDER=hedged): comma-separated provider names
+    SMS_HEDGE_PROVIDERS: str = "http,http_secondary"
+    SMS_HEDGE_DELAY: float = 1.0
+    SMS_HEDGE_EWMA_ALPHA: float = 0.2
+    # SMS delivery: "queue" (in-process), "celery" or "inline"
+    SMS_DELIVERY_MODE: str = "queue"
+    SMS_QUEUE_WORKERS: int = 4
+    SMS_QUEUE_MAXSIZE: int = 1000
+    SMS_MAX_ATTEMPTS: int = 4
+    SMS_RETRY_BASE_DELAY: float = 0.5
+    SMS_RETRY_MAX_DELAY: float = 30.0
+    # Priority lanes by OTPPurpose: lane -> (weight, shed_at). Workers serve
+    # lanes by weight; a lane refuses new sends once total queue depth
+    # reaches shed_at * SMS_QUEUE_MAXSIZE (signup is shed first)
+    SMS_LANES: dict[str, tuple[int, float]] = {
+        "login": (3, 1.0),
+        "signup": (1, 0.7),
+    }
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
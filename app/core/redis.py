@@ -1,8 +1,135 @@
-from redis.asyncio import Redis
+from redis.asyncio import Redis, BlockingConnectionPool
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.core.redis_batching import AutoBatchingRedis
+from app.core.redis_memory import InMemoryRedis
+from app.core.redis_metrics import InstrumentedRedis, InstrumentedRedisCluster
 
-redis_client = Redis.from_url(
-    settings.REDIS_URL,
-    decode_responses=True  # auto-decode to string
+
+def _retry() -> Retry:
+    return Retry(
+        ExponentialBackoff(cap=0.1, base=0.01),
+        settings.REDIS_RETRY_ATTEMPTS,
+        supported_errors=(ConnectionError, TimeoutError),
+    )
+
+
+def create_redis_client(
+    url: str | None = None,
+    *,
+    cluster: bool | None = None,
+) -> Redis | RedisCluster | InMemoryRedis:
+    """
+    Build a Redis client for the configured deployment.
+
+    - Standalone/Sentinel-fronted Redis: a client over a bounded
+      BlockingConnectionPool (callers wait up to REDIS_POOL_TIMEOUT for
+      a free connection instead of opening unbounded new ones)
+    - Redis Cluster (`REDIS_CLUSTER=true`): `RedisCluster`, which
+      discovers the shards from any seed node in `url` and routes every
+      command, script and pipeline to the slot owner; REDIS_MAX_CONNECTIONS
+      applies per node
+
+    Both use the configured socket timeouts, health checks and retry on
+    connection errors/timeouts, and record per-command latency (see
+    `redis_metrics`). No connection is opened until the first command.
+
+    OTP keys carry `{phone}` hash tags in cluster mode (see `otp_keys`),
+    so all per-phone scripts stay single-slot and OTP load spreads across
+    shards by phone.
+
+    With `REDIS_BACKEND=memory` every call returns a new, empty
+    InMemoryRedis instead (see `redis_memory`) and `url` is ignored.
+    """
+    if settings.REDIS_BACKEND == "memory":
+        return InMemoryRedis()
+    if settings.REDIS_BACKEND != "redis":
+        raise RuntimeError(f"Unknown REDIS_BACKEND {settings.REDIS_BACKEND!r}")
+
+    url = url or settings.REDIS_URL
+    cluster = settings.REDIS_CLUSTER if cluster is None else cluster
+
+    options = dict(
+        decode_responses=True,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        retry=_retry() if settings.REDIS_RETRY_ON_TIMEOUT else None,
+    )
+
+    if cluster:
+        return InstrumentedRedisCluster.from_url(
+            url,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            **options,
+        )
+
+    pool = BlockingConnectionPool.from_url(
+        url,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        retry_on_timeout=settings.REDIS_RETRY_ON_TIMEOUT,
+        **options,
+    )
+    return InstrumentedRedis(connection_pool=pool)
+
+
+def _wrap(client: Redis | RedisCluster) -> Redis | RedisCluster | AutoBatchingRedis:
+    # Nothing to batch without a network round trip
+    if settings.REDIS_AUTO_BATCH and not isinstance(client, InMemoryRedis):
+        return AutoBatchingRedis(
+            client,
+            window=settings.REDIS_AUTO_BATCH_WINDOW_US / 1_000_000,
+            max_batch=settings.REDIS_AUTO_BATCH_MAX,
+        )
+    return client
+
+
+# Created eagerly so modules can register scripts at import time; the pool
+# is opened by `init_redis` and closed by `close_redis` in the app lifespan.
+redis_client = _wrap(create_redis_client())
+
+
+# Guards OTP state and rate-limit calls so a stalled Redis fails them fast
+# instead of hanging requests (see `circuit_breaker`)
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.REDIS_BREAKER_RESET_TIMEOUT,
+    call_timeout=settings.REDIS_BREAKER_CALL_TIMEOUT,
+    failures=(ConnectionError, TimeoutError, OSError),
 )
 
+
+def _unwrap(client) -> Redis | RedisCluster:
+    return client.client if isinstance(client, AutoBatchingRedis) else client
+
+
+async def init_redis() -> None:
+    """
+    Open the pool at startup.
+
+    Pings Redis so a bad URL or unreachable server fails the deploy
+    instead of the first OTP request, and (for clusters) loads the slot
+    map.
+    """
+    if isinstance(_unwrap(redis_client), RedisCluster):
+        await redis_client.initialize()
+    await redis_client.ping()
+
+
+async def close_redis_client(client) -> None:
+    """Close a client built by `create_redis_client`, including its pool."""
+    if isinstance(_unwrap(client), (RedisCluster, InMemoryRedis)):
+        await client.aclose()
+    else:
+        await client.aclose(close_connection_pool=True)
+
+
+async def close_redis() -> None:
+    """Flush pending work and close every pooled connection at shutdown."""
+    await close_redis_client(redis_client)
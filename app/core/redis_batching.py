@@ -0,0 +1,133 @@
+"""
+Opt-in auto-batching wrapper for the shared Redis client.
+
+Under load many coroutines issue tiny independent commands (GET, INCR,
+EXISTS, EVALSHA for the OTP scripts) and each pays a full network round
+trip. `AutoBatchingRedis` queues these commands and, once per event-loop
+tick (or after a short window), sends everything queued so far as one
+non-transactional pipeline, then resolves each caller's future with its
+own reply.
+
+Callers are unaffected: `await redis_client.incr(key)` still returns the
+reply for that command, and command errors (e.g. NOSCRIPT, WRONGTYPE) are
+raised only to the caller that issued them. Commands are not atomic with
+respect to each other; anything that needs atomicity already goes
+through a Lua script.
+
+Commands outside `BATCHED_COMMANDS` (pipelines, scans, script loading,
+connection management) go straight to the wrapped client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.asyncio.cluster import RedisCluster
+
+
+class AutoBatchingRedis:
+    """
+    Coalesce concurrent single-key commands into shared pipelines.
+
+    Args:
+        client: The underlying Redis or RedisCluster client.
+        window: Seconds to wait for more commands after the first one is
+            queued. 0 flushes at the end of the current event-loop tick.
+        max_batch: Flush immediately once this many commands are queued.
+    """
+
+    BATCHED_COMMANDS = frozenset({
+        "get", "set", "mget", "exists", "delete",
+        "incr", "incrby", "decr",
+        "expire", "expireat", "ttl",
+        "hget", "hset", "hdel", "hincrby", "hgetall", "hkeys",
+        "evalsha",
+    })
+
+    def __init__(
+        self,
+        client: Redis | RedisCluster,
+        *,
+        window: float = 0.0,
+        max_batch: int = 512,
+    ):
+        self._client = client
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: list[tuple[str, tuple, dict, asyncio.Future]] = []
+        self._flush_handle: asyncio.Handle | asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> Redis | RedisCluster:
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self.BATCHED_COMMANDS:
+            return functools.partial(self._enqueue, name)
+        return getattr(self._client, name)
+
+    def _enqueue(self, command: str, *args: Any, **kwargs: Any) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((command, args, kwargs, future))
+
+        if len(self._pending) >= self._max_batch:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush()
+        elif self._flush_handle is None:
+            if self._window > 0:
+                self._flush_handle = loop.call_later(self._window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+        return future
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._execute(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _execute(self, batch: list[tuple[str, tuple, dict, asyncio.Future]]) -> None:
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for command, args, kwargs, _ in batch:
+                    getattr(pipe, command)(*args, **kwargs)
+                replies = await pipe.execute(raise_on_error=False)
+        except asyncio.CancelledError:
+            for *_, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            # Connection-level failure: every caller in the batch sees it
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (*_, future), reply in zip(batch, replies):
+            if future.done():
+                # Caller was cancelled while the batch was in flight
+                continue
+            if isinstance(reply, Exception):
+                future.set_exception(reply)
+            else:
+                future.set_result(reply)
+
+    async def aclose(self, **kwargs: Any) -> None:
+        """Flush queued commands, wait for in-flight batches, close the client."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        await self._client.aclose(**kwargs)
@@ -0,0 +1,750 @@
+"""
+In-process stand-in for the Redis client.
+
+InMemoryRedis implements the subset of redis.asyncio commands the app
+uses (strings, counters, expiry, hashes, sorted sets, lists, pipelines
+and script evaluation) over process memory with an injectable clock, so
+the OTP and rate-limit code paths can be tested and benchmarked without
+a Redis server. Select it with `REDIS_BACKEND=memory` (see
+`app.core.redis`), or assign an instance to `app.core.redis.redis_client`
+in a test.
+
+Expiry follows Redis: writes that replace a value (SET) clear its TTL,
+in-place updates (INCR, HSET, ZADD, LPUSH) keep it, a non-positive
+EXPIRE deletes the key, and TTL/PTTL return -2 for missing keys and -1
+for keys without expiry. Expired keys are dropped lazily on access and
+by `sweep()`.
+
+Scripts are the app's own Lua, run by an embedded Lua 5.1 interpreter
+(the `lupa` package, a dev dependency; only needed once a script is
+evaluated). `redis.call` / `redis.pcall` dispatch to the keyspace with
+Redis' reply conversions, and SCRIPT LOAD / EVALSHA / EVAL keep a
+per-keyspace script cache keyed by SHA1. A script runs synchronously
+against the keyspace, so it is atomic just like on Redis, and the
+scripts tested here are exactly the ones Redis runs.
+
+Replies follow `decode_responses=True`: values written as text come
+back as str, values written as bytes come back unchanged.
+
+State is per process and is lost on restart; never use this backend for
+a multi-worker deployment.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Callable, Iterable
+
+from redis.exceptions import DataError, NoScriptError, ResponseError
+
+Value = str | bytes
+
+_WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+_NOT_INTEGER = "value is not an integer or out of range"
+
+
+def _script_sha(script: str | bytes) -> str:
+    if isinstance(script, str):
+        script = script.encode("utf-8")
+    return hashlib.sha1(script).hexdigest()
+
+
+def _encode(value: Any) -> Value:
+    """Encode an argument like the redis-py client does."""
+    if isinstance(value, (bytes, str)):
+        return value
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if isinstance(value, bool):
+        raise DataError("Invalid input of type: 'bool'. Convert to a bytes, string, int or float first.")
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    raise DataError(f"Invalid input of type: {type(value).__name__!r}.")
+
+
+def _to_int(value: Value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ResponseError(_NOT_INTEGER) from None
+
+
+def _score_bound(value: Any) -> tuple[float, bool]:
+    """Parse a ZRANGEBYSCORE-style bound into (score, exclusive)."""
+    value = _encode(value)
+    if isinstance(value, bytes):
+        value = value.decode()
+    if value.startswith("("):
+        return float(value[1:]), True
+    return float(value), False
+
+
+def _range(items: list, start: int, end: int) -> list:
+    """Slice with Redis LRANGE/ZRANGE index semantics (inclusive, negative from end)."""
+    size = len(items)
+    start = max(0, start + size if start < 0 else start)
+    end = end + size if end < 0 else min(end, size - 1)
+    return items[start:end + 1] if start <= end else []
+
+
+class _Hash(dict):
+    """field -> value"""
+
+
+class _SortedSet(dict):
+    """member -> score"""
+
+
+class MemoryKeyspace:
+    """
+    Synchronous Redis command set over dicts.
+
+    Values are str or bytes, hashes are dicts of str/bytes, sorted sets
+    are member -> score dicts and lists are Python lists. Scripts reach
+    these commands through `redis.call` (see `_SCRIPT_COMMANDS`).
+
+    Args:
+        clock: Wall-clock seconds, injectable for tests.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._data: dict[str, Any] = {}
+        # key -> absolute expiry (seconds)
+        self._expires: dict[str, float] = {}
+        self._lua: _LuaScripts | None = None
+
+    # -- keyspace ----------------------------------------------------------
+
+    def _live(self, key: str) -> Any:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= self._clock():
+            del self._expires[key]
+            del self._data[key]
+            return None
+        return self._data.get(key)
+
+    def _typed(self, key: str, kind: type | tuple[type, ...]) -> Any:
+        value = self._live(key)
+        if value is not None and not isinstance(value, kind):
+            raise ResponseError(_WRONGTYPE)
+        return value
+
+    def _store(self, key: str, value: Any) -> None:
+        """Replace the value, keeping any TTL (callers clear it if needed)."""
+        self._data[key] = value
+
+    def _drop_if_empty(self, key: str) -> None:
+        if not self._data.get(key):
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+
+    def time(self) -> tuple[int, int]:
+        """TIME: (seconds, microseconds)."""
+        now = self._clock()
+        seconds = int(now)
+        return seconds, int((now - seconds) * 1_000_000)
+
+    def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    def pexpireat(self, key: str, when_ms: float) -> int:
+        if self._live(key) is None:
+            return 0
+        if when_ms <= self._clock() * 1000:
+            self.delete(key)
+        else:
+            self._expires[key] = when_ms / 1000
+        return 1
+
+    def expire(self, key: str, seconds: Any) -> int:
+        return self.pexpire(key, _to_int(_encode(seconds)) * 1000)
+
+    def pexpire(self, key: str, ms: Any) -> int:
+        return self.pexpireat(key, self._clock() * 1000 + _to_int(_encode(ms)))
+
+    def expireat(self, key: str, when: Any) -> int:
+        return self.pexpireat(key, _to_int(_encode(when)) * 1000)
+
+    def persist(self, key: str) -> int:
+        if self._live(key) is None:
+            return 0
+        return 1 if self._expires.pop(key, None) is not None else 0
+
+    def pttl(self, key: str) -> int:
+        if self._live(key) is None:
+            return -2
+        expires_at = self._expires.get(key)
+        if expires_at is None:
+            return -1
+        return max(0, round((expires_at - self._clock()) * 1000))
+
+    def ttl(self, key: str) -> int:
+        ms = self.pttl(key)
+        # Redis rounds the remaining milliseconds to the nearest second
+        return ms if ms < 0 else (ms + 500) // 1000
+
+    def dbsize(self) -> int:
+        self.sweep()
+        return len(self._data)
+
+    def flushdb(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    def sweep(self) -> int:
+        """Drop every expired key; returns how many were removed."""
+        now = self._clock()
+        expired = [key for key, at in self._expires.items() if at <= now]
+        for key in expired:
+            del self._expires[key]
+            del self._data[key]
+        return len(expired)
+
+    # -- strings -----------------------------------------------------------
+
+    def get(self, key: str) -> Value | None:
+        return self._typed(key, (str, bytes))
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ex: int | None = None,
+        px: int | None = None,
+        nx: bool = False,
+        xx: bool = False,
+        keepttl: bool = False,
+        get: bool = False,
+    ) -> Any:
+        previous = self._live(key)
+        if get and previous is not None and not isinstance(previous, (str, bytes)):
+            raise ResponseError(_WRONGTYPE)
+        if (nx and previous is not None) or (xx and previous is None):
+            return previous if get else None
+
+        self._data[key] = _encode(value)
+        if not keepttl:
+            self._expires.pop(key, None)
+        if ex is not None:
+            self.expire(key, ex)
+        elif px is not None:
+            self.pexpire(key, px)
+        return previous if get else True
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        value = _to_int(self._typed(key, (str, bytes)) or "0") + amount
+        self._store(key, str(value))
+        return value
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self.incrby(key, amount)
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        return self.incrby(key, -amount)
+
+    # -- hashes ------------------------------------------------------------
+
+    def _hash(self, key: str, create: bool = False) -> dict:
+        data = self._typed(key, _Hash)
+        if data is None:
+            data = _Hash()
+            if create:
+                self._store(key, data)
+        return data
+
+    def hget(self, key: str, field: Any) -> Value | None:
+        return self._hash(key).get(_encode(field))
+
+    def hmget(self, key: str, keys: Any, *args: Any) -> list:
+        fields = [keys] if isinstance(keys, (str, bytes)) else list(keys)
+        fields += args
+        data = self._hash(key)
+        return [data.get(_encode(field)) for field in fields]
+
+    def hgetall(self, key: str) -> dict:
+        return dict(self._hash(key))
+
+    def hkeys(self, key: str) -> list:
+        return list(self._hash(key))
+
+    def hlen(self, key: str) -> int:
+        return len(self._hash(key))
+
+    def hset(
+        self,
+        key: str,
+        field: Any = None,
+        value: Any = None,
+        mapping: dict | None = None,
+        items: list | None = None,
+    ) -> int:
+        pairs: list[tuple[Any, Any]] = []
+        if field is not None:
+            pairs.append((field, value))
+        if mapping:
+            pairs.extend(mapping.items())
+        if items:
+            pairs.extend(zip(items[::2], items[1::2]))
+        if not pairs:
+            raise DataError("'hset' with no key value pairs")
+
+        data = self._hash(key, create=True)
+        added = 0
+        for f, v in pairs:
+            f = _encode(f)
+            added += f not in data
+            data[f] = _encode(v)
+        return added
+
+    def hincrby(self, key: str, field: Any, amount: int = 1) -> int:
+        data = self._hash(key, create=True)
+        field = _encode(field)
+        value = _to_int(data.get(field, "0")) + amount
+        data[field] = str(value)
+        return value
+
+    def hdel(self, key: str, *fields: Any) -> int:
+        data = self._hash(key)
+        removed = 0
+        for field in fields:
+            removed += data.pop(_encode(field), None) is not None
+        self._drop_if_empty(key)
+        return removed
+
+    # -- sorted sets -------------------------------------------------------
+
+    def _zset(self, key: str, create: bool = False) -> dict:
+        data = self._typed(key, _SortedSet)
+        if data is None:
+            data = _SortedSet()
+            if create:
+                self._store(key, data)
+        return data
+
+    def zadd(self, key: str, mapping: dict) -> int:
+        data = self._zset(key, create=True)
+        added = 0
+        for member, score in mapping.items():
+            member = _encode(member)
+            added += member not in data
+            data[member] = float(score)
+        return added
+
+    def zcard(self, key: str) -> int:
+        return len(self._zset(key))
+
+    def zrange(
+        self,
+        key: str,
+        start: int,
+        end: int,
+        withscores: bool = False,
+    ) -> list:
+        entries = sorted((score, member) for member, score in self._zset(key).items())
+        selected = _range(entries, start, end)
+        if withscores:
+            return [(member, score) for score, member in selected]
+        return [member for _, member in selected]
+
+    def zremrangebyscore(self, key: str, min: Any, max: Any) -> int:
+        low, low_open = _score_bound(min)
+        high, high_open = _score_bound(max)
+        data = self._zset(key)
+        doomed = [
+            member
+            for member, score in data.items()
+            if (score > low if low_open else score >= low)
+            and (score < high if high_open else score <= high)
+        ]
+        for member in doomed:
+            del data[member]
+        self._drop_if_empty(key)
+        return len(doomed)
+
+    # -- lists -------------------------------------------------------------
+
+    def lpush(self, key: str, *values: Any) -> int:
+        data = self._typed(key, list)
+        if data is None:
+            data = []
+            self._store(key, data)
+        for value in values:
+            data.insert(0, _encode(value))
+        return len(data)
+
+    def llen(self, key: str) -> int:
+        return len(self._typed(key, list) or [])
+
+    def lrange(self, key: str, start: int, end: int) -> list:
+        return _range(self._typed(key, list) or [], start, end)
+
+    def ltrim(self, key: str, start: int, end: int) -> bool:
+        data = self._typed(key, list)
+        if data is not None:
+            data[:] = self.lrange(key, start, end)
+            self._drop_if_empty(key)
+        return True
+
+    # -- scripts -----------------------------------------------------------
+
+    def script_load(self, script: str | bytes) -> str:
+        if self._lua is None:
+            self._lua = _LuaScripts(self)
+        return self._lua.load(script)
+
+    def evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        if self._lua is None or not self._lua.exists(sha):
+            raise NoScriptError("No matching script. Please use EVAL.")
+        keys = [_encode(key) for key in keys_and_args[:numkeys]]
+        argv = [_encode(arg) for arg in keys_and_args[numkeys:]]
+        return self._lua.run(sha, keys, argv)
+
+
+# -- scripting ---------------------------------------------------------------
+
+
+class _Status(str):
+    """A status reply (e.g. SET's OK), which Lua sees as {ok = ...}."""
+
+
+def _text(value: bytes) -> Value:
+    """Lua strings are bytes; hand back text as str like decode_responses."""
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        return value
+
+
+def _format_score(score: float) -> str:
+    return str(int(score)) if score.is_integer() else repr(score)
+
+
+def _pairs(args: list) -> list[tuple[Value, Value]]:
+    if not args or len(args) % 2:
+        raise ResponseError("wrong number of arguments")
+    return list(zip(args[::2], args[1::2]))
+
+
+def _script_set(db: MemoryKeyspace, args: list) -> Any:
+    options: dict[str, Any] = {}
+    rest = iter(args[2:])
+    for option in rest:
+        option = str(option).upper()
+        if option in ("EX", "PX"):
+            options[option.lower()] = _to_int(next(rest, None))
+        elif option in ("NX", "XX", "KEEPTTL", "GET"):
+            options[option.lower()] = True
+        else:
+            raise ResponseError("syntax error")
+    reply = db.set(args[0], args[1], **options)
+    return _Status("OK") if reply is True else reply
+
+
+def _script_zrange(db: MemoryKeyspace, args: list) -> list:
+    options = {str(option).upper() for option in args[3:]}
+    if options - {"WITHSCORES"}:
+        raise ResponseError("syntax error")
+    entries = db.zrange(args[0], _to_int(args[1]), _to_int(args[2]), "WITHSCORES" in options)
+    if "WITHSCORES" not in options:
+        return entries
+    return [item for member, score in entries for item in (member, _format_score(score))]
+
+
+# redis.call command -> handler(keyspace, args) returning a Redis reply
+_SCRIPT_COMMANDS: dict[str, Callable[[MemoryKeyspace, list], Any]] = {
+    "TIME": lambda db, a: [str(part) for part in db.time()],
+    "EXISTS": lambda db, a: db.exists(*a),
+    "DEL": lambda db, a: db.delete(*a),
+    "EXPIRE": lambda db, a: db.expire(a[0], a[1]),
+    "PEXPIRE": lambda db, a: db.pexpire(a[0], a[1]),
+    "EXPIREAT": lambda db, a: db.expireat(a[0], a[1]),
+    "PEXPIREAT": lambda db, a: db.pexpireat(a[0], _to_int(a[1])),
+    "PERSIST": lambda db, a: db.persist(a[0]),
+    "TTL": lambda db, a: db.ttl(a[0]),
+    "PTTL": lambda db, a: db.pttl(a[0]),
+    "GET": lambda db, a: db.get(a[0]),
+    "SET": _script_set,
+    "INCR": lambda db, a: db.incr(a[0]),
+    "INCRBY": lambda db, a: db.incrby(a[0], _to_int(a[1])),
+    "DECR": lambda db, a: db.decr(a[0]),
+    "HGET": lambda db, a: db.hget(a[0], a[1]),
+    "HMGET": lambda db, a: db.hmget(a[0], a[1:]),
+    "HGETALL": lambda db, a: [item for pair in db.hgetall(a[0]).items() for item in pair],
+    "HKEYS": lambda db, a: db.hkeys(a[0]),
+    "HLEN": lambda db, a: db.hlen(a[0]),
+    "HSET": lambda db, a: db.hset(a[0], items=[i for p in _pairs(a[1:]) for i in p]),
+    "HINCRBY": lambda db, a: db.hincrby(a[0], a[1], _to_int(a[2])),
+    "HDEL": lambda db, a: db.hdel(a[0], *a[1:]),
+    "ZADD": lambda db, a: db.zadd(a[0], {m: float(s) for s, m in _pairs(a[1:])}),
+    "ZCARD": lambda db, a: db.zcard(a[0]),
+    "ZRANGE": _script_zrange,
+    "ZREMRANGEBYSCORE": lambda db, a: db.zremrangebyscore(a[0], a[1], a[2]),
+}
+
+_LUA_PRELUDE = """
+local call, pcall_ = ...
+redis = {
+    call = call,
+    pcall = pcall_,
+    status_reply = function(status) return {ok = status} end,
+    error_reply = function(message) return {err = message} end,
+}
+"""
+
+
+def _lua_runtime():
+    try:
+        # The Lua version Redis embeds
+        from lupa.lua51 import LuaRuntime
+    except ImportError:
+        try:
+            from lupa import LuaRuntime
+        except ImportError:
+            raise ResponseError(
+                "InMemoryRedis runs Lua scripts with the 'lupa' package; install it"
+            ) from None
+    return LuaRuntime(encoding=None, unpack_returned_tuples=False, register_eval=False)
+
+
+class _LuaScripts:
+    """Script cache and `redis.*` bridge for one keyspace."""
+
+    def __init__(self, keyspace: MemoryKeyspace) -> None:
+        self._keyspace = keyspace
+        self._runtime = _lua_runtime()
+        self._lua_type = self._runtime.eval("type")
+        self._runtime.execute(_LUA_PRELUDE, self._call, self._pcall)
+        self._scripts: dict[str, Any] = {}
+
+    def exists(self, sha: str) -> bool:
+        return sha in self._scripts
+
+    def load(self, script: str | bytes) -> str:
+        sha = _script_sha(script)
+        if sha not in self._scripts:
+            source = script.encode("utf-8") if isinstance(script, str) else script
+            try:
+                self._scripts[sha] = self._runtime.eval(
+                    b"function(KEYS, ARGV)\n" + source + b"\nend"
+                )
+            except Exception as exc:
+                raise ResponseError(f"Error compiling script: {exc}") from None
+        return sha
+
+    def run(self, sha: str, keys: list, argv: list) -> Any:
+        table = self._runtime.table_from
+        try:
+            reply = self._scripts[sha](
+                table([self._to_lua(key) for key in keys]),
+                table([self._to_lua(arg) for arg in argv]),
+            )
+        except ResponseError:
+            raise
+        except Exception as exc:
+            raise ResponseError(f"Error running script: {exc}") from None
+        return self._from_lua(reply)
+
+    # redis.call / redis.pcall
+
+    def _call(self, *args: Any) -> Any:
+        if not args:
+            raise ResponseError("Please specify at least one argument for this redis lib call")
+        args = [self._argument(arg) for arg in args]
+        name = str(args[0]).upper()
+        handler = _SCRIPT_COMMANDS.get(name)
+        if handler is None:
+            raise ResponseError(f"Unknown Redis command called from script: {name}")
+        try:
+            reply = handler(self._keyspace, args[1:])
+        except IndexError:
+            raise ResponseError(f"Wrong number of args calling Redis command from script: {name}") from None
+        return self._to_lua(reply)
+
+    def _pcall(self, *args: Any) -> Any:
+        try:
+            return self._call(*args)
+        except ResponseError as exc:
+            return self._runtime.table_from({b"err": str(exc).encode()})
+
+    # conversions
+
+    @staticmethod
+    def _argument(value: Any) -> Value:
+        """A redis.call argument as Redis receives it."""
+        if isinstance(value, bytes):
+            return _text(value)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ResponseError("Lua redis lib command arguments must be strings or integers")
+        if isinstance(value, float):
+            return _format_score(value)
+        return str(value)
+
+    def _to_lua(self, reply: Any) -> Any:
+        """A command reply as Lua sees it."""
+        if reply is None:
+            return False
+        if isinstance(reply, _Status):
+            return self._runtime.table_from({b"ok": reply.encode()})
+        if isinstance(reply, bool):
+            return int(reply)
+        if isinstance(reply, str):
+            return reply.encode("utf-8")
+        if isinstance(reply, (list, tuple)):
+            return self._runtime.table_from([self._to_lua(item) for item in reply])
+        return reply
+
+    def _from_lua(self, value: Any) -> Any:
+        """A script's return value as the client sees it."""
+        if value is None or value is False:
+            return None
+        if value is True:
+            return 1
+        if isinstance(value, float):
+            return int(value)
+        if isinstance(value, bytes):
+            return _text(value)
+        if self._lua_type(value) != b"table":
+            return value
+        if value[b"err"] is not None:
+            raise ResponseError(_text(value[b"err"]))
+        if value[b"ok"] is not None:
+            return _text(value[b"ok"])
+        items = []
+        # Like Redis, the array ends at the first nil
+        while (item := value[len(items) + 1]) is not None:
+            items.append(self._from_lua(item))
+        return items
+
+
+# Commands InMemoryRedis exposes as coroutines (and pipelines queue)
+_COMMANDS = (
+    "time", "exists", "delete", "expire", "pexpire", "expireat", "pexpireat",
+    "persist", "ttl", "pttl", "dbsize", "flushdb",
+    "get", "set", "incr", "incrby", "decr",
+    "hget", "hmget", "hgetall", "hkeys", "hlen", "hset", "hincrby", "hdel",
+    "zadd", "zcard", "zrange", "zremrangebyscore",
+    "lpush", "llen", "lrange", "ltrim",
+    "evalsha",
+)
+
+
+class MemoryScript:
+    """Script object returned by `InMemoryRedis.register_script`."""
+
+    def __init__(self, registered_client: "InMemoryRedis", script: str) -> None:
+        self.registered_client = registered_client
+        self.script = script
+        self.sha = _script_sha(script)
+
+    async def __call__(
+        self,
+        keys: Iterable | None = None,
+        args: Iterable | None = None,
+        client: Any = None,
+    ) -> Any:
+        keys = list(keys or [])
+        client = client or self.registered_client
+        try:
+            return await client.evalsha(self.sha, len(keys), *keys, *(args or []))
+        except NoScriptError:
+            self.sha = await client.script_load(self.script)
+            return await client.evalsha(self.sha, len(keys), *keys, *(args or []))
+
+
+class MemoryPipeline:
+    """Queues commands and runs them in order on `execute()`."""
+
+    def __init__(self, keyspace: MemoryKeyspace) -> None:
+        self._keyspace = keyspace
+        self._queue: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if name not in _COMMANDS:
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs) -> "MemoryPipeline":
+            self._queue.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    async def execute(self, raise_on_error: bool = True) -> list:
+        queued, self._queue = self._queue, []
+        results = []
+        for name, args, kwargs in queued:
+            try:
+                results.append(getattr(self._keyspace, name)(*args, **kwargs))
+            except ResponseError as exc:
+                if raise_on_error:
+                    raise
+                results.append(exc)
+        return results
+
+    def reset(self) -> None:
+        self._queue = []
+
+    async def __aenter__(self) -> "MemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.reset()
+
+
+class InMemoryRedis:
+    """
+    Async Redis client over a MemoryKeyspace.
+
+    Args:
+        clock: Wall-clock seconds, injectable for tests.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.keyspace = MemoryKeyspace(clock)
+
+    def __getattr__(self, name: str):
+        if name not in _COMMANDS:
+            raise AttributeError(name)
+        command = getattr(self.keyspace, name)
+
+        async def call(*args, **kwargs):
+            return command(*args, **kwargs)
+
+        return call
+
+    async def ping(self) -> bool:
+        return True
+
+    async def flushall(self) -> bool:
+        return self.keyspace.flushdb()
+
+    async def script_load(self, script: str) -> str:
+        return self.keyspace.script_load(script)
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        return self.keyspace.evalsha(await self.script_load(script), numkeys, *keys_and_args)
+
+    def register_script(self, script: str) -> MemoryScript:
+        return MemoryScript(self, script)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None) -> MemoryPipeline:
+        return MemoryPipeline(self.keyspace)
+
+    async def aclose(self, close_connection_pool: bool | None = None) -> None:
+        return None
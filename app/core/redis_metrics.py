@@ -0,0 +1,97 @@
+"""
+Per-command Redis latency histograms.
+
+Commands are labelled by name and by key prefix: the first two key
+segments when they name one of the key builders in `otp_keys`
+(`otp:window`, `otp_fail:signup`, `otp:agg`), `rl` for request rate
+limits, and `other` for anything else. Keys carry client-supplied data
+(phones, IPs, hash tags), so the label never takes arbitrary key text;
+its cardinality is fixed by the allow-list below. For EVALSHA the first
+key is used, which identifies the script (the keyspace send-limit
+script starts with `otp:cooldown`, the verify script with
+`otp:{purpose}`).
+
+Commands sent through pipelines (including auto-batched ones) are not
+timed individually.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from prometheus_client import Histogram
+from redis.asyncio import Redis
+from redis.asyncio.cluster import RedisCluster
+
+from app.domain.auth.otp_purpose import OTPPurpose
+
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command round-trip latency",
+    ["command", "key_prefix"],
+    buckets=(
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+        0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    ),
+)
+
+# Commands whose first key follows the SHA/script and numkeys arguments
+_SCRIPT_COMMANDS = {"EVALSHA", "EVAL", "EVALSHA_RO", "EVAL_RO"}
+
+# Two-segment prefixes of the `otp_keys` builders
+_KEY_PREFIXES = frozenset({
+    *(
+        f"{kind}:{purpose.value}"
+        for kind in ("otp", "otp_fail", "otp_lock")
+        for purpose in OTPPurpose
+    ),
+    "otp:cooldown",
+    "otp:window",
+    "otp:daily",
+    "otp:state",
+    "otp:agg",
+    "otp:agg_block",
+})
+# Namespaces labelled by their first segment only
+_KEY_NAMESPACES = frozenset({"rl"})
+
+
+def _key_prefix(args: tuple) -> str:
+    command = str(args[0]).upper()
+    if command in _SCRIPT_COMMANDS:
+        key = args[3] if len(args) > 3 and int(args[2]) > 0 else None
+    else:
+        key = args[1] if len(args) > 1 else None
+
+    if key is None:
+        return "-"
+    if isinstance(key, bytes):
+        key = key.decode(errors="replace")
+    segments = str(key).split(":", 2)
+    prefix = ":".join(segments[:2])
+    if prefix in _KEY_PREFIXES:
+        return prefix
+    if segments[0] in _KEY_NAMESPACES:
+        return segments[0]
+    return "other"
+
+
+class _CommandTimingMixin:
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(
+                command=str(args[0]).lower(),
+                key_prefix=_key_prefix(args),
+            ).observe(time.perf_counter() - started)
+
+
+class InstrumentedRedis(_CommandTimingMixin, Redis):
+    """Redis client that records per-command latency."""
+
+
+class InstrumentedRedisCluster(_CommandTimingMixin, RedisCluster):
+    """RedisCluster client that records per-command latency."""
@@ -62,6 +62,10 @@ class HashingError(Exception):
     """Base exception for hashing-related failures."""
 
 
+class HashingOverloaded(HashingError):
+    """Raised when hashing capacity is exhausted and the caller should retry."""
+
+
 from typing import Protocol
 
 class Hasher(Protocol):
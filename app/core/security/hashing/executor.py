@@ -0,0 +1,152 @@
+"""
+Off-loop execution of CPU-bound hashing work.
+
+Argon2id with 64 MB / time_cost=3 takes hundreds of milliseconds of pure
+CPU per call. Running it inside an `async def` handler blocks the event
+loop for the whole duration, stalling every other request served by the
+same worker (OTP sends, token checks, health probes).
+
+This module provides a small process pool dedicated to hashing:
+
+- Work is submitted from async code and awaited without blocking the loop
+- The number of outstanding jobs is bounded (workers + queue slots);
+  submissions beyond that are rejected immediately with HashingQueueFull
+  instead of building an unbounded backlog
+- Each job reserves its Argon2 memory cost from a shared MemoryBudget
+  before it is submitted, so concurrent hashes never exceed the
+  configured memory ceiling (see scheduler.py)
+- The pool is created lazily and shut down from the application lifespan
+
+Only module-level, picklable callables may be submitted. Peppering and
+input validation must happen in the caller before submission so that no
+secret-handling policy lives in the worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+from app.core.security.hashing.base import HashingOverloaded
+from app.core.security.hashing.scheduler import MemoryBudget
+
+T = TypeVar("T")
+
+
+class HashingQueueFull(HashingOverloaded):
+    """Raised when the hashing pool has no free worker or queue slot."""
+
+
+class HashingPool:
+    """
+    Bounded executor for CPU-bound hashing functions.
+
+    Args:
+        max_workers: Number of worker processes. 0 runs hashing on a single
+            background thread instead (useful for tests and tiny deployments).
+        queue_size: Number of jobs allowed to wait for a free worker.
+        budget: Memory budget shared by every job submitted to this pool.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        queue_size: int,
+        budget: MemoryBudget,
+    ) -> None:
+        if max_workers < 0:
+            raise ValueError("max_workers must be >= 0")
+        if queue_size < 0:
+            raise ValueError("queue_size must be >= 0")
+
+        self._max_workers = max_workers
+        self._capacity = max(max_workers, 1) + queue_size
+        self._budget = budget
+        self._executor: Executor | None = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of jobs currently running or queued."""
+        return self._in_flight
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of jobs running or queued at once."""
+        return self._capacity
+
+    @property
+    def budget(self) -> MemoryBudget:
+        return self._budget
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._max_workers == 0:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="hashing",
+                )
+            else:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, memory_kib: int) -> T:
+        """
+        Run `fn(*args)` in the pool and await its result.
+
+        `memory_kib` is reserved from the memory budget until the job has
+        actually finished in the worker, even if the awaiting request is
+        cancelled earlier.
+
+        Raises:
+            HashingQueueFull: If all workers and queue slots are taken.
+            HashingAdmissionTimeout: If the memory budget stays exhausted
+                for longer than the configured max wait.
+        """
+        if self._in_flight >= self._capacity:
+            raise HashingQueueFull("Hashing capacity exhausted, retry later")
+
+        self._in_flight += 1
+        try:
+            await self._budget.acquire(memory_kib)
+        except BaseException:
+            self._in_flight -= 1
+            raise
+
+        loop = asyncio.get_running_loop()
+        try:
+            job = loop.run_in_executor(self._get_executor(), fn, *args)
+        except BaseException:
+            self._finish(memory_kib)
+            raise
+
+        job.add_done_callback(lambda done: self._finish(memory_kib, done))
+        return await asyncio.shield(job)
+
+    def _finish(self, memory_kib: int, job: asyncio.Future | None = None) -> None:
+        self._in_flight -= 1
+        self._budget.release(memory_kib)
+        if job is not None and not job.cancelled():
+            # Mark the result as retrieved if the caller went away.
+            job.exception()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop worker processes. The pool is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    max_workers=settings.HASHING_POOL_WORKERS,
+    queue_size=settings.HASHING_POOL_QUEUE_SIZE,
+    budget=MemoryBudget(
+        budget_kib=settings.HASHING_MEMORY_BUDGET_MB * 1024,
+        max_wait=settings.HASHING_MAX_WAIT_SECONDS,
+    ),
+)
@@ -1,22 +1,90 @@
+"""
+Hashing for server-issued secrets (refresh tokens, device keys, backup codes).
+
+Two storage formats are supported:
+
+- Argon2id + pepper (`hash_secret`): salted and slow. Required for any
+  secret with limited entropy (e.g. backup codes).
+- Keyed HMAC-SHA256 digest (`digest_secret`): deterministic and fast.
+  Intended for high-entropy, server-generated values such as refresh
+  tokens (>= 128 random bits), where brute force is already infeasible
+  and a salted slow hash only prevents indexed lookups.
+
+`verify_secret` accepts both formats so rows written with Argon2 keep
+working while they are migrated to digests.
+"""
+
 from __future__ import annotations
 
+import hashlib
+import hmac
+from functools import lru_cache
+
 from passlib.context import CryptContext
 from passlib.exc import UnknownHashError
 from typing import Final
 
 from .base import get_pepper
+from .executor import hashing_pool
+
+# Argon2 memory cost in KiB; also reserved from the hashing memory budget.
+SECRET_MEMORY_KIB: Final[int] = 65536  # 64 MB
 
 _secret_context: Final = CryptContext(
     schemes=["argon2"],
     deprecated="auto",
     argon2__type="ID",
-    argon2__memory_cost=65536,  # 64 MB
+    argon2__memory_cost=SECRET_MEMORY_KIB,
     argon2__time_cost=3,
     argon2__parallelism=2,
     argon2__hash_len=32,
     argon2__salt_size=16,
 )
 
+# Stored digests carry an explicit prefix so they can never be mistaken
+# for (or parsed as) a passlib hash string.
+DIGEST_PREFIX: Final[str] = "$hmac-sha256$"
+_DIGEST_KEY_LABEL: Final[bytes] = b"finguard:issued-secret-digest:v1"
+
+@lru_cache(maxsize=4)
+def _digest_key(pepper: str) -> bytes:
+    """Derive the digest key from the pepper, domain-separated by label."""
+    return hmac.new(pepper.encode("utf-8"), _DIGEST_KEY_LABEL, hashlib.sha256).digest()
+
+def is_digest(hashed: str) -> bool:
+    """Return True if a stored value was produced by `digest_secret`."""
+    return hashed.startswith(DIGEST_PREFIX)
+
+def digest_secret(secret: str) -> str:
+    """
+    Compute a deterministic keyed digest of a high-entropy issued secret.
+
+    The same secret always yields the same value, so the digest can be
+    stored in a unique index and used directly as a lookup key.
+
+    Do NOT use for low-entropy secrets; use `hash_secret` instead.
+    """
+    if not secret:
+        raise ValueError("Secret cannot be empty")
+
+    mac = hmac.new(
+        _digest_key(get_pepper()),
+        secret.encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+    return f"{DIGEST_PREFIX}{mac}"
+
+def _hash_peppered(peppered: str) -> str:
+    """Hash an already-peppered secret. Runs inside the hashing pool."""
+    return _secret_context.hash(peppered)
+
+def _verify_peppered(peppered: str, hashed: str) -> bool:
+    """Verify an already-peppered secret. Runs inside the hashing pool."""
+    try:
+        return _secret_context.verify(peppered, hashed)
+    except UnknownHashError:
+        return False
+
 def hash_secret(secret: str) -> str:
     """
     Hash a server-issued secret (refresh token, device key, backup code).
@@ -26,26 +94,60 @@ def hash_secret(secret: str) -> str:
         raise ValueError("Secret cannot be empty")
 
     peppered = f"{secret}::{get_pepper()}"
-    return _secret_context.hash(peppered)
+    return _hash_peppered(peppered)
+
+async def hash_secret_async(secret: str) -> str:
+    """
+    Hash a server-issued secret without blocking the event loop.
+    Runs the Argon2id computation in the shared hashing pool.
+    """
+    if not secret:
+        raise ValueError("Secret cannot be empty")
+
+    peppered = f"{secret}::{get_pepper()}"
+    return await hashing_pool.run(
+        _hash_peppered, peppered, memory_kib=SECRET_MEMORY_KIB
+    )
 
 def verify_secret(secret: str, hashed: str) -> bool:
     """
     Verify a server-issued secret against a stored hash.
+    Accepts both Argon2 hashes and `digest_secret` values.
     Returns True if valid, False otherwise.
     """
     if not secret or not hashed:
         return False
 
-    try:
-        peppered = f"{secret}::{get_pepper()}"
-        return _secret_context.verify(peppered, hashed)
-    except UnknownHashError:
+    if is_digest(hashed):
+        return hmac.compare_digest(digest_secret(secret), hashed)
+
+    peppered = f"{secret}::{get_pepper()}"
+    return _verify_peppered(peppered, hashed)
+
+async def verify_secret_async(secret: str, hashed: str) -> bool:
+    """
+    Verify a server-issued secret without blocking the event loop.
+    Digests are checked inline; only Argon2 hashes go to the pool.
+    Returns True if valid, False otherwise.
+    """
+    if not secret or not hashed:
         return False
-    
+
+    if is_digest(hashed):
+        return hmac.compare_digest(digest_secret(secret), hashed)
+
+    peppered = f"{secret}::{get_pepper()}"
+    return await hashing_pool.run(
+        _verify_peppered, peppered, hashed, memory_kib=SECRET_MEMORY_KIB
+    )
+
 
 def needs_rehash(hashed: str) -> bool:
     """
     Check if a stored secret hash needs upgrading.
     Useful when security parameters change.
+    Digests have no tunable parameters and never need a rehash.
     """
+    if is_digest(hashed):
+        return False
     return _secret_context.needs_update(hashed)
\ No newline at end of file
@@ -10,6 +10,13 @@ Security notes:
 - A global server-side secret key (OTP_SECRET_KEY) is required and
   must be set at runtime. The application fails hard if it is missing.
 - Verification is performed in constant-time to mitigate timing attacks.
+
+Performance notes:
+- The keyed HMAC state (key encoded and padded into the inner/outer
+  SHA-256 contexts) is built once per secret and copied for each
+  message, instead of re-deriving it on every call. Rotating
+  OTP_SECRET_KEY simply builds a new template.
+- `hash_otps_batch` hashes many OTPs against one template lookup.
 """
 
 from __future__ import annotations
@@ -17,7 +24,8 @@ from __future__ import annotations
 import hmac
 import hashlib
 import os
-from typing import Final
+from functools import lru_cache
+from typing import Final, Iterable
 
 from app.core.config import settings
 
@@ -28,6 +36,12 @@ def _get_otp_secret_key() -> str:
     return secret
 
 
+@lru_cache(maxsize=1)
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """Keyed HMAC-SHA256 state for `secret`; callers must `.copy()` it."""
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
 def _normalize_otp(otp: str) -> str:
     """
     Normalize OTP input to prevent subtle mismatches.
@@ -70,16 +84,32 @@ def hash_otp(*, otp: str, identifier: str) -> str:
     """
     otp = _normalize_otp(otp)
 
-    message = f"{identifier}:{otp}".encode("utf-8")
-    key = _get_otp_secret_key().encode("utf-8")
+    mac = _hmac_template(_get_otp_secret_key()).copy()
+    mac.update(f"{identifier}:{otp}".encode("utf-8"))
+    return mac.hexdigest()
 
-    digest = hmac.new(
-        key=key,
-        msg=message,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
 
-    return digest
+def hash_otps_batch(pairs: Iterable[tuple[str, str]]) -> list[str]:
+    """
+    Hash many OTPs at once (e.g. for bulk verification or migrations).
+
+    Args:
+        pairs: (identifier, otp) pairs, as passed to `hash_otp`.
+
+    Returns:
+        Hex digests in input order, identical to calling `hash_otp` on
+        each pair.
+
+    Raises:
+        ValueError: If any OTP fails normalization.
+    """
+    template = _hmac_template(_get_otp_secret_key())
+    digests = []
+    for identifier, otp in pairs:
+        mac = template.copy()
+        mac.update(f"{identifier}:{_normalize_otp(otp)}".encode("utf-8"))
+        digests.append(mac.hexdigest())
+    return digests
 
 
 def verify_otp(
@@ -20,17 +20,23 @@ Do NOT reuse this module for PINs or OTPs.
 
 from __future__ import annotations
 
+from typing import Final
+
 from passlib.context import CryptContext
 from passlib.exc import UnknownHashError
 
 from app.core.security.hashing.base import get_pepper, apply_pepper, HashingError, Hasher
+from app.core.security.hashing.executor import hashing_pool
+
 
+# Argon2 memory cost in KiB; also reserved from the hashing memory budget.
+PASSWORD_MEMORY_KIB: Final[int] = 65536  # 64 MB
 
 pwd_context = CryptContext(
     schemes=["argon2"],
     deprecated="auto",
     argon2__type="ID",
-    argon2__memory_cost=65536,  # 64 MB
+    argon2__memory_cost=PASSWORD_MEMORY_KIB,
     argon2__time_cost=3,
     argon2__parallelism=1,
     argon2__hash_len=32,
@@ -38,6 +44,19 @@ pwd_context = CryptContext(
 )
 
 
+def _hash_peppered(peppered: str) -> str:
+    """Hash an already-peppered password. Runs inside the hashing pool."""
+    return pwd_context.hash(peppered)
+
+
+def _verify_peppered(peppered: str, hashed: str) -> bool:
+    """Verify an already-peppered password. Runs inside the hashing pool."""
+    try:
+        return pwd_context.verify(peppered, hashed)
+    except UnknownHashError:
+        return False
+
+
 class PasswordHasher(Hasher):
     """
     Argon2id-based password hasher implementation.
@@ -75,8 +94,27 @@ class PasswordHasher(Hasher):
             raise HashingError("Password cannot be empty")
 
         peppered = apply_pepper(password, self._pepper)
-        return pwd_context.hash(peppered)
-    
+        return _hash_peppered(peppered)
+
+    async def hash_async(self, password: str) -> str:
+        """
+        Hash a raw password without blocking the event loop.
+
+        Same contract as `hash`, but the Argon2id computation runs in the
+        shared hashing pool.
+
+        Raises:
+            HashingError: If the password is empty or hashing fails.
+            HashingQueueFull: If the hashing pool is saturated.
+        """
+        if not password:
+            raise HashingError("Password cannot be empty")
+
+        peppered = apply_pepper(password, self._pepper)
+        return await hashing_pool.run(
+            _hash_peppered, peppered, memory_kib=PASSWORD_MEMORY_KIB
+        )
+
     def verify(self, password: str, hashed: str) -> bool:
         """
         Verify a password against a stored password hash.
@@ -97,12 +135,27 @@ class PasswordHasher(Hasher):
         if not password or not hashed:
             return False
 
-        try:
-            peppered = apply_pepper(password, self._pepper)
-            return pwd_context.verify(peppered, hashed)
-        except UnknownHashError:
+        peppered = apply_pepper(password, self._pepper)
+        return _verify_peppered(peppered, hashed)
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        """
+        Verify a password without blocking the event loop.
+
+        Same fail-safe contract as `verify`, but the Argon2id computation
+        runs in the shared hashing pool.
+
+        Raises:
+            HashingQueueFull: If the hashing pool is saturated.
+        """
+        if not password or not hashed:
             return False
-        
+
+        peppered = apply_pepper(password, self._pepper)
+        return await hashing_pool.run(
+            _verify_peppered, peppered, hashed, memory_kib=PASSWORD_MEMORY_KIB
+        )
+
         
     def needs_rehash(self, hashed: str) -> bool:
         """
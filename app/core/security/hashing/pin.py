@@ -17,22 +17,39 @@ Do NOT reuse this module for passwords or OTPs.
 
 from __future__ import annotations
 
+from typing import Final
+
 from passlib.context import CryptContext
 from passlib.exc import UnknownHashError
 
 from .base import get_pepper, apply_pepper
+from .executor import hashing_pool
+
+# Argon2 memory cost in KiB; also reserved from the hashing memory budget.
+PIN_MEMORY_KIB: Final[int] = 65536  # 64 MB
 
 _pin_context = CryptContext(
     schemes=["argon2"],
     deprecated="auto",
     argon2__type="ID",
-    argon2__memory_cost=65536,  # 64 MB
+    argon2__memory_cost=PIN_MEMORY_KIB,
     argon2__time_cost=3,
     argon2__parallelism=2,
     argon2__hash_len=32,
     argon2__salt_size=16,
 )
 
+def _hash_peppered(peppered: str) -> str:
+    """Hash an already-peppered PIN. Runs inside the hashing pool."""
+    return _pin_context.hash(peppered)
+
+def _verify_peppered(peppered: str, pin_hash: str) -> bool:
+    """Verify an already-peppered PIN. Runs inside the hashing pool."""
+    try:
+        return _pin_context.verify(peppered, pin_hash)
+    except UnknownHashError:
+        return False
+
 def hash_pin(pin: str) -> str:
     """
     Hash a numeric PIN using Argon2id.
@@ -56,7 +73,26 @@ def hash_pin(pin: str) -> str:
     pepper = get_pepper()
     peppered = apply_pepper(pin, pepper)
 
-    return _pin_context.hash(peppered)
+    return _hash_peppered(peppered)
+
+async def hash_pin_async(pin: str) -> str:
+    """
+    Hash a numeric PIN without blocking the event loop.
+
+    Same contract as `hash_pin`, but the Argon2id computation runs in the
+    shared hashing pool.
+
+    Raises:
+        ValueError: If the PIN is empty or contains non-numeric characters.
+        HashingQueueFull: If the hashing pool is saturated.
+    """
+    if not pin or not pin.isdigit():
+        raise ValueError("PIN must be numeric")
+
+    peppered = apply_pepper(pin, get_pepper())
+    return await hashing_pool.run(
+        _hash_peppered, peppered, memory_kib=PIN_MEMORY_KIB
+    )
 
 def verify_pin(pin: str, pin_hash: str) -> bool:
     """
@@ -81,14 +117,32 @@ def verify_pin(pin: str, pin_hash: str) -> bool:
     if not pin.isdigit():
         return False
 
-    try:
-        pepper = get_pepper()
-        peppered = apply_pepper(pin, pepper)
+    pepper = get_pepper()
+    peppered = apply_pepper(pin, pepper)
 
-        return _pin_context.verify(peppered, pin_hash)
-    except UnknownHashError:
+    return _verify_peppered(peppered, pin_hash)
+
+async def verify_pin_async(pin: str, pin_hash: str) -> bool:
+    """
+    Verify a numeric PIN without blocking the event loop.
+
+    Same fail-safe contract as `verify_pin`, but the Argon2id computation
+    runs in the shared hashing pool.
+
+    Raises:
+        HashingQueueFull: If the hashing pool is saturated.
+    """
+    if not pin or not pin_hash:
         return False
-    
+
+    if not pin.isdigit():
+        return False
+
+    peppered = apply_pepper(pin, get_pepper())
+    return await hashing_pool.run(
+        _verify_peppered, peppered, pin_hash, memory_kib=PIN_MEMORY_KIB
+    )
+
 def needs_rehash(pin_hash: str) -> bool:
     """
     Determine whether a stored PIN hash needs to be rehashed.
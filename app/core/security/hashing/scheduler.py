@@ -0,0 +1,122 @@
+"""
+Memory-budgeted admission control for Argon2 work.
+
+Every Argon2id call allocates its full `memory_cost` for the duration of
+the hash. Password, PIN and issued-secret contexts all use 64 MB, so a
+burst of concurrent signups can exceed the pod memory limit long before
+CPU becomes the bottleneck.
+
+MemoryBudget tracks the memory reserved by in-flight hashing jobs across
+all contexts against a configured ceiling:
+
+- Jobs that fit are admitted immediately
+- Jobs that do not fit wait in strict FIFO order (no small job may
+  overtake an older waiter), so admission is fair under load
+- A job that cannot be admitted within `max_wait` is rejected with
+  HashingAdmissionTimeout, which the API maps to a fast 503
+
+This module only does bookkeeping; it never runs hashing itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+from app.core.security.hashing.base import HashingOverloaded
+
+
+class HashingAdmissionTimeout(HashingOverloaded):
+    """Raised when a hashing job waits longer than allowed for memory."""
+
+
+class MemoryBudget:
+    """
+    FIFO memory reservation shared by all hashing contexts.
+
+    Args:
+        budget_kib: Total memory (KiB) that in-flight jobs may reserve.
+        max_wait: Seconds a job may wait for admission before rejection.
+    """
+
+    def __init__(self, *, budget_kib: int, max_wait: float) -> None:
+        if budget_kib <= 0:
+            raise ValueError("budget_kib must be > 0")
+        if max_wait < 0:
+            raise ValueError("max_wait must be >= 0")
+
+        self._budget_kib = budget_kib
+        self._max_wait = max_wait
+        self._in_use_kib = 0
+        self._waiters: deque[tuple[int, asyncio.Future[None]]] = deque()
+
+    @property
+    def budget_kib(self) -> int:
+        return self._budget_kib
+
+    @property
+    def in_use_kib(self) -> int:
+        """Memory currently reserved by admitted jobs."""
+        return self._in_use_kib
+
+    @property
+    def waiting(self) -> int:
+        """Number of jobs queued for admission."""
+        return len(self._waiters)
+
+    async def acquire(self, kib: int) -> None:
+        """
+        Reserve `kib` of memory, waiting in FIFO order if necessary.
+
+        Raises:
+            ValueError: If a single job needs more than the whole budget.
+            HashingAdmissionTimeout: If admission takes longer than max_wait.
+        """
+        if kib > self._budget_kib:
+            raise ValueError(
+                f"Job needs {kib} KiB, budget is {self._budget_kib} KiB"
+            )
+
+        if not self._waiters and self._in_use_kib + kib <= self._budget_kib:
+            self._in_use_kib += kib
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (kib, waiter)
+        self._waiters.append(entry)
+
+        try:
+            await asyncio.wait_for(waiter, timeout=self._max_wait)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted at the same moment we gave up; hand it back.
+                self.release(kib)
+            else:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                # A large job at the head may have been blocking others.
+                self._wake()
+
+            if isinstance(exc, asyncio.TimeoutError):
+                raise HashingAdmissionTimeout(
+                    "Hashing memory budget exhausted, retry later"
+                ) from None
+            raise
+
+    def release(self, kib: int) -> None:
+        """Return memory reserved by a finished job and admit waiters."""
+        self._in_use_kib -= kib
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            kib, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if self._in_use_kib + kib > self._budget_kib:
+                return
+
+            self._waiters.popleft()
+            self._in_use_kib += kib
+            waiter.set_result(None)
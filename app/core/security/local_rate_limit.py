@@ -0,0 +1,61 @@
+"""
+In-process token buckets used while Redis is unavailable.
+
+Counters in Redis are shared by every worker; these are not. They are
+only a stop-gap while the Redis circuit breaker is open, so their limits
+are set conservatively (a fraction of the shared limit per worker).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+
+class LocalTokenBucket:
+    """
+    Token buckets keyed by identity, held in process memory.
+
+    Args:
+        capacity: Tokens per bucket (the burst size).
+        period: Seconds to refill an empty bucket completely.
+        max_keys: Buckets kept before the least recently created are
+            dropped.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        period: float,
+        *,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._capacity = max(1, capacity)
+        self._rate = self._capacity / period
+        self._max_keys = max_keys
+        self._clock = clock
+        # key -> (tokens, last refill)
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take(self, key: str) -> float:
+        """
+        Take one token for `key`.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available.
+        """
+        now = self._clock()
+        tokens, updated = self._buckets.get(key, (self._capacity, now))
+        tokens = min(self._capacity, tokens + (now - updated) * self._rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self._rate
+
+        if key not in self._buckets:
+            while len(self._buckets) >= self._max_keys:
+                del self._buckets[next(iter(self._buckets))]
+        self._buckets[key] = (tokens - 1, now)
+        return 0.0
@@ -31,3 +31,14 @@ OTP_VERIFY_MAX_ATTEMPTS = 5
 OTP_VERIFY_FAIL_TTL = 300      
 OTP_VERIFY_LOCK_TTL = 900       
 
+
+# Aggregate send limits (SMS pumping defense): sliding window per number
+# range (country + operator prefix) and per client IP, with a cooldown
+# block once exceeded
+OTP_PREFIX_LIMIT = 300
+OTP_PREFIX_WINDOW = 10 * 60
+OTP_PREFIX_COOLDOWN = 30 * 60
+
+OTP_IP_LIMIT = 20
+OTP_IP_WINDOW = 10 * 60
+OTP_IP_COOLDOWN = 30 * 60
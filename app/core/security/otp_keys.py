@@ -1,16 +1,67 @@
+"""
+Redis key builders for OTP state.
+
+With `REDIS_CLUSTER` enabled the phone is wrapped in a hash tag
+(`{+91...}`), so every key for one phone hashes to the same slot and the
+multi-key Lua scripts and pipelines keep working when sharded. Keys are
+left untagged otherwise, so switching a standalone deployment does not
+orphan live cooldowns, counters and lockouts.
+"""
+
+from app.core.config import settings
 from app.domain.auth.otp_purpose import OTPPurpose
 
 
+def _tag(phone: str) -> str:
+    """Phone segment of a key; hash-tagged in cluster mode."""
+    return f"{{{phone}}}" if settings.REDIS_CLUSTER else phone
+
+
+def _phone_from_key(key: str) -> str:
+    """Inverse of `_tag` for the trailing phone segment of a key."""
+    return key.rsplit(":", 1)[-1].strip("{}")
+
+
 def _otp_key(phone: str, purpose: OTPPurpose) -> str:
     """Key for storing the actual OTP hash."""
-    return f"otp:{purpose.value}:{phone}"
+    return f"otp:{purpose.value}:{_tag(phone)}"
 
 
 def _fail_key(phone: str, purpose: OTPPurpose) -> str:
     """Key for counting failed verification attempts."""
-    return f"otp_fail:{purpose.value}:{phone}"
+    return f"otp_fail:{purpose.value}:{_tag(phone)}"
 
 
 def _lock_key(phone: str, purpose: OTPPurpose) -> str:
     """Key for the lockout flag preventing further verification."""
-    return f"otp_lock:{purpose.value}:{phone}"
+    return f"otp_lock:{purpose.value}:{_tag(phone)}"
+
+
+def _cooldown_key(phone: str) -> str:
+    """Key for the resend cooldown flag between OTP sends."""
+    return f"otp:cooldown:{_tag(phone)}"
+
+
+def _window_key(phone: str) -> str:
+    """Key for the short burst-window send counter."""
+    return f"otp:window:{_tag(phone)}"
+
+
+def _daily_key(phone: str) -> str:
+    """Key for the daily send quota counter."""
+    return f"otp:daily:{_tag(phone)}"
+
+
+def _state_key(phone: str) -> str:
+    """Key for the compact per-phone OTP state hash (hash layout only)."""
+    return f"otp:state:{_tag(phone)}"
+
+
+def _aggregate_key(kind: str, value: str) -> str:
+    """Key for the sliding-window send counter of a prefix/IP aggregate."""
+    return f"otp:agg:{kind}:{_tag(value)}"
+
+
+def _aggregate_block_key(kind: str, value: str) -> str:
+    """Key for the cooldown flag of a throttled prefix/IP aggregate."""
+    return f"otp:agg_block:{kind}:{_tag(value)}"
@@ -0,0 +1,169 @@
+"""
+Migrate OTP state from the keyspace layout to the compact hash layout.
+
+Rollout:
+1. Deploy with OTP_STATE_LAYOUT=hash
+2. Run `python -m app.core.security.otp_state_migration`
+
+Between steps 1 and 2 a phone's existing cooldown/counters are not yet
+visible to the hash layout, so the migration should run right after the
+switch. Per phone, the migration reads all legacy keys with their TTLs,
+writes the equivalent hash fields with absolute deadlines, and deletes
+the legacy keys in one MULTI/EXEC (a plain pipeline on Redis Cluster).
+Phones that already have a state hash are merged field-by-field; values
+already in the hash win.
+
+The migration is idempotent and can be re-run safely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import app.core.redis
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security.masking import _mask_phone
+from app.core.security.otp_keys import (
+    _otp_key,
+    _fail_key,
+    _lock_key,
+    _cooldown_key,
+    _window_key,
+    _daily_key,
+    _state_key,
+    _phone_from_key,
+)
+from app.domain.auth.otp_purpose import OTPPurpose
+
+logger = get_logger(__name__)
+
+# Legacy key prefixes that carry the phone as their last segment.
+_LEGACY_PATTERNS = (
+    "otp:cooldown:*",
+    "otp:window:*",
+    "otp:daily:*",
+    *(f"otp:{p.value}:*" for p in OTPPurpose),
+    *(f"otp_fail:{p.value}:*" for p in OTPPurpose),
+    *(f"otp_lock:{p.value}:*" for p in OTPPurpose),
+)
+
+
+def _legacy_keys(phone: str) -> list[tuple[str, str, str | None]]:
+    """
+    Map each legacy key to its hash fields.
+
+    Returns (key, value_field, expiry_field) tuples. For flags (cooldown,
+    lock) the value field *is* the deadline and expiry_field is None.
+    """
+    keys: list[tuple[str, str, str | None]] = [
+        (_cooldown_key(phone), "c", None),
+        (_window_key(phone), "w", "wx"),
+        (_daily_key(phone), "d", "dx"),
+    ]
+    for purpose in OTPPurpose:
+        p = purpose.value
+        keys += [
+            (_otp_key(phone, purpose), f"h:{p}", f"hx:{p}"),
+            (_fail_key(phone, purpose), f"f:{p}", f"fx:{p}"),
+            (_lock_key(phone, purpose), f"l:{p}", None),
+        ]
+    return keys
+
+
+async def migrate_phone(phone: str) -> bool:
+    """
+    Move one phone's OTP state into the hash layout.
+
+    Returns:
+        True if any legacy state was found and migrated.
+    """
+    client = app.core.redis.redis_client
+    legacy = _legacy_keys(phone)
+
+    async with client.pipeline(transaction=False) as pipe:
+        for key, _, _ in legacy:
+            pipe.get(key)
+            pipe.ttl(key)
+        pipe.time()
+        replies = await pipe.execute()
+
+    now = int(replies[-1][0])
+    fields: dict[str, bytes | int] = {}
+    latest = 0
+
+    for i, (_, value_field, expiry_field) in enumerate(legacy):
+        value, ttl = replies[2 * i], replies[2 * i + 1]
+        if value is None or ttl == -2:
+            continue
+
+        # Keys without a TTL should not exist; give them the longest
+        # window we use so they do not become immortal.
+        deadline = now + (ttl if ttl > 0 else 24 * 60 * 60)
+        latest = max(latest, deadline)
+
+        if expiry_field is None:
+            fields[value_field] = deadline
+        elif value_field.startswith("h:"):
+            fields[value_field] = bytes.fromhex(value)
+            fields[expiry_field] = deadline
+        else:
+            fields[value_field] = int(value)
+            fields[expiry_field] = deadline
+
+    if not fields:
+        return False
+
+    # Fields already written through the hash layout are newer than any
+    # legacy state; keep them (and their paired expiry) untouched. Only
+    # field names are read, since OTP digests are raw bytes.
+    state_key = _state_key(phone)
+    existing = set(await client.hkeys(state_key))
+    for _, value_field, expiry_field in legacy:
+        if value_field in existing or expiry_field in existing:
+            fields.pop(value_field, None)
+            if expiry_field is not None:
+                fields.pop(expiry_field, None)
+
+    # Cluster pipelines cannot MULTI; the steps are idempotent on re-run.
+    async with client.pipeline(transaction=not settings.REDIS_CLUSTER) as pipe:
+        if fields:
+            pipe.hset(state_key, mapping=fields)
+            pipe.expireat(state_key, latest, gt=bool(existing))
+        pipe.delete(*(key for key, _, _ in legacy))
+        await pipe.execute()
+
+    logger.info(
+        "Migrated OTP state to hash layout",
+        extra={"phone": _mask_phone(phone)},
+    )
+    return True
+
+
+async def migrate_all(*, batch_size: int = 500) -> int:
+    """
+    Scan for legacy OTP keys and migrate every phone found.
+
+    Returns:
+        Number of phones migrated.
+    """
+    client = app.core.redis.redis_client
+    phones: set[str] = set()
+
+    for pattern in _LEGACY_PATTERNS:
+        async for key in client.scan_iter(match=pattern, count=batch_size):
+            phones.add(_phone_from_key(key))
+
+    migrated = 0
+    pending = list(phones)
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        results = await asyncio.gather(*(migrate_phone(p) for p in batch))
+        migrated += sum(results)
+
+    logger.info("OTP state migration finished", extra={"phones": migrated})
+    return migrated
+
+
+if __name__ == "__main__":
+    print(f"Migrated {asyncio.run(migrate_all())} phones")
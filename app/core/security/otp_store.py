@@ -0,0 +1,661 @@
+"""
+Storage layouts for per-phone OTP state in Redis.
+
+All OTP state (stored OTP hash, verification failures, lockout, resend
+cooldown, burst-window and daily send counters) is read and written
+through an OTPStore. Every operation is a single Lua script, i.e. one
+round trip, regardless of layout.
+
+Two layouts are available, selected with `OTP_STATE_LAYOUT`:
+
+- "keys" (default): one string key per concern, values as hex strings
+      otp:{purpose}:{phone}, otp_fail:..., otp_lock:...,
+      otp:cooldown:{phone}, otp:window:{phone}, otp:daily:{phone}
+- "hash": a single hash per phone, `otp:state:{phone}`, holding raw
+  32-byte digests and absolute expiry timestamps. This removes the
+  per-key overhead (dict entry, robj, expire entry) of up to eight keys
+  per phone, and the small hash stays listpack-encoded.
+
+Hash fields (p = purpose value):
+    c            cooldown-until (epoch seconds)
+    w / wx       burst-window send count / window expiry
+    d / dx       daily send count / daily expiry
+    h:p / hx:p   raw OTP digest / OTP expiry
+    f:p / fx:p   verification failures / failure-window expiry
+    l:p          lockout-until
+
+Send-limit checks can also carry aggregate limits (OTPAggregateLimit:
+per number prefix, per client IP). They are evaluated inside the same
+script as the per-phone checks: a blocked or over-limit aggregate
+rejects the send before any per-phone counter moves, and aggregates are
+only counted for sends that pass. On Redis Cluster the aggregate keys
+live in other slots, so each aggregate is checked by its own script,
+concurrently, before the per-phone script, and counted by another one
+only after the per-phone script allowed the send. The steps are not
+atomic with each other there: concurrent sends can all pass the check
+before any is counted, overshooting an aggregate by at most the number
+of sends in flight.
+
+`get_otp_store` returns the configured layout behind the Redis circuit
+breaker (GuardedOTPStore), so a failing or stalled Redis surfaces as
+DependencyUnavailable instead of hanging the caller. With
+`REDIS_BACKEND=memory` the same scripts run on InMemoryRedis, so tests
+and benchmarks exercise this code without a Redis server.
+
+Redis < 7.4 has no per-field TTL, so expiry is evaluated lazily against
+`TIME` inside the scripts, and the key itself is expired at the latest
+live deadline. Use `app.core.security.otp_state_migration` to move
+existing keyspace state into the hash layout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Protocol, Sequence
+
+import app.core.redis
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.redis import redis_breaker, redis_client
+from app.core.security.otp_keys import (
+    _otp_key,
+    _fail_key,
+    _lock_key,
+    _cooldown_key,
+    _window_key,
+    _daily_key,
+    _state_key,
+    _aggregate_key,
+    _aggregate_block_key,
+)
+from app.domain.auth.otp_purpose import OTPPurpose
+from app.domain.auth.otp_state import (
+    OTPAggregateLimit,
+    OTPRateLimitVerdict,
+    OTPVerifyResult,
+    OTPVerifyStatus,
+)
+
+
+class OTPStore(Protocol):
+    """
+    Interface for OTP state storage.
+
+    Each method must be atomic and cost a single round trip.
+    `otp_hash` is always the hex HMAC produced by `hash_otp`; an empty
+    string denotes malformed input that must never match.
+    """
+
+    async def check_send_limit(
+        self,
+        phone: str,
+        *,
+        cooldown: int,
+        max_in_window: int,
+        window: int,
+        daily_limit: int,
+        daily_ttl: int,
+        aggregates: Sequence[OTPAggregateLimit] = (),
+    ) -> OTPRateLimitVerdict:
+        """Evaluate and record an OTP send attempt."""
+        ...
+
+    async def save_otp(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        *,
+        ttl: int,
+    ) -> None:
+        """Store a freshly issued OTP hash, replacing any previous one."""
+        ...
+
+    async def verify_attempt(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        *,
+        max_attempts: int,
+        fail_ttl: int,
+        lock_ttl: int,
+    ) -> OTPVerifyResult:
+        """Compare an OTP hash and update failure/lock state."""
+        ...
+
+
+def _to_verdict(reply) -> OTPRateLimitVerdict:
+    allowed, reason, retry_after, window_remaining, daily_remaining = reply
+    return OTPRateLimitVerdict(
+        allowed=bool(allowed),
+        reason=reason.decode() if isinstance(reason, bytes) else reason,
+        retry_after=max(int(retry_after), 0),
+        remaining_in_window=int(window_remaining),
+        remaining_today=int(daily_remaining),
+    )
+
+
+def _to_verify_result(reply) -> OTPVerifyResult:
+    status, fail_count, retry_after = reply
+    return OTPVerifyResult(
+        status=OTPVerifyStatus(
+            status.decode() if isinstance(status, bytes) else status
+        ),
+        fail_count=int(fail_count),
+        retry_after=max(int(retry_after), 0),
+    )
+
+
+# --------------------------------------------------------------------------
+# Aggregate (prefix / IP) limits
+# --------------------------------------------------------------------------
+
+# Sliding-window counter: a hash of fixed buckets (epoch // window); the
+# estimate is current + previous * (unelapsed fraction of current bucket).
+#
+# Embedding scripts define AGG_KEYS / AGG_ARGS (number of their own KEYS /
+# ARGV). Then, per aggregate i:
+#   KEYS[AGG_KEYS + 2i - 1] counter hash, KEYS[AGG_KEYS + 2i] block flag
+#   ARGV[AGG_ARGS + 1] = aggregate count,
+#   ARGV[AGG_ARGS + 4i - 2 .. 4i + 1] = kind, limit, window, cooldown
+_AGGREGATE_LUA = """
+local agg_now = tonumber(redis.call('TIME')[1])
+local agg_n = tonumber(ARGV[AGG_ARGS + 1] or '0')
+
+local function agg(i)
+    local a = AGG_ARGS + 1 + (i - 1) * 4
+    return KEYS[AGG_KEYS + 2 * i - 1], KEYS[AGG_KEYS + 2 * i], ARGV[a + 1],
+        tonumber(ARGV[a + 2]), tonumber(ARGV[a + 3]), tonumber(ARGV[a + 4])
+end
+
+local function check_aggregates()
+    for i = 1, agg_n do
+        local counter, block, kind, limit, window, cooldown = agg(i)
+        local blocked = redis.call('TTL', block)
+        if blocked > 0 then
+            return {0, kind, blocked, 0, 0}
+        end
+        local bucket = math.floor(agg_now / window)
+        local current = tonumber(redis.call('HGET', counter, bucket) or '0')
+        local previous = tonumber(redis.call('HGET', counter, bucket - 1) or '0')
+        local unelapsed = 1 - (agg_now % window) / window
+        if current + previous * unelapsed + 1 > limit then
+            redis.call('SET', block, '1', 'EX', cooldown)
+            return {0, kind, cooldown, 0, 0}
+        end
+    end
+    return nil
+end
+
+local function record_aggregates()
+    for i = 1, agg_n do
+        local counter, _, _, _, window, _ = agg(i)
+        local bucket = math.floor(agg_now / window)
+        redis.call('HINCRBY', counter, bucket, 1)
+        local fields = redis.call('HKEYS', counter)
+        for j = 1, #fields do
+            if tonumber(fields[j]) < bucket - 1 then
+                redis.call('HDEL', counter, fields[j])
+            end
+        end
+        redis.call('EXPIRE', counter, window * 2)
+    end
+end
+"""
+
+
+
+# Aggregates on their own (cluster mode: one call per aggregate and step)
+_AGGREGATE_CHECK_LUA = "local AGG_KEYS = 0\nlocal AGG_ARGS = 0\n" + _AGGREGATE_LUA + """
+local rejected = check_aggregates()
+if rejected then
+    return rejected
+end
+return {1, 'ok', 0, 0, 0}
+"""
+
+_AGGREGATE_RECORD_LUA = "local AGG_KEYS = 0\nlocal AGG_ARGS = 0\n" + _AGGREGATE_LUA + """
+record_aggregates()
+return 1
+"""
+
+_aggregate_check_script = redis_client.register_script(_AGGREGATE_CHECK_LUA)
+_aggregate_record_script = redis_client.register_script(_AGGREGATE_RECORD_LUA)
+
+
+def _aggregate_keys_args(aggregates: Sequence[OTPAggregateLimit]) -> tuple[list, list]:
+    keys: list[str] = []
+    args: list = [len(aggregates)]
+    for a in aggregates:
+        keys += [_aggregate_key(a.kind, a.value), _aggregate_block_key(a.kind, a.value)]
+        args += [a.kind, a.limit, a.window, a.cooldown]
+    return keys, args
+
+
+async def _run_per_aggregate(script, aggregates: Sequence[OTPAggregateLimit]) -> list:
+    """Cluster mode: run `script` for each aggregate in its own slot, concurrently."""
+    calls = []
+    for aggregate in aggregates:
+        keys, args = _aggregate_keys_args([aggregate])
+        calls.append(script(keys=keys, args=args, client=app.core.redis.redis_client))
+    return await asyncio.gather(*calls)
+
+
+async def _check_send_limit(
+    script,
+    keys: list,
+    args: list,
+    aggregates: Sequence[OTPAggregateLimit],
+) -> OTPRateLimitVerdict:
+    """
+    Run a per-phone send-limit script together with the aggregate limits.
+
+    The aggregates are embedded in the script unless they have to run
+    apart on Redis Cluster (see the module docstring).
+    """
+    if not (aggregates and settings.REDIS_CLUSTER):
+        agg_keys, agg_args = _aggregate_keys_args(aggregates)
+        reply = await script(
+            keys=[*keys, *agg_keys],
+            args=[*args, *agg_args],
+            client=app.core.redis.redis_client,
+        )
+        return _to_verdict(reply)
+
+    for reply in await _run_per_aggregate(_aggregate_check_script, aggregates):
+        verdict = _to_verdict(reply)
+        if not verdict.allowed:
+            return verdict
+
+    verdict = _to_verdict(
+        await script(keys=keys, args=args, client=app.core.redis.redis_client)
+    )
+    if verdict.allowed:
+        await _run_per_aggregate(_aggregate_record_script, aggregates)
+    return verdict
+
+
+# --------------------------------------------------------------------------
+# Keyspace layout
+# --------------------------------------------------------------------------
+
+# KEYS: cooldown, window, daily, [aggregate keys...]
+# ARGV: cooldown_ttl, max_in_window, window_ttl, daily_limit, daily_ttl,
+#       [aggregate args...]
+# Returns: {allowed, reason, retry_after, window_remaining, daily_remaining}
+_SEND_LIMIT_LUA = "local AGG_KEYS = 3\nlocal AGG_ARGS = 5\n" + _AGGREGATE_LUA + """
+local rejected = check_aggregates()
+if rejected then
+    return rejected
+end
+
+local cooldown = redis.call('TTL', KEYS[1])
+if cooldown > 0 then
+    return {0, 'cooldown', cooldown, 0, 0}
+end
+
+local window = redis.call('INCR', KEYS[2])
+if window == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+local window_remaining = tonumber(ARGV[2]) - window
+if window_remaining < 0 then
+    return {0, 'window', redis.call('TTL', KEYS[2]), 0, 0}
+end
+
+local daily = redis.call('INCR', KEYS[3])
+if daily == 1 then
+    redis.call('EXPIRE', KEYS[3], ARGV[5])
+end
+local daily_remaining = tonumber(ARGV[4]) - daily
+if daily_remaining < 0 then
+    return {0, 'daily', redis.call('TTL', KEYS[3]), window_remaining, 0}
+end
+
+redis.call('SET', KEYS[1], '1', 'EX', ARGV[1])
+record_aggregates()
+return {1, 'ok', tonumber(ARGV[1]), window_remaining, daily_remaining}
+"""
+
+# KEYS: otp, fail, lock
+# ARGV: computed_hash, max_attempts, fail_ttl, lock_ttl
+# Returns: {status, fail_count, retry_after}
+_VERIFY_LUA = """
+local lock_ttl = redis.call('TTL', KEYS[3])
+if lock_ttl > 0 or lock_ttl == -1 then
+    return {'locked', 0, lock_ttl}
+end
+
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return {'expired', 0, 0}
+end
+
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+    return {'ok', 0, 0}
+end
+
+local fails = redis.call('INCR', KEYS[2])
+if fails == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+
+if fails >= tonumber(ARGV[2]) then
+    redis.call('SET', KEYS[3], '1', 'EX', ARGV[4])
+    redis.call('DEL', KEYS[2])
+    return {'lockout', fails, tonumber(ARGV[4])}
+end
+
+return {'mismatch', fails, 0}
+"""
+
+_send_limit_script = redis_client.register_script(_SEND_LIMIT_LUA)
+_verify_script = redis_client.register_script(_VERIFY_LUA)
+
+
+class KeyspaceOTPStore:
+    """One string key per concern; OTP hashes stored as hex."""
+
+    async def check_send_limit(
+        self,
+        phone: str,
+        *,
+        cooldown: int,
+        max_in_window: int,
+        window: int,
+        daily_limit: int,
+        daily_ttl: int,
+        aggregates: Sequence[OTPAggregateLimit] = (),
+    ) -> OTPRateLimitVerdict:
+        return await _check_send_limit(
+            _send_limit_script,
+            [_cooldown_key(phone), _window_key(phone), _daily_key(phone)],
+            [cooldown, max_in_window, window, daily_limit, daily_ttl],
+            aggregates,
+        )
+
+    async def save_otp(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        *,
+        ttl: int,
+    ) -> None:
+        await app.core.redis.redis_client.set(
+            _otp_key(phone, purpose),
+            otp_hash,
+            ex=ttl,
+        )
+
+    async def verify_attempt(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        *,
+        max_attempts: int,
+        fail_ttl: int,
+        lock_ttl: int,
+    ) -> OTPVerifyResult:
+        reply = await _verify_script(
+            keys=[
+                _otp_key(phone, purpose),
+                _fail_key(phone, purpose),
+                _lock_key(phone, purpose),
+            ],
+            args=[otp_hash, max_attempts, fail_ttl, lock_ttl],
+            client=app.core.redis.redis_client,
+        )
+        return _to_verify_result(reply)
+
+
+# --------------------------------------------------------------------------
+# Compact hash layout
+# --------------------------------------------------------------------------
+
+# Shared helpers prepended to every hash-layout script.
+_HASH_LUA_PRELUDE = """
+local state = KEYS[1]
+local now = tonumber(redis.call('TIME')[1])
+
+local function deadline(field)
+    return tonumber(redis.call('HGET', state, field) or '0')
+end
+
+-- Increment a counter whose window starts on first use.
+local function bump(count_field, expiry_field, ttl)
+    local expires = deadline(expiry_field)
+    if expires <= now then
+        redis.call('HSET', state, count_field, 1, expiry_field, now + ttl)
+        return 1, ttl
+    end
+    return redis.call('HINCRBY', state, count_field, 1), expires - now
+end
+
+-- Expire the whole hash at its latest live deadline.
+local function refresh_ttl()
+    local flat = redis.call('HGETALL', state)
+    local latest = 0
+    for i = 1, #flat, 2 do
+        local f = flat[i]
+        local tag = string.sub(f, 1, 2)
+        if f == 'c' or f == 'wx' or f == 'dx'
+            or tag == 'hx' or tag == 'fx' or tag == 'l:' then
+            local v = tonumber(flat[i + 1]) or 0
+            if v > latest then
+                latest = v
+            end
+        end
+    end
+    if latest > now then
+        redis.call('EXPIREAT', state, latest)
+    else
+        redis.call('DEL', state)
+    end
+end
+"""
+
+# KEYS: state, [aggregate keys...]
+# ARGV: cooldown_ttl, max_in_window, window_ttl, daily_limit, daily_ttl,
+#       [aggregate args...]
+_HASH_SEND_LIMIT_LUA = (
+    _HASH_LUA_PRELUDE
+    + "local AGG_KEYS = 1\nlocal AGG_ARGS = 5\n"
+    + _AGGREGATE_LUA
+) + """
+local rejected = check_aggregates()
+if rejected then
+    return rejected
+end
+
+local cooldown = deadline('c')
+if cooldown > now then
+    return {0, 'cooldown', cooldown - now, 0, 0}
+end
+
+local window, window_ttl = bump('w', 'wx', tonumber(ARGV[3]))
+local window_remaining = tonumber(ARGV[2]) - window
+if window_remaining < 0 then
+    refresh_ttl()
+    return {0, 'window', window_ttl, 0, 0}
+end
+
+local daily, daily_ttl = bump('d', 'dx', tonumber(ARGV[5]))
+local daily_remaining = tonumber(ARGV[4]) - daily
+if daily_remaining < 0 then
+    refresh_ttl()
+    return {0, 'daily', daily_ttl, window_remaining, 0}
+end
+
+redis.call('HSET', state, 'c', now + tonumber(ARGV[1]))
+refresh_ttl()
+record_aggregates()
+return {1, 'ok', tonumber(ARGV[1]), window_remaining, daily_remaining}
+"""
+
+# ARGV: purpose, raw_digest, ttl
+_HASH_SAVE_LUA = _HASH_LUA_PRELUDE + """
+local p = ARGV[1]
+redis.call('HSET', state, 'h:' .. p, ARGV[2], 'hx:' .. p, now + tonumber(ARGV[3]))
+refresh_ttl()
+return 1
+"""
+
+# ARGV: purpose, raw_digest, max_attempts, fail_ttl, lock_ttl
+_HASH_VERIFY_LUA = _HASH_LUA_PRELUDE + """
+local p = ARGV[1]
+
+local locked_until = deadline('l:' .. p)
+if locked_until > now then
+    return {'locked', 0, locked_until - now}
+end
+
+local stored = redis.call('HGET', state, 'h:' .. p)
+if not stored or deadline('hx:' .. p) <= now then
+    redis.call('HDEL', state, 'h:' .. p, 'hx:' .. p)
+    refresh_ttl()
+    return {'expired', 0, 0}
+end
+
+if stored == ARGV[2] then
+    redis.call('HDEL', state, 'h:' .. p, 'hx:' .. p, 'f:' .. p, 'fx:' .. p, 'l:' .. p)
+    refresh_ttl()
+    return {'ok', 0, 0}
+end
+
+local fails = bump('f:' .. p, 'fx:' .. p, tonumber(ARGV[4]))
+if fails >= tonumber(ARGV[3]) then
+    redis.call('HSET', state, 'l:' .. p, now + tonumber(ARGV[5]))
+    redis.call('HDEL', state, 'f:' .. p, 'fx:' .. p)
+    refresh_ttl()
+    return {'lockout', fails, tonumber(ARGV[5])}
+end
+
+refresh_ttl()
+return {'mismatch', fails, 0}
+"""
+
+_hash_send_limit_script = redis_client.register_script(_HASH_SEND_LIMIT_LUA)
+_hash_save_script = redis_client.register_script(_HASH_SAVE_LUA)
+_hash_verify_script = redis_client.register_script(_HASH_VERIFY_LUA)
+
+
+def _raw_digest(otp_hash: str) -> bytes:
+    """Convert a hex OTP hash to its raw 32 bytes (empty stays empty)."""
+    return bytes.fromhex(otp_hash) if otp_hash else b""
+
+
+class HashOTPStore:
+    """All OTP state for a phone in one hash; OTP hashes stored raw."""
+
+    async def check_send_limit(
+        self,
+        phone: str,
+        *,
+        cooldown: int,
+        max_in_window: int,
+        window: int,
+        daily_limit: int,
+        daily_ttl: int,
+        aggregates: Sequence[OTPAggregateLimit] = (),
+    ) -> OTPRateLimitVerdict:
+        return await _check_send_limit(
+            _hash_send_limit_script,
+            [_state_key(phone)],
+            [cooldown, max_in_window, window, daily_limit, daily_ttl],
+            aggregates,
+        )
+
+    async def save_otp(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        *,
+        ttl: int,
+    ) -> None:
+        await _hash_save_script(
+            keys=[_state_key(phone)],
+            args=[purpose.value, _raw_digest(otp_hash), ttl],
+            client=app.core.redis.redis_client,
+        )
+
+    async def verify_attempt(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        *,
+        max_attempts: int,
+        fail_ttl: int,
+        lock_ttl: int,
+    ) -> OTPVerifyResult:
+        reply = await _hash_verify_script(
+            keys=[_state_key(phone)],
+            args=[
+                purpose.value,
+                _raw_digest(otp_hash),
+                max_attempts,
+                fail_ttl,
+                lock_ttl,
+            ],
+            client=app.core.redis.redis_client,
+        )
+        return _to_verify_result(reply)
+
+
+class GuardedOTPStore:
+    """
+    OTPStore wrapper routing every call through a circuit breaker.
+
+    Raises:
+        DependencyUnavailable: From any method, if the breaker is open or
+            the call failed or timed out.
+    """
+
+    def __init__(self, store: OTPStore, breaker: CircuitBreaker) -> None:
+        self.store = store
+        self.breaker = breaker
+
+    async def check_send_limit(self, phone: str, **limits) -> OTPRateLimitVerdict:
+        return await self.breaker.call(self.store.check_send_limit, phone, **limits)
+
+    async def save_otp(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        *,
+        ttl: int,
+    ) -> None:
+        await self.breaker.call(self.store.save_otp, phone, purpose, otp_hash, ttl=ttl)
+
+    async def verify_attempt(
+        self,
+        phone: str,
+        purpose: OTPPurpose,
+        otp_hash: str,
+        **limits,
+    ) -> OTPVerifyResult:
+        return await self.breaker.call(
+            self.store.verify_attempt, phone, purpose, otp_hash, **limits
+        )
+
+
+_stores: dict[str, OTPStore] = {
+    "keys": GuardedOTPStore(KeyspaceOTPStore(), redis_breaker),
+    "hash": GuardedOTPStore(HashOTPStore(), redis_breaker),
+}
+
+
+def get_otp_store() -> OTPStore:
+    """Return the breaker-guarded store for the configured `OTP_STATE_LAYOUT`."""
+    try:
+        return _stores[settings.OTP_STATE_LAYOUT]
+    except KeyError:
+        raise RuntimeError(
+            f"Unknown OTP_STATE_LAYOUT {settings.OTP_STATE_LAYOUT!r}"
+        ) from None
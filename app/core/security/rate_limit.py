@@ -1,5 +1,15 @@
-from app.core.redis import redis_client
+import math
+
 from app.auth.OTP.otp_exceptions import OTPRateLimitExceeded
+from app.core.circuit_breaker import DependencyUnavailable
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security.local_rate_limit import LocalTokenBucket
+from app.core.security.otp_store import OTPStore, get_otp_store
+from app.domain.auth.otp_purpose import OTPPurpose
+from app.domain.auth.otp_state import OTPAggregateLimit, OTPRateLimitVerdict
+from app.core.Utils.phone import phone_prefix
+from app.interegation.SMS.delivery import sms_lane_accepting
 
 from app.core.security.otp import (
     OTP_RESEND_COOLDOWN,
@@ -7,62 +17,173 @@ from app.core.security.otp import (
     OTP_WINDOW,
     OTP_DAILY_LIMIT,
     OTP_DAILY_TTL,
+    OTP_PREFIX_LIMIT,
+    OTP_PREFIX_WINDOW,
+    OTP_PREFIX_COOLDOWN,
+    OTP_IP_LIMIT,
+    OTP_IP_WINDOW,
+    OTP_IP_COOLDOWN,
+)
+
+logger = get_logger(__name__)
+
+_REJECTION_MESSAGES = {
+    "window": "Too many OTP requests. Please try again later.",
+    "daily": "Daily OTP limit reached. Please try again tomorrow.",
+    "prefix": "Too many OTP requests. Please try again later.",
+    "ip": "Too many OTP requests. Please try again later.",
+}
+
+# Seconds a shed caller is asked to wait before retrying
+_SHED_RETRY_AFTER = 5
+
+# Per-worker send limits while Redis is unavailable: one send per phone
+# per burst-window slot, and a share of the IP aggregate
+_fallback_phone_limit = LocalTokenBucket(1, OTP_WINDOW / OTP_MAX_IN_WINDOW)
+_fallback_ip_limit = LocalTokenBucket(
+    int(OTP_IP_LIMIT * settings.RATE_LIMIT_FALLBACK_SHARE),
+    OTP_IP_WINDOW,
 )
 
 
-async def enforce_otp_rate_limit(phone: str) -> None:
+def otp_aggregate_limits(
+    phone: str,
+    client_ip: str | None = None,
+) -> list[OTPAggregateLimit]:
     """
-    Enforce OTP send rate limits.
+    Aggregate limits guarding against SMS pumping.
 
-    Controls:
-    1. Cooldown between OTP sends
-    2. Short burst window limit
-    3. Daily quota limit
+    Attackers rotate through number ranges (and proxies) so no single
+    phone trips its own limits. Sends are therefore also counted per
+    number prefix (country + operator range) and per client IP; an
+    aggregate over its limit is blocked for its cooldown.
+    """
+    aggregates = [
+        OTPAggregateLimit(
+            kind="prefix",
+            value=phone_prefix(phone),
+            limit=OTP_PREFIX_LIMIT,
+            window=OTP_PREFIX_WINDOW,
+            cooldown=OTP_PREFIX_COOLDOWN,
+        )
+    ]
+    if client_ip:
+        aggregates.append(
+            OTPAggregateLimit(
+                kind="ip",
+                value=client_ip,
+                limit=OTP_IP_LIMIT,
+                window=OTP_IP_WINDOW,
+                cooldown=OTP_IP_COOLDOWN,
+            )
+        )
+    return aggregates
 
-    Notes:
-    - This implementation rate-limits by phone number only.
-    - In production fintech systems, IP address, device fingerprint,
-      and behavioral signals are also incorporated.
-    - Operations are not fully atomic; Redis Lua scripting would be
-      used in production to avoid race conditions.
+
+async def check_otp_rate_limit(
+    phone: str,
+    client_ip: str | None = None,
+    *,
+    store: OTPStore | None = None,
+) -> OTPRateLimitVerdict:
     """
+    Evaluate and record an OTP send attempt in a single Redis round trip.
 
-    # Cooldown check
-    cooldown_key = f"otp:cooldown:{phone}"
-    ttl = await redis_client.ttl(cooldown_key)
+    Prefix/IP aggregate limits, cooldown, burst-window and daily-quota
+    checks run inside one Lua script, so concurrent sends for the same
+    phone cannot interleave between the checks and the counter updates.
+    The storage layout is chosen by the configured OTPStore unless
+    `store` is given.
 
-    if ttl > 0:
-        raise OTPRateLimitExceeded(
-            f"Please wait {ttl} seconds before requesting another OTP."
+    If Redis is unavailable (circuit open, error or timeout), falls back
+    to conservative in-process limits; see `_fallback_verdict`.
+    """
+    store = store or get_otp_store()
+    try:
+        return await store.check_send_limit(
+            phone,
+            cooldown=OTP_RESEND_COOLDOWN,
+            max_in_window=OTP_MAX_IN_WINDOW,
+            window=OTP_WINDOW,
+            daily_limit=OTP_DAILY_LIMIT,
+            daily_ttl=OTP_DAILY_TTL,
+            aggregates=otp_aggregate_limits(phone, client_ip),
         )
+    except DependencyUnavailable:
+        logger.warning("OTP rate limit falling back to local limits")
+        return _fallback_verdict(phone, client_ip)
+
 
-    # Burst window check
-    window_key = f"otp:window:{phone}"
-    window_count = await redis_client.incr(window_key)
+def _fallback_verdict(phone: str, client_ip: str | None) -> OTPRateLimitVerdict:
+    """
+    Per-worker OTP send limits used while Redis is unavailable.
 
-    if window_count == 1:
-        await redis_client.expire(window_key, OTP_WINDOW)
+    Counters are not shared between workers and the daily quota is not
+    enforced, so the limits are deliberately tighter than the Redis ones.
+    """
+    checks = [("cooldown", _fallback_phone_limit, phone)]
+    if client_ip:
+        checks.append(("ip", _fallback_ip_limit, client_ip))
 
-    if window_count > OTP_MAX_IN_WINDOW:
-        raise OTPRateLimitExceeded(
-            "Too many OTP requests. Please try again later."
-        )
+    for reason, bucket, key in checks:
+        wait = bucket.take(key)
+        if wait:
+            return OTPRateLimitVerdict(
+                allowed=False,
+                reason=reason,
+                retry_after=math.ceil(wait),
+                remaining_in_window=0,
+                remaining_today=0,
+            )
+    return OTPRateLimitVerdict(
+        allowed=True,
+        reason="ok",
+        retry_after=0,
+        remaining_in_window=0,
+        remaining_today=0,
+    )
 
-    # Daily quota check
-    daily_key = f"otp:daily:{phone}"
-    daily_count = await redis_client.incr(daily_key)
 
-    if daily_count == 1:
-        await redis_client.expire(daily_key, OTP_DAILY_TTL)
+async def enforce_otp_rate_limit(
+    phone: str,
+    purpose: OTPPurpose | None = None,
+    client_ip: str | None = None,
+    *,
+    store: OTPStore | None = None,
+) -> OTPRateLimitVerdict:
+    """
+    Enforce OTP send rate limits.
 
-    if daily_count > OTP_DAILY_LIMIT:
+    Controls:
+    1. Cooldown between OTP sends
+    2. Short burst window limit
+    3. Daily quota limit
+    4. Number-prefix and client-IP aggregates (SMS pumping defense)
+
+    Notes:
+    - Device fingerprint and behavioral signals are not yet incorporated.
+    - All checks and counter updates run atomically in one round trip
+      (see `check_otp_rate_limit`).
+    - When `purpose` is given and its SMS priority lane is shedding load,
+      the send is refused before any counter is touched, so a shed
+      request does not use up the caller's cooldown or quota.
+
+    Raises:
+        OTPRateLimitExceeded: With `retry_after` set, if any limit is hit.
+    """
+    if purpose is not None and not sms_lane_accepting(purpose.value):
         raise OTPRateLimitExceeded(
-            "Daily OTP limit reached. Please try again tomorrow."
+            "OTP service is busy. Please try again shortly.",
+            retry_after=_SHED_RETRY_AFTER,
         )
 
-    # Set cooldown only after all checks pass
-    await redis_client.set(
-        cooldown_key,
-        "1",
-        ex=OTP_RESEND_COOLDOWN
-    )
+    verdict = await check_otp_rate_limit(phone, client_ip, store=store)
+
+    if not verdict.allowed:
+        message = _REJECTION_MESSAGES.get(
+            verdict.reason,
+            f"Please wait {verdict.retry_after} seconds before requesting another OTP.",
+        )
+        raise OTPRateLimitExceeded(message, retry_after=verdict.retry_after)
+
+    return verdict
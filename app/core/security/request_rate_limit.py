@@ -0,0 +1,415 @@
+"""
+Per-route request rate limiting over composite client identities.
+
+OTP sends have their own limits (see `rate_limit.py`), but OTP
+verification, account creation and transactions were unthrottled. Routes
+declare their limits as FastAPI dependencies:
+
+    @router.post(
+        "/verify-otp",
+        dependencies=[rate_limit(
+            RateLimitRule("verify_otp:phone", limit=10, window=600, key_by=("phone",)),
+            RateLimitRule("verify_otp:ip", limit=60, window=60, key_by=("ip",)),
+        )],
+    )
+
+Each rule counts requests per composite key built from the dimensions in
+`key_by`:
+
+    ip      request.client.host
+    device  the RATE_LIMIT_DEVICE_HEADER header
+    phone   normalized "phone" field of a JSON body
+    user    `sub` of a bearer access token (signature checked, no DB hit)
+
+A rule is skipped for requests missing any of its dimensions, so declare
+one rule per dimension when each must be limited on its own. The
+identity values are client-controlled (headers, IPv6 colons), so keys
+carry a SHA-256 digest of them rather than the values themselves:
+`rl:<rule>:<digest>`.
+
+Algorithms:
+    token_bucket    `limit` tokens, refilled continuously over `window`;
+                    allows bursts up to `limit`
+    sliding_log     at most `limit` requests in any trailing `window`
+                    (a sorted set of timestamps); exact, no bursts at
+                    window edges
+
+Both run as one Lua script per Redis round trip. To keep hot keys off
+the network, a check reserves a lease of several units at once (about
+RATE_LIMIT_LOCAL_SHARE of the limit) and serves the following requests
+for that key from process memory until the lease is used up or
+RATE_LIMIT_LEASE_TTL passes. Rejections are cached locally until their
+retry-after. Unused leased units are simply lost, so with several
+processes the effective limit can briefly be lower than configured, but
+never higher. Limits small enough that the lease is a single unit always
+go to Redis.
+
+Checks go through the Redis circuit breaker. While Redis is unavailable,
+each rule is enforced by an in-process token bucket per worker, at
+RATE_LIMIT_FALLBACK_SHARE of its limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import Depends, Request
+from jose import JWTError, jwt
+
+import app.core.redis
+from app.core.circuit_breaker import DependencyUnavailable
+from app.core.config import settings
+from app.core.redis import redis_breaker, redis_client
+from app.core.security.local_rate_limit import LocalTokenBucket
+from app.core.Utils.phone import InvalidPhoneNumber, normalize_phone
+
+DIMENSIONS = ("ip", "device", "phone", "user")
+ALGORITHMS = ("token_bucket", "sliding_log")
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request exceeds one of its route's rate limits."""
+
+    def __init__(self, rule: str, *, retry_after: int):
+        super().__init__(f"Rate limit exceeded: {rule}")
+        self.rule = rule
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    A request limit for one route (or group of routes).
+
+    Attributes:
+        name: Unique rule name; part of the Redis key.
+        limit: Requests allowed per `window` (bucket capacity for
+            token_bucket).
+        window: Window length in seconds (full refill time for
+            token_bucket).
+        key_by: Identity dimensions forming the composite key.
+        algorithm: "token_bucket" or "sliding_log".
+    """
+
+    name: str
+    limit: int
+    window: float
+    key_by: tuple[str, ...] = ("ip",)
+    algorithm: str = "token_bucket"
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {self.algorithm!r}")
+        unknown = set(self.key_by) - set(DIMENSIONS)
+        if unknown or not self.key_by:
+            raise ValueError(f"Invalid rate limit dimensions: {self.key_by!r}")
+        if self.limit < 1 or self.window <= 0:
+            raise ValueError("Rate limit needs limit >= 1 and window > 0")
+
+    def key_for(self, identity: dict[str, str | None]) -> str | None:
+        """Redis key for this identity, or None if a dimension is missing."""
+        parts = []
+        for dimension in self.key_by:
+            value = identity.get(dimension)
+            if not value:
+                return None
+            parts.append(f"{dimension}={value}")
+        digest = hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+        return f"rl:{self.name}:{digest[:32]}"
+
+    @property
+    def lease_size(self) -> int:
+        return max(1, int(self.limit * settings.RATE_LIMIT_LOCAL_SHARE))
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: int = 0
+
+
+# Redis scripts: ARGV[1] = limit, ARGV[2] = window (ms), ARGV[3] = units
+# wanted. Return {granted, retry_after_ms}; granted may be less than
+# wanted, and retry_after_ms is only set when nothing was granted.
+
+_TOKEN_BUCKET_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or limit
+local ts = tonumber(state[2]) or now
+tokens = math.min(limit, tokens + math.max(0, now - ts) * limit / window)
+
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], window)
+
+if granted < 1 then
+    return {0, math.ceil((1 - tokens) * window / limit)}
+end
+return {granted, 0}
+"""
+
+_SLIDING_LOG_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local member = ARGV[4]
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+
+local granted = math.min(want, limit - count)
+if granted < 1 then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, math.max(1, tonumber(oldest[2]) + window - now)}
+end
+
+for i = 1, granted do
+    redis.call('ZADD', KEYS[1], now, member .. ':' .. i)
+end
+redis.call('PEXPIRE', KEYS[1], window)
+return {granted, 0}
+"""
+
+_token_bucket_script = redis_client.register_script(_TOKEN_BUCKET_LUA)
+_sliding_log_script = redis_client.register_script(_SLIDING_LOG_LUA)
+
+
+@dataclass
+class _Lease:
+    units: int
+    expires_at: float
+
+
+class RequestRateLimiter:
+    """
+    Redis-backed rate limiter with a per-process lease and rejection cache.
+
+    Args:
+        lease_ttl: Seconds leased units may be served locally.
+        max_keys: Local cache entries kept before the oldest are evicted.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        lease_ttl: float,
+        max_keys: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._lease_ttl = lease_ttl
+        self._max_keys = max_keys
+        self._clock = clock
+        self._leases: dict[str, _Lease] = {}
+        self._rejected: dict[str, float] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._fallback_buckets: dict[str, LocalTokenBucket] = {}
+
+    def _local(self, key: str) -> RateLimitDecision | None:
+        now = self._clock()
+
+        blocked_until = self._rejected.get(key)
+        if blocked_until is not None:
+            if now < blocked_until:
+                return RateLimitDecision(False, math.ceil(blocked_until - now))
+            del self._rejected[key]
+
+        lease = self._leases.get(key)
+        if lease is not None:
+            if now < lease.expires_at and lease.units > 0:
+                lease.units -= 1
+                return RateLimitDecision(True)
+            del self._leases[key]
+        return None
+
+    def _evict(self, cache: dict) -> None:
+        # Dicts keep insertion order, so the first keys are the oldest
+        while len(cache) >= self._max_keys:
+            del cache[next(iter(cache))]
+
+    async def hit(self, rule: RateLimitRule, key: str) -> RateLimitDecision:
+        """Count one request for `key` under `rule`."""
+        while True:
+            decision = self._local(key)
+            if decision is not None:
+                return decision
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            # Another request is already fetching a lease for this key
+            await pending
+
+        done = asyncio.get_running_loop().create_future()
+        self._inflight[key] = done
+        try:
+            return await self._acquire(rule, key)
+        finally:
+            del self._inflight[key]
+            done.set_result(None)
+
+    async def _acquire(self, rule: RateLimitRule, key: str) -> RateLimitDecision:
+        window_ms = int(rule.window * 1000)
+        try:
+            if rule.algorithm == "sliding_log":
+                granted, retry_after_ms = await redis_breaker.call(
+                    _sliding_log_script,
+                    keys=[key],
+                    args=[rule.limit, window_ms, rule.lease_size, secrets.token_hex(8)],
+                    client=app.core.redis.redis_client,
+                )
+                # Leased slots leave the log after one window
+                lease_ttl = min(self._lease_ttl, rule.window)
+            else:
+                granted, retry_after_ms = await redis_breaker.call(
+                    _token_bucket_script,
+                    keys=[key],
+                    args=[rule.limit, window_ms, rule.lease_size],
+                    client=app.core.redis.redis_client,
+                )
+                lease_ttl = self._lease_ttl
+        except DependencyUnavailable:
+            return self._fallback(rule, key)
+
+        granted, retry_after_ms = int(granted), int(retry_after_ms)
+        now = self._clock()
+
+        if granted < 1:
+            retry_after = retry_after_ms / 1000
+            self._evict(self._rejected)
+            self._rejected[key] = now + retry_after
+            return RateLimitDecision(False, max(1, math.ceil(retry_after)))
+
+        if granted > 1:
+            self._evict(self._leases)
+            self._leases[key] = _Lease(units=granted - 1, expires_at=now + lease_ttl)
+        return RateLimitDecision(True)
+
+    def _fallback(self, rule: RateLimitRule, key: str) -> RateLimitDecision:
+        bucket = self._fallback_buckets.get(rule.name)
+        if bucket is None:
+            bucket = self._fallback_buckets[rule.name] = LocalTokenBucket(
+                int(rule.limit * settings.RATE_LIMIT_FALLBACK_SHARE),
+                rule.window,
+                max_keys=self._max_keys,
+                clock=self._clock,
+            )
+        wait = bucket.take(key)
+        if wait:
+            return RateLimitDecision(False, max(1, math.ceil(wait)))
+        return RateLimitDecision(True)
+
+    def clear(self) -> None:
+        """Drop all locally cached leases and rejections."""
+        self._leases.clear()
+        self._rejected.clear()
+
+
+_limiter: RequestRateLimiter | None = None
+
+
+def get_request_limiter() -> RequestRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RequestRateLimiter(
+            lease_ttl=settings.RATE_LIMIT_LEASE_TTL,
+            max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS,
+        )
+    return _limiter
+
+
+def _bearer_subject(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type") != "access":
+        return None
+    return payload.get("sub")
+
+
+async def _body_phone(request: Request) -> str | None:
+    if not request.headers.get("content-type", "").startswith("application/json"):
+        return None
+    try:
+        # Starlette caches the body, so the route can still parse it
+        body = await request.json()
+    except ValueError:
+        return None
+    phone = body.get("phone") if isinstance(body, dict) else None
+    if not isinstance(phone, str):
+        return None
+    try:
+        return normalize_phone(phone)
+    except InvalidPhoneNumber:
+        return None
+
+
+async def request_identity(request: Request, dimensions: set[str]) -> dict[str, str | None]:
+    """Extract the requested identity dimensions from a request."""
+    identity: dict[str, str | None] = {}
+    if "ip" in dimensions:
+        identity["ip"] = request.client.host if request.client else None
+    if "device" in dimensions:
+        identity["device"] = request.headers.get(settings.RATE_LIMIT_DEVICE_HEADER)
+    if "phone" in dimensions:
+        identity["phone"] = await _body_phone(request)
+    if "user" in dimensions:
+        identity["user"] = _bearer_subject(request)
+    return identity
+
+
+def rate_limit(*rules: RateLimitRule):
+    """
+    FastAPI dependency enforcing `rules` on a route.
+
+    All applicable rules are checked concurrently; the request is
+    rejected with the longest retry-after among the rules it exceeds.
+
+    Raises:
+        RateLimitExceeded: If any rule rejects the request.
+    """
+    dimensions = {dimension for rule in rules for dimension in rule.key_by}
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        identity = await request_identity(request, dimensions)
+        checks = [
+            (rule, key)
+            for rule in rules
+            if (key := rule.key_for(identity)) is not None
+        ]
+        limiter = get_request_limiter()
+        decisions = await asyncio.gather(
+            *(limiter.hit(rule, key) for rule, key in checks)
+        )
+        rejected = [
+            (decision.retry_after, rule.name)
+            for (rule, _), decision in zip(checks, decisions)
+            if not decision.allowed
+        ]
+        if rejected:
+            retry_after, name = max(rejected)
+            raise RateLimitExceeded(name, retry_after=retry_after)
+
+    return Depends(dependency)
@@ -1,49 +1,64 @@
-from app.core.redis import redis_client
-from app.auth.OTP.otp_exceptions import (
-    OTPVerificationLocked,
-    OTPVerificationAttemptsExceeded,
-)
+import math
+
+from app.core.circuit_breaker import DependencyUnavailable
+from app.core.config import settings
+from app.auth.OTP.otp_exceptions import OTPServiceUnavailable
 from app.core.security.otp import (
     OTP_VERIFY_MAX_ATTEMPTS,
     OTP_VERIFY_FAIL_TTL,
     OTP_VERIFY_LOCK_TTL,
 )
-from app.domain.auth.otp_purpose import OTPPurpose 
-from app.auth.OTP.service import _fail_key, _lock_key
+from app.domain.auth.otp_purpose import OTPPurpose
+from app.domain.auth.otp_state import OTPVerifyResult, OTPVerifyStatus
+from app.core.security.otp_store import OTPStore, get_otp_store
 
-async def enforce_otp_verify_rate_limit(identifier: str, purpose: OTPPurpose) -> None:
-    """
-    Enforce rate-limits for OTP verification attempts.
 
-    - Blocks verification if locked
-    - Increments failure count
-    - Locks verification after max failures
+async def verify_otp_attempt(
+    *,
+    phone: str,
+    purpose: OTPPurpose,
+    otp_hash: str,
+    max_attempts: int = OTP_VERIFY_MAX_ATTEMPTS,
+    fail_ttl: int = OTP_VERIFY_FAIL_TTL,
+    lock_ttl: int = OTP_VERIFY_LOCK_TTL,
+    store: OTPStore | None = None,
+) -> OTPVerifyResult:
     """
+    Verify an OTP attempt and update all counters in one round trip.
 
-    lock_key = _lock_key(identifier, purpose)
-    fail_key = _fail_key(identifier, purpose)
-    # Hard lock check
-    if await redis_client.exists(lock_key):
-        raise OTPVerificationLocked(
-            "OTP verification temporarily locked. Please try again later."
-        )
+    The caller computes the HMAC of the user-supplied OTP; a Lua script
+    in the configured OTPStore (or `store`) then, atomically:
 
-    # Increment failure counter
-    attempts = await redis_client.incr(fail_key)
+    - Rejects the attempt if verification is locked
+    - Reports a missing/expired OTP
+    - On match: deletes the OTP, failure counter and lock
+    - On mismatch: increments the failure counter (fixed window of
+      `fail_ttl`) and sets the lock once `max_attempts` is reached
 
-    # Set TTL on first failure
-    if attempts == 1:
-        await redis_client.expire(fail_key, OTP_VERIFY_FAIL_TTL)
+    Notes:
+    - The comparison runs server-side on HMAC outputs, which are not
+      attacker-predictable without the OTP secret key, so the non
+      constant-time Lua string comparison leaks nothing useful.
+    - Pass an empty `otp_hash` for malformed input; it never matches but
+      still counts as a failed attempt.
 
-    # Too many failures → lock
-    if attempts > OTP_VERIFY_MAX_ATTEMPTS:
-        await redis_client.set(
-            lock_key,
-            "1",
-            ex=OTP_VERIFY_LOCK_TTL,
-        )
-        await redis_client.delete(fail_key)
-
-        raise OTPVerificationAttemptsExceeded(
-            "Too many incorrect OTP attempts."
+    Raises:
+        OTPServiceUnavailable: If Redis is unavailable. Verification fails
+            closed: without the failure counters an attempt cannot be
+            safely allowed.
+    """
+    store = store or get_otp_store()
+    try:
+        return await store.verify_attempt(
+            phone,
+            purpose,
+            otp_hash,
+            max_attempts=max_attempts,
+            fail_ttl=fail_ttl,
+            lock_ttl=lock_ttl,
         )
+    except DependencyUnavailable as exc:
+        raise OTPServiceUnavailable(
+            "OTP verification is temporarily unavailable.",
+            retry_after=math.ceil(settings.REDIS_BREAKER_RESET_TIMEOUT),
+        ) from exc
@@ -25,5 +25,10 @@ class UserAuth(Base):
 
     password_updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
+    # Keyed digest of the current refresh token (legacy rows: Argon2 hash)
+    refresh_token_hash: Mapped[str | None] = mapped_column(
+        String(255), unique=True, index=True
+    )
+
     
     user: Mapped["User"] = relationship(back_populates="auth")  # pyright: ignore
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Connection pool metrics for the SQLAlchemy engines.
+
+    db_pool_checkout_seconds{pool}          time to obtain a connection:
+                                            waiting for a free one, or
+                                            opening a new one
+    db_pool_checkout_timeouts_total{pool}   checkouts that gave up after
+                                            DB_POOL_TIMEOUT
+    db_pool_connections{pool,state}         checked_out / idle / overflow
+    db_pool_saturation{pool}                checked-out connections over
+                                            pool_size + max_overflow
+
+Pools are per process, so with N uvicorn workers the database sees up
+to N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections. Sustained
+saturation near 1 with growing checkout time means the pool (or the
+database) is the bottleneck for that worker.
+"""
+
+from __future__ import annotations
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to obtain a pooled database connection",
+    ["pool"],
+    buckets=(
+        0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+        0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    ),
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Connection checkouts that timed out waiting for the pool",
+    ["pool"],
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled database connections by state",
+    ["pool", "state"],
+)
+
+DB_POOL_SATURATION = Gauge(
+    "db_pool_saturation",
+    "Checked-out connections as a fraction of pool capacity",
+    ["pool"],
+)
+
+
+class InstrumentedPoolMixin:
+    """Times `connect()` (the checkout) per pool, labelled by logging name."""
+
+    def connect(self):
+        pool = self.logging_name or "default"
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(pool).observe(time.perf_counter() - started)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def observe_pool(engine: AsyncEngine, name: str, *, capacity: int) -> None:
+    """
+    Export the engine's pool state as gauges.
+
+    `capacity` is pool_size + max_overflow. Reads `engine.pool` on every
+    scrape, so the gauges follow the pool across `dispose()`.
+    """
+    def pool() -> QueuePool:
+        return engine.sync_engine.pool
+
+    DB_POOL_CONNECTIONS.labels(name, "checked_out").set_function(
+        lambda: pool().checkedout()
+    )
+    DB_POOL_CONNECTIONS.labels(name, "idle").set_function(
+        lambda: pool().checkedin()
+    )
+    DB_POOL_CONNECTIONS.labels(name, "overflow").set_function(
+        lambda: max(pool().overflow(), 0)
+    )
+    DB_POOL_SATURATION.labels(name).set_function(
+        lambda: pool().checkedout() / capacity if capacity else 0.0
+    )
@@ -1,25 +1,247 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+"""
+Database engine, sessions and the request unit of work.
+
+The engine is created by `init_db` in the app lifespan, which also
+opens DB_POOL_WARMUP connections so a bad URL fails the deploy and the
+first requests do not pay for connection setup, and disposed by
+`close_db`. Pool sizing, recycling and the asyncpg statement cache come
+from the DB_* settings; pool checkout time and saturation are exported
+as metrics (see `pool_metrics`).
+
+Each API call runs in one unit of work (`get_db` / `DBSession`):
+repositories and services add, update and flush through the session but
+never commit, and the unit of work commits exactly once when the
+endpoint returns, or rolls back if it raised. A request that wrote
+nothing is rolled back instead, which skips the COMMIT round trip.
+
+Code outside a request (tasks, scripts) calls `init_db` first and opens
+its own with `async with unit_of_work() as db:`.
+
+Reads that can tolerate replication lag opt into the read replica
+(DATABASE_REPLICA_URL) with `execution_options=READ_REPLICA`. Once a
+session has written anything (a flush, or an INSERT/UPDATE/DELETE),
+its later reads stay on the primary, so a request always reads its own
+writes. Without a replica, every statement goes to the primary.
+
+Each unit of work counts the statements, flushes and commits issued
+through its session (UnitOfWorkStats); tests can collect them with
+`record_units_of_work()` to assert, e.g., one commit per endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Annotated, AsyncIterator, Iterator
+
+from fastapi import Depends
+from sqlalchemy import event, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker, DeclarativeBase
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedAsyncQueuePool, observe_pool
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    future=True,
-    pool_pre_ping=True,
-)
 
+def create_db_engine(url: str | None = None, *, name: str = "primary") -> AsyncEngine:
+    """
+    Build an engine over an instrumented, bounded connection pool.
+
+    No connection is opened until first use. `name` labels the pool's
+    metrics.
+    """
+    url = make_url(url or settings.DATABASE_URL)
+
+    connect_args = {}
+    if url.get_driver_name() == "asyncpg":
+        connect_args = {
+            # SQLAlchemy's cache of prepared statements per connection
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            # asyncpg's own statement cache
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_logging_name=name,
+        connect_args=connect_args,
+    )
+
+
+# Set by `init_db`
+engine: AsyncEngine | None = None
+# Set by `init_db` when DATABASE_REPLICA_URL is configured
+replica_engine: AsyncEngine | None = None
+
+# Execution options for a read that may run on the replica
+READ_REPLICA = {"replica": True}
+
+_WROTE_KEY = "wrote"
+
+
+class RoutingSession(Session):
+    """Sends replica-routed reads to `replica_engine`, the rest to the bind."""
+
+    def get_bind(self, mapper=None, *, replica: bool = False, **kw):
+        if replica and replica_engine is not None:
+            return replica_engine.sync_engine
+        return super().get_bind(mapper, **kw)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _route_read(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE_KEY] = True
+    elif state.execution_options.get("replica") and not state.session.info.get(_WROTE_KEY):
+        state.bind_arguments["replica"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_written(session: Session, flush_context) -> None:
+    session.info[_WROTE_KEY] = True
+
+
+# Bound to the engine by `init_db`
 AsyncSessionLocal = sessionmaker(
-    bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
 )
 
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` pooled connections at once and check each one."""
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(*(
+            stack.enter_async_context(engine.connect())
+            for _ in range(connections)
+        ))
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+
+
+async def init_db() -> None:
+    """Create the engines, bind sessions to the primary and warm up the pools."""
+    global engine, replica_engine
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    warmup = min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE)
+
+    engine = create_db_engine()
+    AsyncSessionLocal.configure(bind=engine)
+    observe_pool(engine, "primary", capacity=capacity)
+    await warm_up(engine, warmup)
+
+    if settings.DATABASE_REPLICA_URL:
+        replica_engine = create_db_engine(settings.DATABASE_REPLICA_URL, name="replica")
+        observe_pool(replica_engine, "replica", capacity=capacity)
+        await warm_up(replica_engine, warmup)
+
+
+async def close_db() -> None:
+    """Close every pooled connection at shutdown."""
+    global engine, replica_engine
+    for current in (engine, replica_engine):
+        if current is not None:
+            await current.dispose()
+    engine = replica_engine = None
+
+
+@dataclass
+class UnitOfWorkStats:
+    """Work issued through one unit of work's session."""
+
+    statements: int = 0
+    writes: int = 0
+    flushes: int = 0
+    commits: int = 0
+
+
+_STATS_KEY = "unit_of_work_stats"
+_recorders: list[list[UnitOfWorkStats]] = []
+
+
+def _stats(session: Session) -> UnitOfWorkStats | None:
+    return session.info.get(_STATS_KEY)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _count_statement(state: ORMExecuteState) -> None:
+    stats = _stats(state.session)
+    if stats is not None:
+        stats.statements += 1
+        if state.is_insert or state.is_update or state.is_delete:
+            stats.writes += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flush(session: Session, flush_context) -> None:
+    stats = _stats(session)
+    if stats is not None:
+        stats.flushes += 1
+        stats.writes += 1
+
+
+@event.listens_for(Session, "after_commit")
+def _count_commit(session: Session) -> None:
+    stats = _stats(session)
+    if stats is not None:
+        stats.commits += 1
+
+
+@asynccontextmanager
+async def unit_of_work(
+    session_factory: sessionmaker | None = None,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Session whose work is committed once, when the block exits cleanly.
+
+    Rolls back if the block raises, or if nothing was written. Uses
+    AsyncSessionLocal unless another factory is given.
+    """
+    async with (session_factory or AsyncSessionLocal)() as session:
+        stats = UnitOfWorkStats()
+        session.info[_STATS_KEY] = stats
+        try:
+            yield session
+            if stats.writes or session.new or session.dirty or session.deleted:
+                await session.commit()
+            else:
+                await session.rollback()
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            for recorded in _recorders:
+                recorded.append(stats)
+
+
+@contextmanager
+def record_units_of_work() -> Iterator[list[UnitOfWorkStats]]:
+    """Collect the stats of every unit of work that ends inside the block."""
+    recorded: list[UnitOfWorkStats] = []
+    _recorders.append(recorded)
+    try:
+        yield recorded
+    finally:
+        _recorders.remove(recorded)
+
+
 async def get_db():
-    async with AsyncSessionLocal() as session:
+    async with unit_of_work() as session:
         yield session
+
+
+# Function scope: the commit runs before the response is sent, so a
+# failed commit surfaces as an error instead of a reported success
+DBSession = Annotated[AsyncSession, Depends(get_db, scope="function")]
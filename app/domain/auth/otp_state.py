@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from enum import Enum
+
+
+@dataclass(frozen=True)
+class OTPRateLimitVerdict:
+    """
+    Outcome of an OTP send rate-limit check.
+
+    Attributes:
+        allowed: Whether the send may proceed.
+        reason: "ok", or the limit that rejected the send
+            ("cooldown", "window" or "daily").
+        retry_after: Seconds until the next send can be attempted.
+        remaining_in_window: Sends left in the current burst window.
+        remaining_today: Sends left in the daily quota.
+    """
+
+    allowed: bool
+    reason: str
+    retry_after: int
+    remaining_in_window: int
+    remaining_today: int
+
+
+class OTPVerifyStatus(str, Enum):
+    OK = "ok"
+    EXPIRED = "expired"
+    MISMATCH = "mismatch"
+    # Already locked before this attempt
+    LOCKED = "locked"
+    # This attempt exhausted the allowed failures and triggered the lock
+    LOCKOUT = "lockout"
+
+
+@dataclass(frozen=True)
+class OTPVerifyResult:
+    status: OTPVerifyStatus
+    fail_count: int = 0
+    retry_after: int = 0
+
+
+@dataclass(frozen=True)
+class OTPAggregateLimit:
+    """
+    A sliding-window send limit shared by many phones.
+
+    Attributes:
+        kind: What is being aggregated ("prefix" or "ip"); reported as the
+            rejection reason.
+        value: The aggregate's identity (e.g. "+919876" or "203.0.113.7").
+        limit: Sends allowed per sliding window.
+        window: Window length in seconds.
+        cooldown: Seconds the aggregate is blocked once it exceeds the limit.
+    """
+
+    kind: str
+    value: str
+    limit: int
+    window: int
+    cooldown: int
@@ -28,5 +28,6 @@ class LedgerEntryType(str, PyEnum):
 class PreUserOnboardingState(str, PyEnum):
     OTP_SENT = "OTP_SENT"
     OTP_VERIFIED = "OTP_VERIFIED"
+    CREDENTIALS_SET = "CREDENTIALS_SET"
     PROFILE_DONE = "PROFILE_DONE"
     READY_FOR_USER = "READY_FOR_USER"
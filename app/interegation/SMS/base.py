@@ -19,3 +19,15 @@ class SMSProvider:
             SMSDeliveryError: If the message fails to send.
         """
         raise NotImplementedError
+
+
+class SMSDeliveryError(Exception):
+    """Raised when an SMS could not be handed to the provider."""
+
+
+class SMSQueueFull(SMSDeliveryError):
+    """Raised when the delivery queue has no room for another message."""
+
+
+class SMSRejected(SMSDeliveryError):
+    """Raised when the gateway permanently refuses a message (no retry)."""
@@ -0,0 +1,46 @@
+"""
+Dead-letter store for SMS messages that exhausted their retries.
+
+Entries are kept in a capped Redis list for inspection and alerting.
+The message body is deliberately not stored: it usually carries an OTP,
+which must never be persisted in clear text and is useless once expired
+anyway. Only the destination, the failure and the attempt count are kept.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+from redis.asyncio import Redis
+
+import app.core.redis
+
+DEAD_LETTER_KEY = "sms:dead_letter"
+DEAD_LETTER_MAX_ENTRIES = 10_000
+
+
+async def record_dead_letter(
+    *,
+    phone: str,
+    error: BaseException,
+    attempts: int,
+    client: Redis | None = None,
+) -> None:
+    client = client or app.core.redis.redis_client
+    entry = json.dumps({
+        "phone": phone,
+        "error": f"{type(error).__name__}: {error}",
+        "attempts": attempts,
+        "failed_at": int(time.time()),
+    })
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.lpush(DEAD_LETTER_KEY, entry)
+        pipe.ltrim(DEAD_LETTER_KEY, 0, DEAD_LETTER_MAX_ENTRIES - 1)
+        await pipe.execute()
+
+
+async def list_dead_letters(limit: int = 100) -> list[dict]:
+    """Most recent dead-lettered sends, newest first."""
+    raw = await app.core.redis.redis_client.lrange(DEAD_LETTER_KEY, 0, limit - 1)
+    return [json.loads(item) for item in raw]
@@ -0,0 +1,79 @@
+import asyncio
+from functools import lru_cache
+
+from app.core.config import settings
+from app.interegation.SMS.queue import SMSDeliveryQueue
+from app.interegation.SMS.registry import get_sms_provider
+
+
+@lru_cache(maxsize=1)
+def get_sms_queue() -> SMSDeliveryQueue:
+    return SMSDeliveryQueue(
+        get_sms_provider(),
+        workers=settings.SMS_QUEUE_WORKERS,
+        maxsize=settings.SMS_QUEUE_MAXSIZE,
+        max_attempts=settings.SMS_MAX_ATTEMPTS,
+        lanes=settings.SMS_LANES,
+    )
+
+
+def _celery_priority(lane: str | None) -> int:
+    """Redis-broker priority (0 = first) from the lane's weight rank."""
+    ranked = sorted(settings.SMS_LANES, key=lambda n: -settings.SMS_LANES[n][0])
+    rank = ranked.index(lane) if lane in ranked else len(ranked) - 1
+    return min(rank * 3, 9)
+
+
+def sms_lane_accepting(lane: str | None) -> bool:
+    """
+    Whether a message for `lane` would be admitted right now.
+
+    Only the in-process queue sheds; Celery buffers in the broker.
+    """
+    if settings.SMS_DELIVERY_MODE != "queue":
+        return True
+    return get_sms_queue().accepts(lane)
+
+
+async def deliver_sms(phone: str, body: str, *, lane: str | None = None) -> None:
+    """
+    Hand an SMS to the configured delivery path (`SMS_DELIVERY_MODE`).
+
+    - "queue" (default): in-process queue, returns once enqueued
+    - "celery": publishes `app.tasks.sms.send_sms`, returns once published
+    - "inline": awaits the provider directly (tests, local debugging)
+
+    `lane` (an OTPPurpose value) selects the priority lane; see
+    `SMS_LANES`.
+
+    Raises:
+        SMSQueueFull: If the in-process queue is at capacity or the lane
+            is shedding load.
+    """
+    mode = settings.SMS_DELIVERY_MODE
+
+    if mode == "queue":
+        get_sms_queue().enqueue(phone, body, lane=lane)
+    elif mode == "celery":
+        from app.tasks.sms import send_sms
+
+        # Publishing talks to the broker synchronously; keep it off the loop
+        await asyncio.to_thread(
+            send_sms.apply_async,
+            args=(phone, body),
+            priority=_celery_priority(lane),
+        )
+    elif mode == "inline":
+        await get_sms_provider().send(phone, body)
+    else:
+        raise RuntimeError(f"Unknown SMS_DELIVERY_MODE {mode!r}")
+
+
+async def stop_sms_delivery() -> None:
+    """Drain the in-process queue and close the provider at shutdown."""
+    if get_sms_queue.cache_info().currsize:
+        await get_sms_queue().stop()
+    if get_sms_provider.cache_info().currsize:
+        aclose = getattr(get_sms_provider(), "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,155 @@
+"""
+Hedged SMS dispatch across several providers.
+
+A slow gateway p99 makes users wait for their OTP and request another,
+which multiplies load on send_otp and the rate limiter. The hedged
+provider sends through the currently fastest provider and, if that has
+not acknowledged within `hedge_delay`, fires the same message through the
+next one. The first acknowledgement wins; the remaining attempts are
+cancelled.
+
+- Providers are ordered per send by an EWMA of their observed latency,
+  so a gateway that degrades stops being primary on its own
+- A provider that fails outright triggers the next one immediately
+  rather than after the hedge delay
+- Failures feed a penalty sample into the EWMA
+- Cancelling an in-flight HTTP request does not guarantee the gateway
+  dropped it, so a hedged OTP may arrive twice. Both copies carry the
+  same code, which is the accepted cost of the lower tail latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.core.logging import get_logger
+from app.core.security.masking import _mask_phone
+from app.interegation.SMS.base import SMSProvider, SMSDeliveryError
+
+logger = get_logger(__name__)
+
+
+class LatencyEWMA:
+    """Exponentially weighted moving average of latency in seconds."""
+
+    def __init__(self, alpha: float) -> None:
+        self._alpha = alpha
+        self.value: float | None = None
+
+    def observe(self, sample: float) -> None:
+        if self.value is None:
+            self.value = sample
+        else:
+            self.value += self._alpha * (sample - self.value)
+
+
+class HedgedSMSProvider(SMSProvider):
+    """
+    Composite provider sending through the fastest of several providers.
+
+    Args:
+        providers: Named providers; dict order breaks ties (and decides the
+            primary before any latency has been observed).
+        hedge_delay: Seconds to wait for an acknowledgement before also
+            sending through the next provider.
+        alpha: EWMA smoothing factor (higher reacts faster).
+        failure_penalty: Latency sample recorded for a failed send.
+    """
+
+    def __init__(
+        self,
+        providers: dict[str, SMSProvider],
+        *,
+        hedge_delay: float,
+        alpha: float = 0.2,
+        failure_penalty: float = 5.0,
+    ) -> None:
+        if not providers:
+            raise ValueError("HedgedSMSProvider needs at least one provider")
+        self._providers = providers
+        self._hedge_delay = hedge_delay
+        self._failure_penalty = failure_penalty
+        self._latency = {name: LatencyEWMA(alpha) for name in providers}
+
+    @property
+    def latency_estimates(self) -> dict[str, float | None]:
+        return {name: ewma.value for name, ewma in self._latency.items()}
+
+    def _ranked(self) -> list[str]:
+        # Unmeasured providers sort first so each gets sampled
+        names = list(self._providers)
+        return sorted(
+            names,
+            key=lambda n: (
+                self._latency[n].value is not None,
+                self._latency[n].value or 0.0,
+                names.index(n),
+            ),
+        )
+
+    async def _attempt(self, name: str, phone: str, message: str) -> str:
+        started = time.perf_counter()
+        try:
+            await self._providers[name].send(phone, message)
+        except asyncio.CancelledError:
+            # Lost the race: its true latency is at least this long
+            self._latency[name].observe(time.perf_counter() - started)
+            raise
+        except Exception:
+            self._latency[name].observe(
+                max(time.perf_counter() - started, self._failure_penalty)
+            )
+            raise
+        self._latency[name].observe(time.perf_counter() - started)
+        return name
+
+    async def send(self, phone: str, message: str) -> None:
+        remaining = self._ranked()
+        running: set[asyncio.Task] = set()
+        last_error: BaseException | None = None
+
+        def launch() -> None:
+            running.add(asyncio.create_task(
+                self._attempt(remaining.pop(0), phone, message)
+            ))
+
+        launch()
+        try:
+            while running:
+                done, running = await asyncio.wait(
+                    running,
+                    timeout=self._hedge_delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    logger.info(
+                        "Hedging SMS send",
+                        extra={"phone": _mask_phone(phone), "provider": remaining[0]},
+                    )
+                    launch()
+                    continue
+
+                for task in done:
+                    if task.exception() is None:
+                        return
+                    last_error = task.exception()
+                    # Fail over at once instead of waiting out the hedge delay
+                    if remaining:
+                        launch()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if isinstance(last_error, SMSDeliveryError):
+            raise last_error
+        raise SMSDeliveryError("All SMS providers failed") from last_error
+
+    async def aclose(self) -> None:
+        for provider in self._providers.values():
+            aclose = getattr(provider, "aclose", None)
+            if aclose is not None:
+                await aclose()
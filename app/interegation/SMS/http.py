@@ -0,0 +1,128 @@
+"""
+HTTP SMS provider over a shared keep-alive connection pool.
+
+One `httpx.AsyncClient` is reused for every send, so TLS handshakes and
+TCP setup are paid once per pooled connection rather than per OTP.
+
+- Per-request connect/read/write/pool timeouts bound how long a slow
+  gateway can hold a delivery worker
+- A semaphore caps in-flight requests so a backlog cannot open more
+  concurrent sends than the gateway contract allows
+- 5xx, 429, timeouts and transport errors raise SMSDeliveryError and are
+  retried by the delivery queue; other 4xx raise SMSRejected and are
+  dead-lettered immediately
+
+The gateway contract is a JSON POST of {"to", "body"} to `/messages`
+with a bearer token. See stub_gateway.py for a local implementation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from app.core.config import settings
+from app.interegation.SMS.base import SMSProvider, SMSDeliveryError, SMSRejected
+
+
+class HTTPSMSProvider(SMSProvider):
+    """
+    Send SMS through an HTTP gateway.
+
+    Args:
+        base_url: Gateway root URL.
+        api_key: Bearer token sent with every request.
+        timeout: Per-request timeout in seconds.
+        max_connections: Size of the keep-alive connection pool.
+        max_concurrency: Maximum in-flight requests.
+        transport: Optional httpx transport (e.g. ASGITransport for the
+            stub gateway in tests and benchmarks).
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        api_key: str = "",
+        timeout: float = 2.0,
+        max_connections: int = 20,
+        max_concurrency: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._base_url = base_url
+        self._headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._timeout = httpx.Timeout(timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._max_concurrency = max_concurrency
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def from_settings(cls) -> "HTTPSMSProvider":
+        return cls(
+            base_url=settings.SMS_HTTP_BASE_URL,
+            api_key=settings.SMS_HTTP_API_KEY,
+            timeout=settings.SMS_HTTP_TIMEOUT,
+            max_connections=settings.SMS_HTTP_MAX_CONNECTIONS,
+            max_concurrency=settings.SMS_HTTP_MAX_CONCURRENCY,
+        )
+
+    @classmethod
+    def secondary_from_settings(cls) -> "HTTPSMSProvider":
+        """Second gateway (same contract and pool limits), for hedging."""
+        if not settings.SMS_HTTP_SECONDARY_BASE_URL:
+            raise RuntimeError("SMS_HTTP_SECONDARY_BASE_URL is not set")
+        return cls(
+            base_url=settings.SMS_HTTP_SECONDARY_BASE_URL,
+            api_key=settings.SMS_HTTP_SECONDARY_API_KEY,
+            timeout=settings.SMS_HTTP_TIMEOUT,
+            max_connections=settings.SMS_HTTP_MAX_CONNECTIONS,
+            max_concurrency=settings.SMS_HTTP_MAX_CONCURRENCY,
+        )
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        # Pooled connections are bound to the loop that opened them; Celery
+        # tasks run each send in a fresh loop, so rebuild when it changes
+        # (the tasks `aclose()` before their loop ends, so nothing leaks).
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers=self._headers,
+                timeout=self._timeout,
+                limits=self._limits,
+                transport=self._transport,
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._loop = loop
+        return self._client
+
+    async def send(self, phone: str, message: str) -> None:
+        client = self._ensure_client()
+
+        async with self._semaphore:
+            try:
+                response = await client.post(
+                    "/messages",
+                    json={"to": phone, "body": message},
+                )
+            except httpx.HTTPError as exc:
+                raise SMSDeliveryError(f"SMS gateway unreachable: {exc!r}") from exc
+
+        if response.status_code >= 500 or response.status_code == 429:
+            raise SMSDeliveryError(f"SMS gateway error {response.status_code}")
+        if response.status_code >= 400:
+            raise SMSRejected(f"SMS gateway rejected message: {response.status_code}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+            self._loop = None
@@ -0,0 +1,304 @@
+"""
+In-process SMS delivery queue.
+
+`send_otp` used to await the provider inline, so a slow gateway added its
+full latency to `/auth/send-otp`. Messages are now put on a bounded
+in-memory queue and delivered by a fixed set of worker tasks; the request
+returns as soon as the OTP is stored and the message is enqueued.
+
+- Failed sends are retried with exponential backoff and jitter, without
+  holding a worker while waiting
+- After `SMS_MAX_ATTEMPTS`, or at once for SMSRejected, the failure is
+  written to the dead-letter store (see dead_letter.py)
+- A full queue rejects new messages with SMSQueueFull rather than
+  buffering without bound
+- Workers start lazily on first use and are drained from the app
+  lifespan; messages still queued at shutdown are dead-lettered
+
+Priority lanes:
+    Messages are queued per lane (one per OTPPurpose by default). Workers
+    drain non-empty lanes by smooth weighted round robin, so a signup
+    spike cannot starve login OTPs. Each lane also has a shed threshold,
+    a fraction of the total capacity: once overall depth reaches it, the
+    lane refuses new messages. With login at 1.0 and signup at 0.7,
+    signup sends are shed while 30% of the queue is still reserved for
+    logins. Depth and sheds are exported per lane.
+
+Delivery is at-most-once per attempt and the queue lives in process
+memory, so a crash loses queued messages. Use `SMS_DELIVERY_MODE=celery`
+when sends must survive restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from dataclasses import dataclass, field
+
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security.masking import _mask_phone
+from app.interegation.SMS.base import SMSProvider, SMSQueueFull, SMSRejected
+from app.interegation.SMS.dead_letter import record_dead_letter
+
+logger = get_logger(__name__)
+
+SMS_QUEUE_DEPTH = Gauge(
+    "sms_queue_depth",
+    "SMS messages waiting for a delivery worker",
+    ["lane"],
+)
+SMS_QUEUE_SHED = Counter(
+    "sms_queue_shed_total",
+    "SMS messages refused because their lane was shedding load",
+    ["lane"],
+)
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff before retry number `attempt` (1-based), with full jitter."""
+    ceiling = min(
+        settings.SMS_RETRY_MAX_DELAY,
+        settings.SMS_RETRY_BASE_DELAY * 2 ** (attempt - 1),
+    )
+    return random.uniform(0, ceiling)
+
+
+@dataclass
+class SMSMessage:
+    phone: str
+    body: str
+    lane: str
+    attempts: int = 0
+
+
+@dataclass
+class _Lane:
+    weight: int
+    shed_at: float
+    messages: deque[SMSMessage] = field(default_factory=deque)
+    # Smooth weighted round-robin state
+    current: int = 0
+
+
+class SMSDeliveryQueue:
+    """
+    Bounded, lane-aware queue with worker tasks delivering through one provider.
+
+    Args:
+        provider: Provider used for every send.
+        workers: Number of concurrent delivery tasks.
+        maxsize: Maximum number of messages waiting for a worker, across
+            all lanes.
+        max_attempts: Sends per message before it is dead-lettered.
+        lanes: Lane name -> (weight, shed_at). Messages for an unknown
+            lane go to the most sheddable lane. Defaults to one lane.
+    """
+
+    def __init__(
+        self,
+        provider: SMSProvider,
+        *,
+        workers: int,
+        maxsize: int,
+        max_attempts: int,
+        lanes: dict[str, tuple[int, float]] | None = None,
+    ) -> None:
+        self._provider = provider
+        self._workers = workers
+        self._maxsize = maxsize
+        self._max_attempts = max_attempts
+        self._lanes = {
+            name: _Lane(weight=weight, shed_at=shed_at)
+            for name, (weight, shed_at) in (lanes or {"default": (1, 1.0)}).items()
+        }
+        self._fallback_lane = min(self._lanes, key=lambda n: self._lanes[n].shed_at)
+        self._depth = 0
+        self._unfinished = 0
+        self._not_empty: asyncio.Event | None = None
+        self._idle: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        # Dead-letter writes started outside a worker (see `_requeue`)
+        self._dead_letter_tasks: set[asyncio.Task] = set()
+        # Messages waiting out a backoff, keyed by id(message)
+        self._retries: dict[int, tuple[asyncio.TimerHandle, SMSMessage, Exception]] = {}
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def retrying(self) -> int:
+        return len(self._retries)
+
+    def start(self) -> None:
+        if self.started:
+            return
+        self._not_empty = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"sms-worker-{i}")
+            for i in range(self._workers)
+        ]
+
+    def _lane_name(self, lane: str | None) -> str:
+        return lane if lane in self._lanes else self._fallback_lane
+
+    def accepts(self, lane: str | None = None) -> bool:
+        """Whether a new message for `lane` would be admitted right now."""
+        return self._depth < self._lanes[self._lane_name(lane)].shed_at * self._maxsize
+
+    def enqueue(self, phone: str, body: str, *, lane: str | None = None) -> None:
+        """
+        Queue a message for delivery.
+
+        Raises:
+            SMSQueueFull: If the queue is at capacity, or the lane is
+                shedding load.
+        """
+        self.start()
+        name = self._lane_name(lane)
+        if not self.accepts(name):
+            SMS_QUEUE_SHED.labels(lane=name).inc()
+            raise SMSQueueFull("SMS delivery queue is full")
+        self._push(SMSMessage(phone=phone, body=body, lane=name))
+
+    def _push(self, message: SMSMessage) -> None:
+        self._lanes[message.lane].messages.append(message)
+        self._depth += 1
+        self._unfinished += 1
+        SMS_QUEUE_DEPTH.labels(lane=message.lane).inc()
+        self._idle.clear()
+        self._not_empty.set()
+
+    def _pop(self) -> SMSMessage | None:
+        ready = [lane for lane in self._lanes.values() if lane.messages]
+        if not ready:
+            return None
+
+        total = sum(lane.weight for lane in ready)
+        for lane in ready:
+            lane.current += lane.weight
+        chosen = max(ready, key=lambda lane: lane.current)
+        chosen.current -= total
+
+        message = chosen.messages.popleft()
+        self._depth -= 1
+        SMS_QUEUE_DEPTH.labels(lane=message.lane).dec()
+        return message
+
+    def _task_done(self) -> None:
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+    async def join(self) -> None:
+        """Wait until every queued message has been processed once."""
+        if self.started:
+            await self._idle.wait()
+
+    async def _worker(self) -> None:
+        while True:
+            message = self._pop()
+            if message is None:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+            try:
+                await self._deliver(message)
+            finally:
+                self._task_done()
+
+    async def _deliver(self, message: SMSMessage) -> None:
+        message.attempts += 1
+        try:
+            await self._provider.send(message.phone, message.body)
+        except Exception as exc:
+            await self._on_failure(message, exc)
+
+    async def _on_failure(self, message: SMSMessage, exc: Exception) -> None:
+        masked = _mask_phone(message.phone)
+
+        if message.attempts >= self._max_attempts or isinstance(exc, SMSRejected):
+            logger.error(
+                "SMS delivery failed permanently",
+                extra={"phone": masked, "attempts": message.attempts},
+            )
+            await self._dead_letter(message, exc)
+            return
+
+        delay = retry_delay(message.attempts)
+        logger.warning(
+            "SMS delivery failed, retrying",
+            extra={"phone": masked, "attempts": message.attempts, "delay": delay},
+        )
+        handle = asyncio.get_running_loop().call_later(
+            delay, self._requeue, message, exc
+        )
+        self._retries[id(message)] = (handle, message, exc)
+
+    def _requeue(self, message: SMSMessage, exc: Exception) -> None:
+        self._retries.pop(id(message), None)
+        # Retries were already admitted once; only hard capacity applies
+        if self._depth >= self._maxsize:
+            task = asyncio.create_task(self._dead_letter(message, exc))
+            self._dead_letter_tasks.add(task)
+            task.add_done_callback(self._dead_letter_done)
+            return
+        self._push(message)
+
+    def _dead_letter_done(self, task: asyncio.Task) -> None:
+        self._dead_letter_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("SMS dead-letter task failed", exc_info=task.exception())
+
+    async def _dead_letter(self, message: SMSMessage, exc: BaseException) -> None:
+        try:
+            await record_dead_letter(
+                phone=message.phone,
+                error=exc,
+                attempts=message.attempts,
+            )
+        except Exception:
+            logger.exception(
+                "Could not record SMS dead letter",
+                extra={"phone": _mask_phone(message.phone)},
+            )
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Drain the queue (up to `timeout` seconds), then stop the workers.
+
+        Messages still queued or waiting for a retry are dead-lettered.
+        """
+        if not self.started:
+            return
+
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        for handle, message, exc in self._retries.values():
+            handle.cancel()
+            await self._dead_letter(message, exc)
+        self._retries.clear()
+        await asyncio.gather(*self._dead_letter_tasks, return_exceptions=True)
+
+        shutdown = RuntimeError("SMS queue stopped before delivery")
+        while (message := self._pop()) is not None:
+            await self._dead_letter(message, shutdown)
+        self._unfinished = 0
@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Callable
+
+from app.core.config import settings
+from app.interegation.SMS.base import SMSProvider
+from app.interegation.SMS.console import ConsoleSMSProvider
+from app.interegation.SMS.hedged import HedgedSMSProvider
+from app.interegation.SMS.http import HTTPSMSProvider
+
+
+def _hedged() -> HedgedSMSProvider:
+    names = [n.strip() for n in settings.SMS_HEDGE_PROVIDERS.split(",") if n.strip()]
+    unknown = [n for n in names if n not in _PROVIDERS or n == "hedged"]
+    if unknown:
+        raise RuntimeError(f"Unknown SMS_HEDGE_PROVIDERS entries: {unknown}")
+    return HedgedSMSProvider(
+        {name: _PROVIDERS[name]() for name in names},
+        hedge_delay=settings.SMS_HEDGE_DELAY,
+        alpha=settings.SMS_HEDGE_EWMA_ALPHA,
+    )
+
+
+_PROVIDERS: dict[str, Callable[[], SMSProvider]] = {
+    "console": ConsoleSMSProvider,
+    "http": HTTPSMSProvider.from_settings,
+    "http_secondary": HTTPSMSProvider.secondary_from_settings,
+    "hedged": _hedged,
+}
+
+
+@lru_cache(maxsize=1)
+def get_sms_provider() -> SMSProvider:
+    """
+    Return the process-wide provider selected by `SMS_PROVIDER`.
+
+    Providers may hold connection pools, so one instance is shared by
+    every send instead of being built per OTP.
+    """
+    try:
+        return _PROVIDERS[settings.SMS_PROVIDER]()
+    except KeyError:
+        raise RuntimeError(
+            f"Unknown SMS_PROVIDER {settings.SMS_PROVIDER!r}"
+        ) from None
@@ -0,0 +1,78 @@
+"""
+Local stub SMS gateway for load tests and benchmarks.
+
+An ASGI app implementing the HTTPSMSProvider contract with configurable
+latency and failure injection. Use it in-process without a network:
+
+    transport = httpx.ASGITransport(app=create_stub_gateway(latency=0.05))
+    provider = HTTPSMSProvider(base_url="http://stub", transport=transport)
+
+or run it standalone and point SMS_HTTP_BASE_URL at it:
+
+    uvicorn "app.interegation.SMS.stub_gateway:create_stub_gateway" --factory --port 9000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class StubGatewayStats:
+    accepted: int = 0
+    failed: int = 0
+    recipients: set[str] = field(default_factory=set)
+
+
+def create_stub_gateway(
+    *,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    seed: int | None = None,
+) -> FastAPI:
+    """
+    Build a stub gateway.
+
+    Args:
+        latency: Base delay per request in seconds.
+        jitter: Extra uniform random delay in [0, jitter] seconds.
+        error_rate: Fraction of requests answered with `error_status`.
+        error_status: Status code returned for injected failures.
+        seed: Seed for reproducible latency/failure sequences.
+    """
+    rng = random.Random(seed)
+    stats = StubGatewayStats()
+    gateway = FastAPI(title="Stub SMS gateway")
+    gateway.state.stats = stats
+
+    @gateway.post("/messages")
+    async def send_message(request: Request):
+        payload = await request.json()
+        delay = latency + (rng.uniform(0, jitter) if jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if rng.random() < error_rate:
+            stats.failed += 1
+            return JSONResponse({"error": "injected failure"}, status_code=error_status)
+
+        stats.accepted += 1
+        stats.recipients.add(payload["to"])
+        return JSONResponse({"status": "queued"}, status_code=202)
+
+    @gateway.get("/stats")
+    async def get_stats():
+        return {
+            "accepted": stats.accepted,
+            "failed": stats.failed,
+            "recipients": len(stats.recipients),
+        }
+
+    return gateway
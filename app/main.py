@@ -1,10 +1,32 @@
-import uvicorn 
+import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+from prometheus_client import make_asgi_app
 from app.api.v1.router import router as v1_router
 from app.core.Utils.phone import InvalidPhoneNumber
+from app.core.security.hashing.base import HashingOverloaded
+from app.core.security.hashing.executor import hashing_pool
+from app.core.redis import init_redis, close_redis
+from app.db.session import init_db, close_db
+from app.interegation.SMS.base import SMSQueueFull
+from app.interegation.SMS.delivery import stop_sms_delivery
+from app.auth.OTP.otp_exceptions import OTPRateLimitExceeded, OTPServiceUnavailable
+from app.core.security.request_rate_limit import RateLimitExceeded
 
-app = FastAPI(title="FinGuard API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await init_redis()
+    yield
+    await stop_sms_delivery()
+    await close_redis()
+    await close_db()
+    hashing_pool.shutdown()
+
+
+app = FastAPI(title="FinGuard API", lifespan=lifespan)
 
 @app.exception_handler(InvalidPhoneNumber)
 async def invalid_phone_handler(request: Request, exc: InvalidPhoneNumber):
@@ -13,11 +35,58 @@ async def invalid_phone_handler(request: Request, exc: InvalidPhoneNumber):
         content={"detail": str(exc)},
     )
 
+@app.exception_handler(HashingOverloaded)
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+@app.exception_handler(SMSQueueFull)
+async def sms_queue_full_handler(request: Request, exc: SMSQueueFull):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "OTP delivery is busy. Please try again shortly."},
+        headers={"Retry-After": "5"},
+    )
+
+@app.exception_handler(OTPRateLimitExceeded)
+async def otp_rate_limit_handler(request: Request, exc: OTPRateLimitExceeded):
+    headers = {}
+    if exc.retry_after:
+        headers["Retry-After"] = str(exc.retry_after)
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers=headers,
+    )
+
+@app.exception_handler(OTPServiceUnavailable)
+async def otp_service_unavailable_handler(request: Request, exc: OTPServiceUnavailable):
+    headers = {}
+    if exc.retry_after:
+        headers["Retry-After"] = str(exc.retry_after)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers=headers,
+    )
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests. Please try again later."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.get("/health")
 def health_check():
     return {"status":"ok"}
 
 app.include_router(v1_router)
+app.mount("/metrics", make_asgi_app())
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
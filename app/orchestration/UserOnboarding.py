@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 
-from app.services.OTP.issue_otp import issue_otp
+from app.auth.OTP.engine import get_otp_engine
 from app.core.Utils.phone import normalize_phone
 from app.domain.user.status import OnboardingState
 from app.domain.user.preuser_onboarding import create_preuser
@@ -9,7 +9,6 @@ from app.schemas.User.signup import (
     PhoneSubmitResponse,
     OTPVerifyResponse,
 )
-from app.services.OTP.verify_otp import verify_otp_flow
 from app.services.User.preuser_credentials import (
     set_preuser_password,
     InvalidPreUserState,
@@ -53,18 +52,24 @@ class ProfileAlreadyCompletedError(UserOnboardingError):
 class UserOnboarding:
 
     @staticmethod
-    async def submit_phone(phone: str) -> PhoneSubmitResponse:
+    async def submit_phone(
+        phone: str,
+        *,
+        client_ip: str | None = None,
+    ) -> PhoneSubmitResponse:
         """
         Step 1–3:
         - Phone submitted
-        - OTP issued & stored
+        - OTP rate-limited (per phone, and per IP / number range against
+          SMS pumping), issued, stored & sent
         """
 
         normalized_phone = normalize_phone(phone)
 
-        await issue_otp(
-            phone=normalized_phone,
-            purpose=OTPPurpose.SIGNUP,
+        await get_otp_engine().send(
+            normalized_phone,
+            OTPPurpose.SIGNUP,
+            client_ip=client_ip,
         )
 
         return PhoneSubmitResponse(
@@ -87,11 +92,7 @@ class UserOnboarding:
 
         normalized_phone = normalize_phone(phone)
 
-        await verify_otp_flow(
-            phone=phone,
-            otp=otp,
-            purpose=OTPPurpose.SIGNUP,
-        )
+        await get_otp_engine().verify(normalized_phone, otp, OTPPurpose.SIGNUP)
 
         await create_preuser(
             db=db,
@@ -220,7 +221,6 @@ class UserOnboarding:
             raise InvalidOnboardingState()
 
         user.onboarding_state = OnboardingState.KYC_SUBMITTED
-        await db.commit()
 
     @staticmethod
     async def approve_kyc(
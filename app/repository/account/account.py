@@ -1,7 +1,7 @@
-from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.account import Account
+from app.db.statements import ACCOUNT_UPGRADE_TO_FULL
 from app.domain.enums import AccountTier, AccountStatus
 
 
@@ -22,7 +22,7 @@ class AccountRepository:
         )
 
         db.add(account)
-        await db.commit()
+        await db.flush()
         await db.refresh(account)
         return account
 
@@ -32,12 +32,6 @@ class AccountRepository:
         db: AsyncSession,
         account_id: int,
     ) -> None:
-        await db.execute(
-            update(Account)
-            .where(Account.id == account_id)
-            .values(
-                tier="FULL",
-                daily_limit=None,  
-            )
-        )
-        await db.commit()
\ No newline at end of file
+        # Consuming the returned row refreshes a loaded Account in place
+        result = await db.scalars(ACCOUNT_UPGRADE_TO_FULL, {"account_id": account_id})
+        result.all()
\ No newline at end of file
@@ -1,10 +1,40 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, Iterable
 
-from sqlalchemy import select, update
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from app.db.models.User.pre_user import PreUser
+from app.db.session import READ_REPLICA
+from app.db.statements import (
+    PREUSER_BY_ID,
+    PREUSER_BY_PHONE,
+    PREUSER_SET_STATE,
+    preuser_update,
+)
+
+# Rows per bulk upsert statement (2 bind parameters each; asyncpg allows
+# at most 32767 per statement)
+UPSERT_BATCH_SIZE = 1000
+
+
+def _upsert_statement(rows: list[dict[str, Any]]):
+    """
+    INSERT ... ON CONFLICT (phone) DO UPDATE ... RETURNING the full row.
+
+    Atomic per row: concurrent upserts for the same phone serialize on
+    the unique index instead of racing a SELECT and failing the INSERT.
+    """
+    stmt = insert(PreUser).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[PreUser.phone],
+        set_={
+            "onboarding_state": stmt.excluded.onboarding_state,
+            "updated_at": func.now(),
+        },
+    ).returning(PreUser)
 
 
 class PreUserRepository:
@@ -13,6 +43,8 @@ class PreUserRepository:
 
     Handles all database operations related to PreUser, including
     CRUD and state management. Designed for async usage with SQLAlchemy.
+    Methods never commit; the caller's unit of work does (see
+    `app.db.session`).
     """
 
     async def upsert_by_phone(
@@ -25,6 +57,10 @@ class PreUserRepository:
         """
         Insert a new PreUser if phone does not exist, otherwise update the onboarding_state.
 
+        A single INSERT ... ON CONFLICT ... RETURNING statement, so it is
+        safe against concurrent calls for the same phone. Committed by the
+        caller's unit of work.
+
         Args:
             db (AsyncSession): SQLAlchemy async session.
             phone (str): Phone number of the PreUser.
@@ -33,32 +69,115 @@ class PreUserRepository:
         Returns:
             PreUser: The created or updated PreUser instance.
         """
-        result = await db.execute(
-            select(PreUser).where(PreUser.phone == phone)
+        result = await db.scalars(
+            _upsert_statement([{"phone": phone, "onboarding_state": onboarding_state}]),
+            execution_options={"populate_existing": True},
         )
-        preuser = result.scalar_one_or_none()
-
-        if preuser:
-            preuser.onboarding_state = onboarding_state
-        else:
-            preuser = PreUser(
-                phone=phone,
-                onboarding_state=onboarding_state,
+        return result.one()
+
+    async def upsert_many_by_phone(
+        self,
+        db: AsyncSession,
+        *,
+        phones: Iterable[str],
+        onboarding_state: str,
+    ) -> list[PreUser]:
+        """
+        Bulk variant of `upsert_by_phone`, e.g. for partner batch imports.
+
+        Duplicate phones are collapsed (Postgres rejects a statement that
+        updates the same row twice). Runs one statement per
+        UPSERT_BATCH_SIZE phones.
+
+        Args:
+            db (AsyncSession): SQLAlchemy async session.
+            phones (Iterable[str]): Phone numbers of the PreUsers.
+            onboarding_state (str): Onboarding state for every row.
+
+        Returns:
+            list[PreUser]: The created or updated PreUsers, in no particular order.
+        """
+        unique = list(dict.fromkeys(phones))
+        preusers: list[PreUser] = []
+
+        for start in range(0, len(unique), UPSERT_BATCH_SIZE):
+            rows = [
+                {"phone": phone, "onboarding_state": onboarding_state}
+                for phone in unique[start:start + UPSERT_BATCH_SIZE]
+            ]
+            result = await db.scalars(
+                _upsert_statement(rows),
+                execution_options={"populate_existing": True},
             )
-            db.add(preuser)
+            preusers.extend(result.all())
+
+        return preusers
+
+    async def transition_by_phone(
+        self,
+        db: AsyncSession,
+        *,
+        phone: str,
+        from_state: str,
+        to_state: str,
+        write_once: InstrumentedAttribute | None = None,
+        values: dict[str, Any] | None = None,
+    ) -> PreUser | None:
+        """
+        Compare-and-set an onboarding step in one UPDATE ... RETURNING.
 
-        await db.commit()
-        await db.refresh(preuser)
-        await db.flush()
-        return preuser
+        The row is updated only if it is still in `from_state` and, when
+        given, its `write_once` column is still NULL, so the check and the
+        write cannot be interleaved with a concurrent request.
 
-    async def get_by_phone(self, db: AsyncSession, phone: str) -> PreUser:
+        Args:
+            db (AsyncSession): SQLAlchemy async session.
+            phone (str): Phone number of the PreUser.
+            from_state (str): State the PreUser must currently be in.
+            to_state (str): State to move it to.
+            write_once (InstrumentedAttribute | None): Column that must
+                still be NULL.
+            values (dict[str, Any] | None): Other columns to set.
+
+        Returns:
+            PreUser | None: The updated PreUser, or None if no row matched
+            (missing phone, other state, or write-once column already
+            set); call `get_by_phone` to find out which.
+        """
+        conditions = [
+            PreUser.phone == phone,
+            PreUser.onboarding_state == from_state,
+        ]
+        if write_once is not None:
+            conditions.append(write_once.is_(None))
+
+        result = await db.scalars(
+            update(PreUser)
+            .where(*conditions)
+            .values(**(values or {}), onboarding_state=to_state, updated_at=func.now())
+            .returning(PreUser),
+            execution_options={
+                "synchronize_session": False,
+                "populate_existing": True,
+            },
+        )
+        return result.one_or_none()
+
+    async def get_by_phone(
+        self,
+        db: AsyncSession,
+        phone: str,
+        *,
+        replica: bool = False,
+    ) -> PreUser:
         """
         Retrieve a PreUser by phone number.
 
         Args:
             db (AsyncSession): SQLAlchemy async session.
             phone (str): Phone number to search.
+            replica (bool): Allow reading from the read replica (possibly
+                lagging) unless this session has already written.
 
         Returns:
             PreUser: The matching PreUser.
@@ -67,7 +186,9 @@ class PreUserRepository:
             NoResultFound: If no PreUser exists with the given phone.
         """
         result = await db.execute(
-            select(PreUser).where(PreUser.phone == phone)
+            PREUSER_BY_PHONE,
+            {"phone": phone},
+            execution_options=READ_REPLICA if replica else {},
         )
         return result.scalar_one()
 
@@ -85,9 +206,7 @@ class PreUserRepository:
         Raises:
             NoResultFound: If no PreUser exists with the given ID.
         """
-        result = await db.execute(
-            select(PreUser).where(PreUser.id == preuser_id)
-        )
+        result = await db.execute(PREUSER_BY_ID, {"preuser_id": preuser_id})
         return result.scalar_one()
 
     async def update_state(
@@ -105,12 +224,11 @@ class PreUserRepository:
             preuser_id (int): ID of the PreUser.
             onboarding_state (str): New onboarding state.
         """
-        await db.execute(
-            update(PreUser)
-            .where(PreUser.id == preuser_id)
-            .values(onboarding_state=onboarding_state)
+        result = await db.scalars(
+            PREUSER_SET_STATE,
+            {"preuser_id": preuser_id, "new_onboarding_state": onboarding_state},
         )
-        await db.commit()
+        result.all()
 
     async def update_profile(
         self,
@@ -128,11 +246,13 @@ class PreUserRepository:
 
         Warning:
             Ensure keys in profile_data match model columns to avoid runtime errors.
+
+        One prebuilt statement per distinct set of keys (see
+        `app.db.statements.preuser_update`); a PreUser already loaded in
+        the session is refreshed from the returned row.
         """
-        await db.execute(
-            update(PreUser)
-            .where(PreUser.id == preuser_id)
-            .values(**profile_data)
-        )
-        await db.commit()
+        params = {f"new_{column}": value for column, value in profile_data.items()}
+        params["preuser_id"] = preuser_id
+        result = await db.scalars(preuser_update(tuple(sorted(profile_data))), params)
+        result.all()
 
@@ -1,8 +1,10 @@
 from datetime import datetime
-from sqlalchemy import select, update
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.User.user_kyc import UserKYC
+from app.db.session import READ_REPLICA
+from app.db.statements import USER_KYC_BY_USER_ID
 from app.domain.kyc.enums import KYCStatus
 
 
@@ -12,9 +14,14 @@ class UserKYCRepository:
         self,
         db: AsyncSession,
         user_id,
+        *,
+        replica: bool = False,
     ) -> UserKYC | None:
+        # replica: may read a lagging copy unless this session has written
         result = await db.execute(
-            select(UserKYC).where(UserKYC.user_id == user_id)
+            USER_KYC_BY_USER_ID,
+            {"user_id": user_id},
+            execution_options=READ_REPLICA if replica else {},
         )
         return result.scalar_one_or_none()
 
@@ -35,7 +42,7 @@ class UserKYCRepository:
         )
 
         db.add(kyc)
-        await db.commit()
+        await db.flush()
         await db.refresh(kyc)
         return kyc
 
@@ -59,5 +66,4 @@ class UserKYCRepository:
             update(UserKYC)
             .where(UserKYC.user_id == user_id)
             .values(**values)
-        )
-        await db.commit()
\ No newline at end of file
+        )
\ No newline at end of file
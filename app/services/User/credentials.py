@@ -4,7 +4,7 @@ from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security.hashing.password import PasswordHasher
-from app.core.security.hashing.pin import hash_pin
+from app.core.security.hashing.pin import hash_pin_async
 from app.db.models.User.pre_user import PreUser
 
 
@@ -24,7 +24,7 @@ async def set_password(
     Validation and policy enforcement must occur upstream.
     """
 
-    hashed_password = _password_hasher.hash(password)
+    hashed_password = await _password_hasher.hash_async(password)
 
     result = await db.execute(
         update(PreUser)
@@ -35,8 +35,6 @@ async def set_password(
     if result.rowcount != 1:
         raise ValueError(f"PreUser {preuser_id} not found")
 
-    await db.commit()
-
 
 async def set_pin(
     *,
@@ -51,7 +49,7 @@ async def set_pin(
     separate peppering policy.
     """
 
-    hashed_pin = hash_pin(pin)
+    hashed_pin = await hash_pin_async(pin)
 
     result = await db.execute(
         update(PreUser)
@@ -61,5 +59,3 @@ async def set_pin(
 
     if result.rowcount != 1:
         raise ValueError(f"PreUser {preuser_id} not found")
-
-    await db.commit()
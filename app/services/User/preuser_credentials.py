@@ -36,27 +36,36 @@ async def set_preuser_password(
     repo = PreUserRepository()
     hasher = PasswordHasher()
 
-    # Fetch PreUser
+    # Reject before hashing: an Argon2 hash is too costly to spend on a
+    # request that cannot succeed (raises NoResultFound for unknown phones)
     preuser = await repo.get_by_phone(db, phone)
+    _ensure_password_can_be_set(preuser)
 
-    # State guard
+    hashed_password = await hasher.hash_async(raw_password)
+
+    # The UPDATE re-checks both guards, so of two concurrent requests
+    # only one can set the password
+    updated = await repo.transition_by_phone(
+        db,
+        phone=phone,
+        from_state=PreUserOnboardingState.OTP_VERIFIED,
+        to_state=PreUserOnboardingState.CREDENTIALS_SET,
+        write_once=PreUser.hashed_password,
+        values={"hashed_password": hashed_password},
+    )
+    if updated is not None:
+        return updated
+
+    # A concurrent request changed the row after the pre-check
+    await db.refresh(preuser)
+    _ensure_password_can_be_set(preuser)
+    raise CredentialsAlreadySet("Password already set for this user")
+
+
+def _ensure_password_can_be_set(preuser: PreUser) -> None:
     if preuser.onboarding_state != PreUserOnboardingState.OTP_VERIFIED:
         raise InvalidPreUserState(
             f"Cannot set password in state {preuser.onboarding_state}"
         )
-
-    # Write-once guard
     if preuser.hashed_password:
         raise CredentialsAlreadySet("Password already set for this user")
-    hashed_password = hasher.hash(raw_password)
-
-    await repo.update_profile(
-        db,
-        preuser_id=preuser.id,
-        profile_data={
-            "hashed_password": hashed_password,
-            "onboarding_state": PreUserOnboardingState.CREDENTIALS_SET,
-        },
-    )
-
-    return await repo.get(db, preuser.id)
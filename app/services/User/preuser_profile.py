@@ -38,29 +38,28 @@ async def complete_basic_profile(
 
     repo = PreUserRepository()
 
-    preuser = await repo.get_by_phone(db, phone)
-
-    # State guard
-    if preuser.onboarding_state != PreUserOnboardingState.CREDENTIALS_SET:
-        raise InvalidPreUserState(
-            f"Cannot complete profile in state {preuser.onboarding_state}"
-        )
-
-    # Write-once guard
-    if preuser.profile_completed_at is not None:
-        raise ProfileAlreadyCompleted("Profile already completed")
-
-    await repo.update_profile(
+    # State and write-once guards are part of the UPDATE itself
+    preuser = await repo.transition_by_phone(
         db,
-        preuser_id=preuser.id,
-        profile_data={
+        phone=phone,
+        from_state=PreUserOnboardingState.CREDENTIALS_SET,
+        to_state=PreUserOnboardingState.PROFILE_DONE,
+        write_once=PreUser.profile_completed_at,
+        values={
             "first_name": first_name,
             "last_name": last_name,
             "date_of_birth": date_of_birth,
             "address": address,
             "profile_completed_at": datetime.utcnow(),
-            "onboarding_state": PreUserOnboardingState.PROFILE_DONE,
         },
     )
+    if preuser is not None:
+        return preuser
 
-    return await repo.get(db, preuser.id)
+    # Nothing updated: find out why (raises NoResultFound for unknown phones)
+    preuser = await repo.get_by_phone(db, phone)
+    if preuser.onboarding_state != PreUserOnboardingState.CREDENTIALS_SET:
+        raise InvalidPreUserState(
+            f"Cannot complete profile in state {preuser.onboarding_state}"
+        )
+    raise ProfileAlreadyCompleted("Profile already completed")
@@ -1,9 +1,9 @@
-from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from uuid import uuid4
 from decimal import Decimal
 
 from app.db.models.account import Account
+from app.db.statements import ACCOUNT_BY_USER_AND_CURRENCY
 from app.domain.enums import CurrencyCode
 from app.services.audit_log import create_audit_log
 from fastapi import HTTPException, status
@@ -22,10 +22,8 @@ class AccountService:
 
         # Check existing
         result = await db.execute(
-            select(Account).where(
-                Account.user_id == user.id,
-                Account.currency == currency
-            )
+            ACCOUNT_BY_USER_AND_CURRENCY,
+            {"user_id": user.id, "currency": currency},
         )
         existing = result.scalar_one_or_none()
 
@@ -60,12 +58,12 @@ class AccountService:
         )
         db.add(audit)
 
-        # Commit
+        # Flush now so constraint violations surface here; the request's
+        # unit of work commits (and rolls back on the error below)
         try:
-            await db.commit()
+            await db.flush()
             await db.refresh(new_acc)
         except IntegrityError:
-            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database integrity error"
@@ -1,8 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.domain.auth.login_decision import LoginDecision
-from app.db.models.User.user_core import User
+from app.db.session import READ_REPLICA
+from app.db.statements import USER_BY_PHONE
 from app.domain.user.status import UserStatus
 
 
@@ -17,11 +17,14 @@ async def post_auth_router(
     Decides whether the flow should continue as login or onboarding
     after successful OTP verification.
 
-    No side effects. No persistence.
+    No side effects. No persistence. Reads from the replica: a user
+    created moments ago may still be routed to onboarding.
     """
 
     result = await db.execute(
-        select(User).where(User.phone == phone)
+        USER_BY_PHONE,
+        {"phone": phone},
+        execution_options=READ_REPLICA,
     )
     user = result.scalar_one_or_none()
 
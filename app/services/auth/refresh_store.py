@@ -1,5 +1,10 @@
-from app.core.security.hashing.issued_secrets import hash_secret
+from app.core.security.hashing.issued_secrets import (
+    digest_secret,
+    is_digest,
+    verify_secret_async,
+)
 from app.db.models.User.user_auth import UserAuth
+from app.db.statements import USER_AUTH_BY_REFRESH_HASH, USER_AUTH_BY_USER_ID
 
 
 async def store_refresh_token(
@@ -8,9 +13,59 @@ async def store_refresh_token(
     user_id: str,
     refresh_token: str,
 ) -> None:
-    hashed = hash_secret(refresh_token)
+    """
+    Persist the keyed digest of a newly issued refresh token.
 
-    auth = await db.get(UserAuth, user_id)
+    Refresh tokens carry 128 random bits, so a deterministic HMAC digest
+    is sufficient and keeps the stored value usable as a lookup key.
+    """
+    hashed = digest_secret(refresh_token)
+
+    result = await db.execute(USER_AUTH_BY_USER_ID, {"user_id": user_id})
+    auth = result.scalar_one()
     auth.refresh_token_hash = hashed
 
-    await db.commit()
+
+async def find_by_refresh_token(
+    *,
+    db,
+    refresh_token: str,
+) -> UserAuth | None:
+    """
+    Resolve a refresh token to its owner with one indexed point query.
+
+    Only matches rows already stored as digests; use
+    `verify_refresh_token` for rows that may still hold Argon2 hashes.
+    """
+    result = await db.execute(
+        USER_AUTH_BY_REFRESH_HASH,
+        {"refresh_token_hash": digest_secret(refresh_token)},
+    )
+    return result.scalar_one_or_none()
+
+
+async def verify_refresh_token(
+    *,
+    db,
+    user_id: str,
+    refresh_token: str,
+) -> bool:
+    """
+    Check a refresh token against the stored value for a user.
+
+    Digest rows are verified inline. Legacy Argon2 rows are verified in
+    the hashing pool and, on success, rewritten as digests so each row
+    pays the slow path at most once.
+    """
+    result = await db.execute(USER_AUTH_BY_USER_ID, {"user_id": user_id})
+    auth = result.scalar_one_or_none()
+    if auth is None or not auth.refresh_token_hash:
+        return False
+
+    if not await verify_secret_async(refresh_token, auth.refresh_token_hash):
+        return False
+
+    if not is_digest(auth.refresh_token_hash):
+        auth.refresh_token_hash = digest_secret(refresh_token)
+
+    return True
@@ -27,7 +27,6 @@ async def approve_kyc(
 
     # Upgrade access
     user.onboarding_state = "FULL_ACCESS"
-    await db.commit()
 
 
 async def reject_kyc(
@@ -50,4 +49,3 @@ async def reject_kyc(
     )
 
     # User stays limited / blocked
-    await db.commit()
@@ -0,0 +1,67 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.redis import create_redis_client, close_redis_client
+from app.core.security.masking import _mask_phone
+from app.core.security.otp import OTP_EXPIRY
+from app.interegation.SMS.base import SMSRejected
+from app.interegation.SMS.dead_letter import record_dead_letter
+from app.interegation.SMS.queue import retry_delay
+from app.interegation.SMS.registry import get_sms_provider
+from app.tasks.worker import celery_app
+
+logger = get_logger(__name__)
+
+
+async def _dead_letter(phone: str, exc: Exception, attempts: int) -> None:
+    # Each task runs in its own event loop; the shared client's pooled
+    # connections belong to another loop, so use a short-lived client.
+    client = create_redis_client()
+    try:
+        await record_dead_letter(
+            phone=phone,
+            error=exc,
+            attempts=attempts,
+            client=client,
+        )
+    finally:
+        await close_redis_client(client)
+
+
+async def _send(phone: str, body: str) -> None:
+    # The provider's pooled client is bound to this task's event loop;
+    # close it before the loop ends instead of leaking it to the next task
+    provider = get_sms_provider()
+    try:
+        await provider.send(phone, body)
+    finally:
+        aclose = getattr(provider, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+@celery_app.task(
+    bind=True,
+    name="sms.send",
+    max_retries=settings.SMS_MAX_ATTEMPTS - 1,
+    # A send still queued after the OTP expired is pointless
+    expires=OTP_EXPIRY,
+)
+def send_sms(self, phone: str, body: str) -> None:
+    """
+    Deliver one SMS, retrying with backoff; dead-letter after the last try.
+    """
+    attempts = self.request.retries + 1
+
+    try:
+        asyncio.run(_send(phone, body))
+    except Exception as exc:
+        if attempts >= settings.SMS_MAX_ATTEMPTS or isinstance(exc, SMSRejected):
+            logger.error(
+                "SMS delivery failed permanently",
+                extra={"phone": _mask_phone(phone), "attempts": attempts},
+            )
+            asyncio.run(_dead_letter(phone, exc, attempts))
+            return
+        raise self.retry(exc=exc, countdown=retry_delay(attempts))
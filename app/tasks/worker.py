@@ -0,0 +1,30 @@
+"""
+Celery application for background work.
+
+Started by the `worker` service in docker-compose:
+    celery -A app.tasks.worker worker
+"""
+
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "finguard",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.sms"],
+)
+
+celery_app.conf.update(
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_ignore_result=True,
+    # Honour per-message priority (login OTPs ahead of signup, see
+    # SMS_LANES); with the Redis broker 0 is served first
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "queue_order_strategy": "priority",
+    },
+)
@@ -0,0 +1,119 @@
+"""
+Benchmark the OTP engine in isolation: send + verify throughput and
+store round trips per operation.
+
+By default the configured Redis store layout (keys, Lua scripts, circuit
+breaker) runs over InMemoryRedis, so the numbers are the engine's and
+the store's client-side CPU cost with no network (script execution in
+the embedded Lua interpreter included). Pass --url to run against a real
+Redis instead; that run FLUSHES the selected database. SMS delivery is
+replaced by a no-op.
+
+Usage:
+    python -m benchmarks.otp_engine --phones 20000
+    python -m benchmarks.otp_engine --url redis://localhost:6379/15 --concurrency 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+import redis.asyncio as redis
+
+import app.auth.OTP.engine
+import app.core.redis
+from app.auth.OTP.engine import OTPEngine
+from app.core.redis_memory import InMemoryRedis
+from app.core.security.otp_store import OTPStore, get_otp_store
+from app.domain.auth.otp_purpose import OTPPurpose
+
+PURPOSE = OTPPurpose.LOGIN
+OTP = "123456"
+
+
+class CountingStore:
+    """Counts calls (one round trip each on Redis) per store method."""
+
+    def __init__(self, store: OTPStore) -> None:
+        self._store = store
+        self.calls = {"check_send_limit": 0, "save_otp": 0, "verify_attempt": 0}
+
+    def __getattr__(self, name: str):
+        method = getattr(self._store, name)
+        if name not in self.calls:
+            return method
+
+        async def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return await method(*args, **kwargs)
+
+        return counted
+
+    def reset(self) -> None:
+        for name in self.calls:
+            self.calls[name] = 0
+
+
+async def _no_sms(phone: str, body: str, *, lane: str | None = None) -> None:
+    return None
+
+
+def _phone(i: int) -> str:
+    # Spread over number ranges so the per-prefix aggregate limit is not hit
+    return f"+91{6000 + i % 4000:04d}{i:06d}"
+
+
+async def _phase(name: str, store: CountingStore, fn, phones: int, concurrency: int) -> None:
+    store.reset()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await fn(_phone(i))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(phones)))
+    elapsed = time.perf_counter() - started
+
+    trips = sum(store.calls.values()) / phones
+    print(
+        f"{name:<7} {phones / elapsed:10.0f} ops/sec  "
+        f"{elapsed / phones * 1e6:8.1f} us/op  {trips:.1f} store calls/op"
+    )
+
+
+async def main(url: str | None, phones: int, concurrency: int) -> None:
+    client = None
+    if url:
+        client = redis.from_url(url, decode_responses=True)
+        await client.flushdb()
+        app.core.redis.redis_client = client
+    else:
+        app.core.redis.redis_client = InMemoryRedis()
+
+    store = CountingStore(get_otp_store())
+    engine = OTPEngine(store, deliver=_no_sms)
+
+    # Fixed code so the verify phase succeeds
+    app.auth.OTP.engine.generate_otp = lambda length: OTP
+
+    try:
+        await _phase("send", store, lambda p: engine.send(p, PURPOSE), phones, concurrency)
+        await _phase("verify", store, lambda p: engine.verify(p, OTP, PURPOSE), phones, concurrency)
+    finally:
+        if client is not None:
+            await client.flushdb()
+            await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="benchmark against this Redis instead of memory")
+    parser.add_argument("--phones", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    logging.getLogger("app").setLevel(logging.WARNING)
+    asyncio.run(main(args.url, args.phones, args.concurrency))
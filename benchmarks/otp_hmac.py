@@ -0,0 +1,73 @@
+"""
+Measure per-call OTP hashing cost with and without the cached HMAC key.
+
+"fresh" reproduces the previous `hash_otp` (read the secret, encode it and
+key a new HMAC for every call); "cached" is the current `hash_otp`, which
+copies a pre-keyed template; "batch" is `hash_otps_batch`. The savings
+are also expressed as CPU time per second at a given OTP rate (each send
+and each verify hashes once). No external services are needed.
+
+Usage:
+    python -m benchmarks.otp_hmac --calls 200000 --rate 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import time
+
+from app.core.config import settings
+from app.core.security.hashing.otp import (
+    _normalize_otp,
+    hash_otp,
+    hash_otps_batch,
+)
+
+
+def _fresh_hash_otp(*, otp: str, identifier: str) -> str:
+    otp = _normalize_otp(otp)
+    return hmac.new(
+        key=settings.OTP_SECRET_KEY.encode("utf-8"),
+        msg=f"{identifier}:{otp}".encode("utf-8"),
+        digestmod=hashlib.sha256,
+    ).hexdigest()
+
+
+def _per_call_ns(fn, pairs: list[tuple[str, str]]) -> float:
+    started = time.perf_counter_ns()
+    for identifier, otp in pairs:
+        fn(otp=otp, identifier=identifier)
+    return (time.perf_counter_ns() - started) / len(pairs)
+
+
+def main(calls: int, rate: int) -> None:
+    pairs = [(f"+91{9000000000 + i}", f"{i % 1_000_000:06d}") for i in range(calls)]
+    assert hash_otp(otp=pairs[0][1], identifier=pairs[0][0]) == _fresh_hash_otp(
+        otp=pairs[0][1], identifier=pairs[0][0]
+    )
+
+    # Warm up both paths (and the template cache)
+    _per_call_ns(_fresh_hash_otp, pairs[:1000])
+    _per_call_ns(hash_otp, pairs[:1000])
+
+    fresh = _per_call_ns(_fresh_hash_otp, pairs)
+    cached = _per_call_ns(hash_otp, pairs)
+    started = time.perf_counter_ns()
+    hash_otps_batch(pairs)
+    batch = (time.perf_counter_ns() - started) / calls
+
+    print(f"{'fresh':<7} {fresh:8.0f} ns/call")
+    print(f"{'cached':<7} {cached:8.0f} ns/call  ({1 - cached / fresh:6.1%} saved)")
+    print(f"{'batch':<7} {batch:8.0f} ns/call  ({1 - batch / fresh:6.1%} saved)")
+    saved_ms = (fresh - cached) * rate / 1e6
+    print(f"at {rate} hashes/sec: {saved_ms:.2f} ms CPU saved per second per process")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--rate", type=int, default=2000, help="peak OTP hashes per second")
+    args = parser.parse_args()
+    main(args.calls, args.rate)
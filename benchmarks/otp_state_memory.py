@@ -0,0 +1,90 @@
+"""
+Compare Redis memory per active phone for the two OTP state layouts.
+
+Each simulated phone goes through a typical flow: one send (cooldown,
+window and daily counters), a stored OTP for one purpose and a single
+failed verification. The benchmark runs against a real Redis (MEMORY
+USAGE is not emulated by fakes) and FLUSHES the selected database.
+
+Usage:
+    python -m benchmarks.otp_state_memory --url redis://localhost:6379/15 --phones 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+
+import redis.asyncio as redis
+
+import app.core.redis
+from app.core.security.otp_store import HashOTPStore, KeyspaceOTPStore, OTPStore
+from app.domain.auth.otp_purpose import OTPPurpose
+
+PURPOSE = next(iter(OTPPurpose))
+SEND_LIMITS = dict(cooldown=60, max_in_window=3, window=600, daily_limit=10, daily_ttl=86400)
+VERIFY_LIMITS = dict(max_attempts=5, fail_ttl=600, lock_ttl=900)
+
+
+def _phone(i: int) -> str:
+    return f"+91{9000000000 + i}"
+
+
+def _digest(i: int) -> str:
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+async def _populate(store: OTPStore, phones: int, batch: int = 500) -> None:
+    async def one(i: int) -> None:
+        phone = _phone(i)
+        await store.check_send_limit(phone, **SEND_LIMITS)
+        await store.save_otp(phone, PURPOSE, _digest(i), ttl=300)
+        await store.verify_attempt(phone, PURPOSE, _digest(i + 1), **VERIFY_LIMITS)
+
+    for start in range(0, phones, batch):
+        await asyncio.gather(*(one(i) for i in range(start, min(start + batch, phones))))
+
+
+async def _sampled_key_bytes(client: redis.Redis, sample: int) -> float:
+    """Average MEMORY USAGE summed over all keys of the first `sample` phones."""
+    total = 0
+    for i in range(sample):
+        phone = _phone(i)
+        async for key in client.scan_iter(match=f"*{phone}"):
+            total += await client.memory_usage(key, samples=0) or 0
+    return total / sample
+
+
+async def _measure(name: str, store: OTPStore, client: redis.Redis, phones: int) -> None:
+    await client.flushdb()
+    before = (await client.info("memory"))["used_memory"]
+    await _populate(store, phones)
+    after = (await client.info("memory"))["used_memory"]
+    keys = await client.dbsize()
+    sampled = await _sampled_key_bytes(client, min(phones, 200))
+
+    print(
+        f"{name:<6} keys/phone={keys / phones:4.1f}  "
+        f"used_memory/phone={(after - before) / phones:7.1f} B  "
+        f"MEMORY USAGE/phone={sampled:7.1f} B"
+    )
+
+
+async def main(url: str, phones: int) -> None:
+    client = redis.from_url(url, decode_responses=True)
+    app.core.redis.redis_client = client
+    try:
+        await _measure("keys", KeyspaceOTPStore(), client, phones)
+        await _measure("hash", HashOTPStore(), client, phones)
+        await client.flushdb()
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="redis://localhost:6379/15")
+    parser.add_argument("--phones", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.phones))
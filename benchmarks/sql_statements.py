@@ -0,0 +1,180 @@
+"""
+Measure the per-query cost of inline vs prebuilt statements.
+
+"inline" builds each statement the way the repositories used to (a new
+select()/update() with the values embedded on every call); "prebuilt"
+executes the module-level statements from `app.db.statements` with a
+parameter dict. Both run through the public `Session.execute` against an
+in-memory SQLite database with the app's tables, so a timing covers
+building the statement, its cache key and compiled-cache lookup, ORM
+execution and result handling, plus SQLite's own work, which is the
+same for both. The app runs the async session on asyncpg and pays a
+network round trip per query on top, so the difference is a per-query
+saving on the statement path, not a whole-request one. No database
+server is needed.
+
+Usage:
+    python -m benchmarks.sql_statements --calls 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models.account import Account
+from app.db.models.ledger_entry import LedgerEntry  # noqa: F401 (mapper)
+from app.db.models.transaction import Transaction
+from app.db.models.User.pre_user import PreUser
+from app.db.models.User.user_auth import UserAuth
+from app.db.models.User.user_core import User
+from app.db.models.User.user_kyc import UserKYC
+from app.db.statements import (
+    ACCOUNT_BY_ID_FOR_UPDATE,
+    ACCOUNT_BY_USER_AND_CURRENCY,
+    ACCOUNT_UPGRADE_TO_FULL,
+    PREUSER_BY_ID,
+    PREUSER_BY_PHONE,
+    PREUSER_SET_STATE,
+    TRANSACTION_BY_IDEMPOTENCY_KEY,
+    USER_AUTH_BY_REFRESH_HASH,
+    USER_AUTH_BY_USER_ID,
+    USER_BY_PHONE,
+    USER_KYC_BY_USER_ID,
+    preuser_update,
+)
+from app.domain.enums import PreUserOnboardingState
+
+PHONE = "+919876543210"
+USER_ID = uuid4()
+STATE = PreUserOnboardingState.OTP_VERIFIED
+
+
+def _risk_profile(i: int) -> dict:
+    return {
+        "risk_decision": "ALLOW",
+        "risk_reason": "AGE_OK",
+        "risk_evaluated_at": datetime(2024, 1, 1, 0, 0, i % 60),
+    }
+
+
+def _profile_params(i: int) -> dict:
+    profile = _risk_profile(i)
+    params = {f"new_{column}": value for column, value in profile.items()}
+    params["preuser_id"] = i
+    return params
+
+
+# name -> (inline builder, prebuilt builder); each takes the call index
+# and returns (statement, parameters)
+QUERIES = {
+    "preuser_by_phone": (
+        lambda i: (select(PreUser).where(PreUser.phone == PHONE), {}),
+        lambda i: (PREUSER_BY_PHONE, {"phone": PHONE}),
+    ),
+    "preuser_by_id": (
+        lambda i: (select(PreUser).where(PreUser.id == i), {}),
+        lambda i: (PREUSER_BY_ID, {"preuser_id": i}),
+    ),
+    "preuser_set_state": (
+        lambda i: (
+            update(PreUser).where(PreUser.id == i).values(onboarding_state=STATE),
+            {},
+        ),
+        lambda i: (PREUSER_SET_STATE, {"preuser_id": i, "new_onboarding_state": STATE}),
+    ),
+    "preuser_update_profile": (
+        lambda i: (update(PreUser).where(PreUser.id == i).values(**_risk_profile(i)), {}),
+        lambda i: (
+            preuser_update(tuple(sorted(_risk_profile(i)))),
+            _profile_params(i),
+        ),
+    ),
+    "user_by_phone": (
+        lambda i: (select(User).where(User.phone == PHONE), {}),
+        lambda i: (USER_BY_PHONE, {"phone": PHONE}),
+    ),
+    "user_kyc_by_user_id": (
+        lambda i: (select(UserKYC).where(UserKYC.user_id == USER_ID), {}),
+        lambda i: (USER_KYC_BY_USER_ID, {"user_id": USER_ID}),
+    ),
+    "user_auth_by_user_id": (
+        lambda i: (select(UserAuth).where(UserAuth.user_id == USER_ID), {}),
+        lambda i: (USER_AUTH_BY_USER_ID, {"user_id": USER_ID}),
+    ),
+    "user_auth_by_refresh_hash": (
+        lambda i: (select(UserAuth).where(UserAuth.refresh_token_hash == "d"), {}),
+        lambda i: (USER_AUTH_BY_REFRESH_HASH, {"refresh_token_hash": "d"}),
+    ),
+    "account_by_user_and_currency": (
+        lambda i: (
+            select(Account).where(Account.user_id == USER_ID, Account.currency == "INR"),
+            {},
+        ),
+        lambda i: (ACCOUNT_BY_USER_AND_CURRENCY, {"user_id": USER_ID, "currency": "INR"}),
+    ),
+    "account_by_id_for_update": (
+        lambda i: (select(Account).where(Account.id == USER_ID).with_for_update(), {}),
+        lambda i: (ACCOUNT_BY_ID_FOR_UPDATE, {"account_id": USER_ID}),
+    ),
+    "account_upgrade_to_full": (
+        lambda i: (
+            update(Account).where(Account.id == USER_ID).values(tier="FULL", daily_limit=None),
+            {},
+        ),
+        lambda i: (ACCOUNT_UPGRADE_TO_FULL, {"account_id": USER_ID}),
+    ),
+    "transaction_by_idempotency_key": (
+        lambda i: (select(Transaction).where(Transaction.idempotency_key == "k"), {}),
+        lambda i: (TRANSACTION_BY_IDEMPOTENCY_KEY, {"idempotency_key": "k"}),
+    ),
+}
+
+
+def _per_call_ns(session: Session, build, calls: int) -> float:
+    started = time.perf_counter_ns()
+    for i in range(calls):
+        statement, params = build(i)
+        session.execute(statement, params).close()
+    return (time.perf_counter_ns() - started) / calls
+
+
+def main(calls: int) -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    inline_total = prebuilt_total = 0.0
+
+    print(f"{'query':<32} {'inline':>10} {'prebuilt':>10}")
+    with Session(engine) as session:
+        for name, (inline, prebuilt) in QUERIES.items():
+            # Warm up both paths (and the compiled cache)
+            _per_call_ns(session, inline, 100)
+            _per_call_ns(session, prebuilt, 100)
+
+            inline_ns = _per_call_ns(session, inline, calls)
+            prebuilt_ns = _per_call_ns(session, prebuilt, calls)
+            inline_total += inline_ns
+            prebuilt_total += prebuilt_ns
+            print(f"{name:<32} {inline_ns / 1000:7.1f} us {prebuilt_ns / 1000:7.1f} us")
+        session.rollback()
+
+    inline_mean = inline_total / len(QUERIES)
+    prebuilt_mean = prebuilt_total / len(QUERIES)
+    print(
+        f"{'mean':<32} {inline_mean / 1000:7.1f} us {prebuilt_mean / 1000:7.1f} us"
+        f"  ({(inline_mean - prebuilt_mean) / 1000:.1f} us, "
+        f"{1 - prebuilt_mean / inline_mean:.1%} less per query)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.calls)
@@ -54,7 +54,7 @@ def mock_otp_generator(mocker):
     Mock OTP generation to have deterministic OTPs in tests.
     """
     mocker.patch(
-        "app.services.OTP.issue_otp.generate_otp",
+        "app.auth.OTP.engine.generate_otp",
         return_value="123456",
     )
 
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.main import app as fastapi_app
 from app.db.base import Base
 import app.core.redis
+from app.core.redis_memory import InMemoryRedis
 
 try:
     from app.core.config import settings
@@ -28,7 +29,11 @@ TEST_DATABASE_URL = (
 
 @pytest.fixture
 async def redis_test():
-    client = Redis.from_url("redis://localhost:6380", decode_responses=True)
+    # REDIS_BACKEND=memory runs these tests without the Redis container
+    if settings.REDIS_BACKEND == "memory":
+        client = InMemoryRedis()
+    else:
+        client = Redis.from_url("redis://localhost:6380", decode_responses=True)
     await client.flushall()
     yield client
     await client.flushall()
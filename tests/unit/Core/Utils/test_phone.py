@@ -1,5 +1,5 @@
 import pytest
-from app.core.Utils.phone import normalize_phone, InvalidPhoneNumber
+from app.core.Utils.phone import normalize_phone, phone_prefix, InvalidPhoneNumber
 
 def test_normalize_plain_number():
     assert normalize_phone("9876543210") == "+919876543210"
@@ -10,3 +10,6 @@ def test_normalize_with_country_code():
 def test_invalid_phone():
     with pytest.raises(InvalidPhoneNumber):
         normalize_phone("12345")
+
+def test_phone_prefix_keeps_country_and_operator_digits():
+    assert phone_prefix(normalize_phone("98765 43210")) == "+919876"
@@ -0,0 +1,84 @@
+"""
+Unit tests for the hashing pool.
+
+Covers:
+- Async password/PIN/secret hashing interoperates with the sync API
+- Bounded capacity rejects excess submissions instead of queueing them
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security.hashing.executor import HashingPool, HashingQueueFull
+from app.core.security.hashing.scheduler import MemoryBudget
+from app.core.security.hashing.password import PasswordHasher
+from app.core.security.hashing.pin import hash_pin_async, verify_pin
+from app.core.security.hashing.issued_secrets import hash_secret_async, verify_secret
+
+
+_release = threading.Event()
+
+
+def _blocking_job() -> str:
+    _release.wait(timeout=5)
+    return "done"
+
+
+class TestAsyncHashing:
+    async def test_password_hash_async_verifies_with_sync_api(self):
+        hasher = PasswordHasher()
+        hashed = await hasher.hash_async("password123")
+
+        assert hashed.startswith("$argon2id$")
+        assert hasher.verify("password123", hashed)
+        assert await hasher.verify_async("password123", hashed)
+        assert not await hasher.verify_async("wrong-password", hashed)
+
+    async def test_pin_hash_async_verifies_with_sync_api(self):
+        hashed = await hash_pin_async("1234")
+
+        assert verify_pin("1234", hashed)
+
+    async def test_secret_hash_async_verifies_with_sync_api(self):
+        hashed = await hash_secret_async("issued-secret")
+
+        assert verify_secret("issued-secret", hashed)
+
+    async def test_verify_async_is_fail_safe_for_unknown_hash(self):
+        hasher = PasswordHasher()
+
+        assert not await hasher.verify_async("password123", "not-a-hash")
+
+
+class TestHashingPoolCapacity:
+    async def test_rejects_when_workers_and_queue_are_full(self):
+        pool = HashingPool(
+            max_workers=0,
+            queue_size=1,
+            budget=MemoryBudget(budget_kib=1024, max_wait=1),
+        )
+        _release.clear()
+
+        running = [asyncio.create_task(pool.run(_blocking_job, memory_kib=1)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert pool.in_flight == pool.capacity == 2
+        with pytest.raises(HashingQueueFull):
+            await pool.run(_blocking_job, memory_kib=1)
+
+        _release.set()
+        assert await asyncio.gather(*running) == ["done", "done"]
+        assert pool.in_flight == 0
+        pool.shutdown()
+
+    def test_rejects_negative_sizes(self):
+        with pytest.raises(ValueError):
+            HashingPool(
+                max_workers=-1,
+                queue_size=0,
+                budget=MemoryBudget(budget_kib=1024, max_wait=1),
+            )
@@ -0,0 +1,68 @@
+"""
+Unit tests for issued-secret hashing.
+
+Covers:
+- Deterministic keyed digests for high-entropy secrets
+- verify_secret compatibility with both digest and legacy Argon2 rows
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.security.hashing.issued_secrets import (
+    DIGEST_PREFIX,
+    digest_secret,
+    hash_secret,
+    is_digest,
+    needs_rehash,
+    verify_secret,
+    verify_secret_async,
+)
+
+
+class TestDigestSecret:
+    def test_digest_is_deterministic(self):
+        assert digest_secret("token-abc") == digest_secret("token-abc")
+
+    def test_digest_differs_per_secret(self):
+        assert digest_secret("token-abc") != digest_secret("token-abd")
+
+    def test_digest_has_prefix_and_fixed_length(self):
+        digest = digest_secret("token-abc")
+
+        assert is_digest(digest)
+        assert len(digest) == len(DIGEST_PREFIX) + 64
+
+    def test_digest_depends_on_pepper(self, monkeypatch):
+        before = digest_secret("token-abc")
+        monkeypatch.setenv("PASSWORD_PEPPER", "rotated-pepper")
+
+        assert digest_secret("token-abc") != before
+
+    def test_digest_rejects_empty_secret(self):
+        with pytest.raises(ValueError):
+            digest_secret("")
+
+    def test_digest_never_needs_rehash(self):
+        assert not needs_rehash(digest_secret("token-abc"))
+
+
+class TestVerifySecretCompatibility:
+    def test_verifies_digest(self):
+        stored = digest_secret("token-abc")
+
+        assert verify_secret("token-abc", stored)
+        assert not verify_secret("token-abd", stored)
+
+    def test_verifies_legacy_argon2(self):
+        stored = hash_secret("token-abc")
+
+        assert not is_digest(stored)
+        assert verify_secret("token-abc", stored)
+
+    async def test_async_verifies_digest(self):
+        stored = digest_secret("token-abc")
+
+        assert await verify_secret_async("token-abc", stored)
+        assert not await verify_secret_async("token-abd", stored)
@@ -0,0 +1,55 @@
+"""
+Unit tests for OTP HMAC hashing.
+
+Covers:
+- The cached HMAC template matches a freshly keyed HMAC
+- Batch hashing matches per-call hashing
+- Key rotation takes effect without a restart
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+
+import pytest
+
+from app.core.config import settings
+from app.core.security.hashing.otp import hash_otp, hash_otps_batch
+
+PHONE = "+919876543210"
+
+
+def _reference(identifier: str, otp: str) -> str:
+    return hmac.new(
+        settings.OTP_SECRET_KEY.encode("utf-8"),
+        f"{identifier}:{otp}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def test_hash_matches_fresh_hmac():
+    assert hash_otp(otp="123456", identifier=PHONE) == _reference(PHONE, "123456")
+    # Second call goes through the cached template
+    assert hash_otp(otp="654321", identifier=PHONE) == _reference(PHONE, "654321")
+
+
+def test_batch_matches_single_calls():
+    pairs = [(PHONE, "123456"), ("+919876543211", " 000001 "), (PHONE, "999999")]
+
+    assert hash_otps_batch(pairs) == [
+        hash_otp(otp=otp, identifier=identifier) for identifier, otp in pairs
+    ]
+
+
+def test_batch_rejects_malformed_otp():
+    with pytest.raises(ValueError):
+        hash_otps_batch([(PHONE, "123456"), (PHONE, "12a456")])
+
+
+def test_rotated_secret_is_picked_up(monkeypatch):
+    before = hash_otp(otp="123456", identifier=PHONE)
+    monkeypatch.setattr(settings, "OTP_SECRET_KEY", "rotated-secret")
+
+    assert hash_otp(otp="123456", identifier=PHONE) != before
+    assert hash_otp(otp="123456", identifier=PHONE) == _reference(PHONE, "123456")
@@ -0,0 +1,98 @@
+"""
+Unit tests for memory-budgeted hashing admission.
+
+Covers:
+- Immediate admission while the budget has room
+- Strict FIFO ordering for queued jobs
+- Fast rejection once the max wait is exceeded
+- Budget bookkeeping after timeouts and cancellations
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.security.hashing.scheduler import MemoryBudget, HashingAdmissionTimeout
+
+
+class TestMemoryBudget:
+    async def test_admits_immediately_within_budget(self):
+        budget = MemoryBudget(budget_kib=100, max_wait=1)
+
+        await budget.acquire(60)
+        await budget.acquire(40)
+
+        assert budget.in_use_kib == 100
+        assert budget.waiting == 0
+
+    async def test_waiters_are_admitted_in_fifo_order(self):
+        budget = MemoryBudget(budget_kib=100, max_wait=1)
+        await budget.acquire(100)
+
+        admitted = []
+
+        async def job(name, kib):
+            await budget.acquire(kib)
+            admitted.append(name)
+
+        large = asyncio.create_task(job("large", 80))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(job("small", 10))
+        await asyncio.sleep(0)
+
+        # The small job fits after a partial release but must not overtake.
+        budget.release(20)
+        await asyncio.sleep(0)
+        assert admitted == []
+
+        budget.release(80)
+        await asyncio.gather(large, small)
+        assert admitted == ["large", "small"]
+        assert budget.in_use_kib == 90
+
+    async def test_rejects_after_max_wait(self):
+        budget = MemoryBudget(budget_kib=100, max_wait=0.01)
+        await budget.acquire(100)
+
+        with pytest.raises(HashingAdmissionTimeout):
+            await budget.acquire(1)
+
+        assert budget.waiting == 0
+        assert budget.in_use_kib == 100
+
+    async def test_timed_out_head_unblocks_following_waiters(self):
+        budget = MemoryBudget(budget_kib=100, max_wait=0.2)
+        await budget.acquire(50)
+
+        head = asyncio.create_task(budget.acquire(100))
+        await asyncio.sleep(0.1)
+        follower = asyncio.create_task(budget.acquire(50))
+
+        with pytest.raises(HashingAdmissionTimeout):
+            await head
+        await follower
+
+        assert budget.in_use_kib == 100
+
+    async def test_cancelled_waiter_is_removed(self):
+        budget = MemoryBudget(budget_kib=10, max_wait=1)
+        await budget.acquire(10)
+
+        waiter = asyncio.create_task(budget.acquire(5))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert budget.waiting == 0
+        budget.release(10)
+        assert budget.in_use_kib == 0
+
+    async def test_rejects_job_larger_than_budget(self):
+        budget = MemoryBudget(budget_kib=10, max_wait=1)
+
+        with pytest.raises(ValueError):
+            await budget.acquire(11)
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpen,
+    DependencyUnavailable,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "test",
+        failure_threshold=2,
+        reset_timeout=5.0,
+        call_timeout=0.05,
+        failures=(ConnectionError,),
+        clock=clock,
+    )
+
+
+async def _fail_times(breaker, n):
+    for _ in range(n):
+        with pytest.raises(DependencyUnavailable):
+            await breaker.call(AsyncMock(side_effect=ConnectionError()))
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures_and_fails_fast(breaker):
+    await _fail_times(breaker, 2)
+    fn = AsyncMock()
+
+    with pytest.raises(CircuitOpen):
+        await breaker.call(fn)
+
+    assert breaker.state == "open"
+    fn.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_timeout_counts_as_failure(breaker):
+    async def stall():
+        await asyncio.sleep(1)
+
+    for _ in range(2):
+        with pytest.raises(DependencyUnavailable):
+            await breaker.call(stall)
+
+    assert breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_successful_probe_closes_circuit(breaker, clock):
+    await _fail_times(breaker, 2)
+    clock.now += 5
+
+    assert breaker.state == "half_open"
+    assert await breaker.call(AsyncMock(return_value="ok")) == "ok"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_circuit(breaker, clock):
+    await _fail_times(breaker, 2)
+    clock.now += 5
+
+    await _fail_times(breaker, 1)
+
+    assert breaker.state == "open"
+    clock.now += 4
+    with pytest.raises(CircuitOpen):
+        await breaker.call(AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_only_one_probe_in_flight(breaker, clock):
+    await _fail_times(breaker, 2)
+    clock.now += 5
+    release = asyncio.Event()
+
+    async def slow_ok():
+        await release.wait()
+
+    probe = asyncio.create_task(breaker.call(slow_ok))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpen):
+        await breaker.call(AsyncMock())
+
+    release.set()
+    await probe
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_unrelated_errors_pass_through_without_tripping(breaker):
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            await breaker.call(AsyncMock(side_effect=ValueError()))
+
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_redis_breaker_ignores_command_errors():
+    from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
+    from app.core.redis import redis_breaker
+
+    for _ in range(6):
+        with pytest.raises(ResponseError):
+            await redis_breaker.call(AsyncMock(side_effect=ResponseError("WRONGTYPE")))
+    assert redis_breaker.state == "closed"
+
+    with pytest.raises(DependencyUnavailable):
+        await redis_breaker.call(AsyncMock(side_effect=RedisConnectionError()))
+    await redis_breaker.call(AsyncMock())
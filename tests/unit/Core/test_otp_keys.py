@@ -0,0 +1,56 @@
+import pytest
+from redis.crc import key_slot
+
+from app.core.config import settings
+from app.core.security.otp_keys import (
+    _otp_key,
+    _fail_key,
+    _lock_key,
+    _cooldown_key,
+    _window_key,
+    _daily_key,
+    _state_key,
+    _phone_from_key,
+)
+from app.domain.auth.otp_purpose import OTPPurpose
+
+PHONE = "+919876543210"
+
+
+def _all_keys(phone: str) -> list[str]:
+    keys = [
+        _cooldown_key(phone),
+        _window_key(phone),
+        _daily_key(phone),
+        _state_key(phone),
+    ]
+    for purpose in OTPPurpose:
+        keys += [
+            _otp_key(phone, purpose),
+            _fail_key(phone, purpose),
+            _lock_key(phone, purpose),
+        ]
+    return keys
+
+
+def test_cluster_mode_puts_every_phone_key_in_one_slot(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_CLUSTER", True)
+
+    keys = _all_keys(PHONE)
+
+    assert all(f"{{{PHONE}}}" in key for key in keys)
+    assert len({key_slot(key.encode()) for key in keys}) == 1
+
+
+def test_standalone_mode_keeps_untagged_keys(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_CLUSTER", False)
+
+    assert _cooldown_key(PHONE) == f"otp:cooldown:{PHONE}"
+    assert all("{" not in key for key in _all_keys(PHONE))
+
+
+@pytest.mark.parametrize("cluster", [True, False])
+def test_phone_from_key_round_trips(monkeypatch, cluster):
+    monkeypatch.setattr(settings, "REDIS_CLUSTER", cluster)
+
+    assert _phone_from_key(_otp_key(PHONE, next(iter(OTPPurpose)))) == PHONE
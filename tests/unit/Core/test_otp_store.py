@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.config import settings
+from app.core.security.otp_store import (
+    HashOTPStore,
+    KeyspaceOTPStore,
+    get_otp_store,
+)
+from app.core.security.otp_keys import _state_key
+from app.domain.auth.otp_purpose import OTPPurpose
+from app.domain.auth.otp_state import OTPVerifyStatus
+
+PHONE = "+919876543210"
+PURPOSE = next(iter(OTPPurpose))
+
+
+@pytest.mark.parametrize(
+    "layout, store_cls",
+    [("keys", KeyspaceOTPStore), ("hash", HashOTPStore)],
+)
+def test_get_otp_store_follows_layout_setting(monkeypatch, layout, store_cls):
+    monkeypatch.setattr(settings, "OTP_STATE_LAYOUT", layout)
+
+    assert isinstance(get_otp_store().store, store_cls)
+
+
+def test_get_otp_store_rejects_unknown_layout(monkeypatch):
+    monkeypatch.setattr(settings, "OTP_STATE_LAYOUT", "bogus")
+
+    with pytest.raises(RuntimeError):
+        get_otp_store()
+
+
+@pytest.mark.asyncio
+async def test_hash_store_sends_raw_digest_to_single_state_key(mocker):
+    script = mocker.patch(
+        "app.core.security.otp_store._hash_verify_script",
+        new=AsyncMock(return_value=["mismatch", 1, 0]),
+    )
+    otp_hash = "ab" * 32
+
+    result = await HashOTPStore().verify_attempt(
+        PHONE, PURPOSE, otp_hash, max_attempts=5, fail_ttl=600, lock_ttl=900
+    )
+
+    assert script.call_args.kwargs["keys"] == [_state_key(PHONE)]
+    assert script.call_args.kwargs["args"][:2] == [
+        PURPOSE.value,
+        bytes.fromhex(otp_hash),
+    ]
+    assert result.status is OTPVerifyStatus.MISMATCH
+    assert result.fail_count == 1
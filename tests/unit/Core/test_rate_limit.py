@@ -0,0 +1,157 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from app.auth.OTP.otp_exceptions import OTPRateLimitExceeded
+from app.core.security.rate_limit import (
+    check_otp_rate_limit,
+    enforce_otp_rate_limit,
+)
+from app.core.security.otp_keys import (
+    _cooldown_key,
+    _window_key,
+    _daily_key,
+    _aggregate_key,
+    _aggregate_block_key,
+)
+from app.core.security.otp import OTP_RESEND_COOLDOWN
+
+PHONE = "+919876543210"
+
+
+@pytest.mark.asyncio
+async def test_check_runs_single_script_call_with_all_keys(mocker):
+    script = mocker.patch(
+        "app.core.security.otp_store._send_limit_script",
+        new=AsyncMock(return_value=[1, "ok", OTP_RESEND_COOLDOWN, 2, 9]),
+    )
+
+    verdict = await check_otp_rate_limit(PHONE, "203.0.113.7")
+
+    script.assert_awaited_once()
+    assert script.call_args.kwargs["keys"] == [
+        _cooldown_key(PHONE),
+        _window_key(PHONE),
+        _daily_key(PHONE),
+        _aggregate_key("prefix", "+919876"),
+        _aggregate_block_key("prefix", "+919876"),
+        _aggregate_key("ip", "203.0.113.7"),
+        _aggregate_block_key("ip", "203.0.113.7"),
+    ]
+    assert verdict.allowed
+    assert verdict.remaining_in_window == 2
+    assert verdict.remaining_today == 9
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "reason, message",
+    [
+        ("cooldown", "Please wait 17 seconds"),
+        ("window", "Too many OTP requests"),
+        ("daily", "Daily OTP limit reached"),
+    ],
+)
+async def test_enforce_raises_with_retry_after(mocker, reason, message):
+    mocker.patch(
+        "app.core.security.otp_store._send_limit_script",
+        new=AsyncMock(return_value=[0, reason, 17, 0, 0]),
+    )
+
+    with pytest.raises(OTPRateLimitExceeded) as exc:
+        await enforce_otp_rate_limit(PHONE)
+
+    assert message in str(exc.value)
+    assert exc.value.retry_after == 17
+
+
+@pytest.mark.asyncio
+async def test_enforce_sheds_purpose_before_touching_counters(mocker):
+    from app.domain.auth.otp_purpose import OTPPurpose
+
+    mocker.patch(
+        "app.core.security.rate_limit.sms_lane_accepting",
+        return_value=False,
+    )
+    script = mocker.patch(
+        "app.core.security.otp_store._send_limit_script",
+        new=AsyncMock(),
+    )
+
+    with pytest.raises(OTPRateLimitExceeded) as excinfo:
+        await enforce_otp_rate_limit(PHONE, OTPPurpose.SIGNUP)
+
+    assert excinfo.value.retry_after
+    script.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_enforce_rejects_throttled_prefix(mocker):
+    mocker.patch(
+        "app.core.security.otp_store._send_limit_script",
+        new=AsyncMock(return_value=[0, "prefix", 1800, 0, 0]),
+    )
+
+    with pytest.raises(OTPRateLimitExceeded) as excinfo:
+        await enforce_otp_rate_limit(PHONE)
+
+    assert excinfo.value.retry_after == 1800
+    assert "Too many OTP requests" in str(excinfo.value)
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_limit_when_redis_fails(mocker):
+    from redis.exceptions import ConnectionError as RedisConnectionError
+    from app.core.circuit_breaker import CircuitBreaker
+    from app.core.security.local_rate_limit import LocalTokenBucket
+    from app.core.security.otp_store import GuardedOTPStore, KeyspaceOTPStore
+
+    store = GuardedOTPStore(
+        KeyspaceOTPStore(),
+        CircuitBreaker("test", failure_threshold=1, reset_timeout=60, call_timeout=1),
+    )
+    mocker.patch(
+        "app.core.security.rate_limit._fallback_phone_limit",
+        LocalTokenBucket(1, 100),
+    )
+    script = mocker.patch(
+        "app.core.security.otp_store._send_limit_script",
+        new=AsyncMock(side_effect=RedisConnectionError()),
+    )
+
+    first = await enforce_otp_rate_limit(PHONE, store=store)
+    with pytest.raises(OTPRateLimitExceeded) as excinfo:
+        await enforce_otp_rate_limit(PHONE, store=store)
+
+    assert first.allowed
+    assert excinfo.value.retry_after > 0
+    script.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_falls_back_for_limits_and_fails_verification_closed(mocker):
+    from app.auth.OTP.otp_exceptions import OTPServiceUnavailable
+    from app.core.circuit_breaker import CircuitOpen
+    from app.core.security.local_rate_limit import LocalTokenBucket
+    from app.core.security.verify_rate_limit import verify_otp_attempt
+    from app.domain.auth.otp_purpose import OTPPurpose
+
+    store = AsyncMock()
+    store.check_send_limit.side_effect = CircuitOpen("redis circuit is open")
+    store.verify_attempt.side_effect = CircuitOpen("redis circuit is open")
+    mocker.patch(
+        "app.core.security.rate_limit._fallback_phone_limit",
+        LocalTokenBucket(1, 100),
+    )
+
+    assert (await check_otp_rate_limit(PHONE, store=store)).allowed
+    assert not (await check_otp_rate_limit(PHONE, store=store)).allowed
+    with pytest.raises(OTPServiceUnavailable):
+        await verify_otp_attempt(
+            phone=PHONE,
+            purpose=OTPPurpose.LOGIN,
+            otp_hash="ab" * 32,
+            max_attempts=3,
+            fail_ttl=600,
+            lock_ttl=900,
+            store=store,
+        )
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ResponseError
+
+from app.core.redis_batching import AutoBatchingRedis
+
+
+class FakePipeline:
+    def __init__(self, owner):
+        self.owner = owner
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args))
+        return queue
+
+    async def execute(self, raise_on_error=True):
+        self.owner.batches.append(self.commands)
+        return [self.owner.reply(name, args) for name, args in self.commands]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.batches = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def reply(self, name, args):
+        if name == "hget":
+            return ResponseError("WRONGTYPE")
+        return f"{name}:{args[0]}"
+
+    async def ping(self):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_share_one_pipeline():
+    inner = FakeRedis()
+    client = AutoBatchingRedis(inner)
+
+    replies = await asyncio.gather(
+        client.get("a"),
+        client.incr("b"),
+        client.exists("c"),
+    )
+
+    assert replies == ["get:a", "incr:b", "exists:c"]
+    assert len(inner.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_command_error_only_reaches_its_caller():
+    inner = FakeRedis()
+    client = AutoBatchingRedis(inner)
+
+    ok, failed = await asyncio.gather(
+        client.get("a"),
+        client.hget("a", "f"),
+        return_exceptions=True,
+    )
+
+    assert ok == "get:a"
+    assert isinstance(failed, ResponseError)
+
+
+@pytest.mark.asyncio
+async def test_max_batch_flushes_early():
+    inner = FakeRedis()
+    client = AutoBatchingRedis(inner, max_batch=2)
+
+    await asyncio.gather(*(client.incr(str(i)) for i in range(5)))
+
+    assert [len(batch) for batch in inner.batches] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_unbatched_commands_pass_through():
+    client = AutoBatchingRedis(FakeRedis())
+
+    assert await client.ping() is True
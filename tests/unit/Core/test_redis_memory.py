@@ -0,0 +1,195 @@
+import pytest
+from redis.exceptions import ResponseError
+
+import app.core.redis
+from app.core.config import settings
+from app.core.redis import create_redis_client
+from app.core.redis_memory import InMemoryRedis
+from app.core.security.otp_store import HashOTPStore, KeyspaceOTPStore
+from app.core.security.request_rate_limit import RateLimitRule, RequestRateLimiter
+from app.domain.auth.otp_purpose import OTPPurpose
+from app.domain.auth.otp_state import OTPAggregateLimit, OTPVerifyStatus
+from app.interegation.SMS.dead_letter import list_dead_letters, record_dead_letter
+
+PHONE = "+919876543210"
+PURPOSE = OTPPurpose.LOGIN
+OTP_HASH = "ab" * 32
+SEND_LIMITS = dict(cooldown=30, max_in_window=3, window=600, daily_limit=10, daily_ttl=86400)
+VERIFY_LIMITS = dict(max_attempts=3, fail_ttl=600, lock_ttl=900)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def redis(clock, monkeypatch):
+    client = InMemoryRedis(clock=clock)
+    monkeypatch.setattr(app.core.redis, "redis_client", client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_ttl_semantics(redis, clock):
+    await redis.set("k", "v", ex=10)
+    assert await redis.ttl("k") == 10
+    assert await redis.ttl("missing") == -2
+
+    clock.now += 4.4
+    assert await redis.pttl("k") == 5600
+    assert await redis.incr("n") == 1
+    assert await redis.ttl("n") == -1
+
+    # SET replaces the TTL, INCR keeps it
+    await redis.set("k", "w")
+    assert await redis.ttl("k") == -1
+    await redis.expire("n", 5)
+    await redis.incr("n")
+    assert await redis.ttl("n") == 5
+
+    clock.now += 5
+    assert await redis.get("n") is None
+    assert await redis.exists("k", "n") == 1
+
+    await redis.expire("k", 0)
+    assert await redis.exists("k") == 0
+
+
+@pytest.mark.asyncio
+async def test_wrong_type_and_non_integer_errors(redis):
+    await redis.hset("h", "f", "1")
+    await redis.set("s", "abc")
+
+    with pytest.raises(ResponseError):
+        await redis.get("h")
+    with pytest.raises(ResponseError):
+        await redis.incr("s")
+
+
+@pytest.mark.asyncio
+async def test_scripts_run_as_lua_with_redis_reply_conversions(redis):
+    script = redis.register_script(
+        """
+        redis.call('SET', KEYS[1], ARGV[1], 'EX', 60)
+        redis.call('HSET', KEYS[2], 'n', 1)
+        return {redis.call('INCRBY', KEYS[1], 2), redis.call('GET', KEYS[1]),
+                redis.call('HGETALL', KEYS[2]), redis.call('GET', 'missing'), 'tail'}
+        """
+    )
+
+    assert await script(keys=["counter", "hash"], args=[40]) == [42, "42", ["n", "1"], None, "tail"]
+    assert await redis.ttl("counter") == 60
+
+
+@pytest.mark.asyncio
+async def test_script_errors_surface_as_response_errors(redis):
+    await redis.set("text", "abc")
+
+    with pytest.raises(ResponseError, match="not an integer"):
+        await redis.register_script("return redis.call('INCR', KEYS[1])")(keys=["text"])
+    with pytest.raises(ResponseError, match="custom"):
+        await redis.register_script("return redis.error_reply('custom')")()
+    pcall = redis.register_script("return redis.pcall('INCR', KEYS[1])['err']")
+    assert "not an integer" in await pcall(keys=["text"])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_dead_letter_writes(redis):
+    for attempt in range(3):
+        await record_dead_letter(phone=PHONE, error=TimeoutError("slow"), attempts=attempt)
+
+    entries = await list_dead_letters(limit=2)
+
+    assert [entry["attempts"] for entry in entries] == [2, 1]
+
+
+@pytest.mark.parametrize("store_cls", [KeyspaceOTPStore, HashOTPStore])
+@pytest.mark.asyncio
+async def test_otp_store_scripts_run_in_memory(redis, clock, store_cls):
+    store = store_cls()
+
+    sent = await store.check_send_limit(PHONE, **SEND_LIMITS)
+    again = await store.check_send_limit(PHONE, **SEND_LIMITS)
+    assert sent.allowed and sent.remaining_in_window == 2
+    assert not again.allowed and again.reason == "cooldown"
+
+    await store.save_otp(PHONE, PURPOSE, OTP_HASH, ttl=120)
+    result = await store.verify_attempt(PHONE, PURPOSE, OTP_HASH, **VERIFY_LIMITS)
+    assert result.status is OTPVerifyStatus.OK
+
+    await store.save_otp(PHONE, PURPOSE, OTP_HASH, ttl=120)
+    statuses = [
+        (await store.verify_attempt(PHONE, PURPOSE, "cd" * 32, **VERIFY_LIMITS)).status
+        for _ in range(4)
+    ]
+    assert statuses == [
+        OTPVerifyStatus.MISMATCH,
+        OTPVerifyStatus.MISMATCH,
+        OTPVerifyStatus.LOCKOUT,
+        OTPVerifyStatus.LOCKED,
+    ]
+
+    clock.now += 901
+    result = await store.verify_attempt(PHONE, PURPOSE, OTP_HASH, **VERIFY_LIMITS)
+    assert result.status is OTPVerifyStatus.EXPIRED
+
+
+@pytest.mark.asyncio
+async def test_aggregate_limit_blocks_other_phones(redis):
+    store = KeyspaceOTPStore()
+    prefix = [OTPAggregateLimit("prefix", "+919876", limit=2, window=60, cooldown=300)]
+
+    verdicts = [
+        await store.check_send_limit(f"+91987654321{i}", **SEND_LIMITS, aggregates=prefix)
+        for i in range(3)
+    ]
+
+    assert [v.allowed for v in verdicts] == [True, True, False]
+    assert verdicts[-1].reason == "prefix"
+    assert verdicts[-1].retry_after == 300
+
+
+@pytest.mark.parametrize("algorithm", ["token_bucket", "sliding_log"])
+@pytest.mark.asyncio
+async def test_request_rate_limit_scripts_run_in_memory(redis, clock, algorithm):
+    limiter = RequestRateLimiter(lease_ttl=1.0, max_keys=100, clock=clock)
+    rule = RateLimitRule("mem", limit=3, window=10, algorithm=algorithm)
+
+    decisions = [await limiter.hit(rule, "k") for _ in range(4)]
+
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert 1 <= decisions[-1].retry_after <= 10
+
+
+def test_memory_backend_is_selected_by_setting(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_BACKEND", "memory")
+
+    assert isinstance(create_redis_client(), InMemoryRedis)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cluster", [False, True])
+@pytest.mark.parametrize("store_cls", [KeyspaceOTPStore, HashOTPStore])
+async def test_aggregates_only_count_allowed_sends(redis, monkeypatch, store_cls, cluster):
+    monkeypatch.setattr(settings, "REDIS_CLUSTER", cluster)
+    store = store_cls()
+    prefix = [OTPAggregateLimit("prefix", "+919876", limit=2, window=60, cooldown=300)]
+
+    # Resends during the cooldown are rejected by the per-phone checks
+    verdicts = [
+        await store.check_send_limit(PHONE, **SEND_LIMITS, aggregates=prefix)
+        for _ in range(5)
+    ]
+    other = await store.check_send_limit("+919876543211", **SEND_LIMITS, aggregates=prefix)
+
+    assert [v.reason for v in verdicts] == ["ok"] + ["cooldown"] * 4
+    assert other.allowed
@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.redis_metrics import REDIS_COMMAND_LATENCY, _key_prefix
+
+
+@pytest.mark.parametrize(
+    "args, prefix",
+    [
+        (("INCR", "otp:window:+919876543210"), "otp:window"),
+        (("GET", "otp_fail:signup:{+919876543210}"), "otp_fail:signup"),
+        (("EVALSHA", "abc123", 3, "otp:cooldown:+91", "otp:window:+91", "otp:daily:+91"), "otp:cooldown"),
+        (("EVALSHA", "abc123", 2, "otp:agg:ip:2001:db8::1", "otp:agg_block:ip:2001:db8::1"), "otp:agg"),
+        (("GET", "rl:verify_otp:device:0123abcd"), "rl"),
+        (("GET", "attacker:controlled:value"), "other"),
+        (("GET", "otp:{+919876543210}:x"), "other"),
+        (("EVALSHA", "abc123", 0), "-"),
+        (("PING",), "-"),
+    ],
+)
+def test_key_prefix_comes_from_the_allow_list(args, prefix):
+    assert _key_prefix(args) == prefix
+
+
+def _count(command: str, prefix: str) -> float:
+    for metric in REDIS_COMMAND_LATENCY.collect():
+        for sample in metric.samples:
+            if (
+                sample.name.endswith("_count")
+                and sample.labels == {"command": command, "key_prefix": prefix}
+            ):
+                return sample.value
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_instrumented_client_observes_each_command(mocker):
+    from redis.asyncio import Redis
+    from app.core.redis_metrics import InstrumentedRedis
+
+    mocker.patch.object(Redis, "execute_command", return_value=1)
+    client = InstrumentedRedis()
+    before = _count("get", "otp:daily")
+
+    await client.get("otp:daily:+919876543210")
+
+    assert _count("get", "otp:daily") == before + 1
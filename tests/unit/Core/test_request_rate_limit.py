@@ -0,0 +1,134 @@
+import re
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.config import settings
+from app.core.security.request_rate_limit import (
+    RateLimitRule,
+    RequestRateLimiter,
+)
+
+RULE = RateLimitRule("test", limit=100, window=60, key_by=("ip",))
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RequestRateLimiter(lease_ttl=1.0, max_keys=100, clock=clock)
+
+
+def test_key_requires_every_dimension():
+    rule = RateLimitRule("r", limit=1, window=1, key_by=("ip", "device"))
+
+    key = rule.key_for({"ip": "203.0.113.7", "device": "d1"})
+    assert re.fullmatch(r"rl:r:[0-9a-f]{32}", key)
+    assert rule.key_for({"ip": "203.0.113.7", "device": "d2"}) != key
+    assert rule.key_for({"ip": "203.0.113.7", "device": None}) is None
+
+
+def test_key_does_not_embed_client_values():
+    rule = RateLimitRule("r", limit=5, window=60, key_by=("ip", "device"))
+
+    key = rule.key_for({"ip": "2001:db8::1", "device": "x" * 10_000 + ":evil"})
+
+    assert key.count(":") == 2
+    assert len(key) == len("rl:r:") + 32
+
+
+def test_rule_rejects_unknown_algorithm():
+    with pytest.raises(ValueError):
+        RateLimitRule("r", limit=1, window=1, algorithm="leaky")
+
+
+@pytest.mark.asyncio
+async def test_lease_is_served_locally_until_used_up(mocker, monkeypatch, limiter):
+    monkeypatch.setattr(settings, "RATE_LIMIT_LOCAL_SHARE", 0.05)
+    script = mocker.patch(
+        "app.core.security.request_rate_limit._token_bucket_script",
+        new=AsyncMock(return_value=[5, 0]),
+    )
+
+    decisions = [await limiter.hit(RULE, "k") for _ in range(6)]
+
+    assert all(d.allowed for d in decisions)
+    assert script.await_count == 2
+    assert script.call_args.kwargs["args"] == [100, 60_000, 5]
+
+
+@pytest.mark.asyncio
+async def test_lease_expires_after_ttl(mocker, limiter, clock):
+    script = mocker.patch(
+        "app.core.security.request_rate_limit._token_bucket_script",
+        new=AsyncMock(return_value=[10, 0]),
+    )
+
+    await limiter.hit(RULE, "k")
+    clock.now += 1.5
+    await limiter.hit(RULE, "k")
+
+    assert script.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rejection_is_cached_until_retry_after(mocker, limiter, clock):
+    script = mocker.patch(
+        "app.core.security.request_rate_limit._sliding_log_script",
+        new=AsyncMock(return_value=[0, 2500]),
+    )
+    rule = RateLimitRule("log", limit=3, window=10, algorithm="sliding_log")
+
+    first = await limiter.hit(rule, "k")
+    clock.now += 1
+    second = await limiter.hit(rule, "k")
+
+    assert not first.allowed and first.retry_after == 3
+    assert not second.allowed and second.retry_after == 2
+    script.assert_awaited_once()
+
+    clock.now += 2
+    await limiter.hit(rule, "k")
+    assert script.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_round_trip(mocker, limiter):
+    import asyncio
+
+    script = mocker.patch(
+        "app.core.security.request_rate_limit._token_bucket_script",
+        new=AsyncMock(return_value=[10, 0]),
+    )
+
+    decisions = await asyncio.gather(*(limiter.hit(RULE, "k") for _ in range(8)))
+
+    assert all(d.allowed for d in decisions)
+    script.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_bucket_when_redis_is_unavailable(mocker, monkeypatch, limiter):
+    from app.core.circuit_breaker import CircuitOpen
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_FALLBACK_SHARE", 0.02)
+    mocker.patch(
+        "app.core.security.request_rate_limit.redis_breaker.call",
+        new=AsyncMock(side_effect=CircuitOpen()),
+    )
+
+    decisions = [await limiter.hit(RULE, "k") for _ in range(3)]
+
+    assert [d.allowed for d in decisions] == [True, True, False]
+    assert decisions[-1].retry_after > 0
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import AsyncMock
+
+import app.core.redis
+from app.auth.OTP.engine import OTPEngine
+from app.auth.OTP.otp_exceptions import (
+    OTPExpired,
+    OTPLocked,
+    OTPMismatch,
+    OTPRateLimitExceeded,
+)
+from app.core.security.otp import OTP_EXPIRY, OTP_VERIFY_MAX_ATTEMPTS
+from app.core.redis_memory import InMemoryRedis
+from app.core.security.otp_store import get_otp_store
+from app.domain.auth.otp_purpose import OTPPurpose
+
+PHONE = "+919876543210"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def engine(clock, mocker, monkeypatch):
+    mocker.patch("app.auth.OTP.engine.generate_otp", return_value="123456")
+    monkeypatch.setattr(app.core.redis, "redis_client", InMemoryRedis(clock=clock))
+    return OTPEngine(get_otp_store(), deliver=AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_send_then_verify_consumes_otp(engine):
+    await engine.send("98765 43210", OTPPurpose.LOGIN)
+
+    engine._deliver.assert_awaited_once_with(
+        PHONE, "Your OTP is 123456", lane=OTPPurpose.LOGIN.value
+    )
+    await engine.verify(PHONE, "123456", OTPPurpose.LOGIN)
+    with pytest.raises(OTPExpired):
+        await engine.verify(PHONE, "123456", OTPPurpose.LOGIN)
+
+
+@pytest.mark.asyncio
+async def test_purposes_are_isolated(engine):
+    await engine.send(PHONE, OTPPurpose.SIGNUP)
+
+    with pytest.raises(OTPExpired):
+        await engine.verify(PHONE, "123456", OTPPurpose.LOGIN)
+
+
+@pytest.mark.asyncio
+async def test_resend_cooldown_applies(engine):
+    await engine.send(PHONE, OTPPurpose.LOGIN)
+
+    with pytest.raises(OTPRateLimitExceeded) as excinfo:
+        await engine.send(PHONE, OTPPurpose.LOGIN)
+    assert excinfo.value.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_failures_lock_verification(engine):
+    await engine.send(PHONE, OTPPurpose.LOGIN)
+
+    for _ in range(OTP_VERIFY_MAX_ATTEMPTS - 1):
+        with pytest.raises(OTPMismatch):
+            await engine.verify(PHONE, "000000", OTPPurpose.LOGIN)
+    with pytest.raises(OTPLocked):
+        await engine.verify(PHONE, "000000", OTPPurpose.LOGIN)
+    # Locked even for the right code
+    with pytest.raises(OTPLocked):
+        await engine.verify(PHONE, "123456", OTPPurpose.LOGIN)
+
+
+@pytest.mark.asyncio
+async def test_otp_expires(engine, clock):
+    await engine.send(PHONE, OTPPurpose.LOGIN)
+    clock.now += OTP_EXPIRY + 1
+
+    with pytest.raises(OTPExpired):
+        await engine.verify(PHONE, "123456", OTPPurpose.LOGIN)
+
+
+@pytest.mark.asyncio
+async def test_verify_costs_one_store_call(engine, mocker):
+    await engine.send(PHONE, OTPPurpose.LOGIN)
+    spy = mocker.spy(engine.store, "verify_attempt")
+    save = mocker.spy(engine.store, "save_otp")
+
+    await engine.verify(PHONE, "123456", OTPPurpose.LOGIN)
+
+    assert spy.await_count == 1
+    assert save.await_count == 0
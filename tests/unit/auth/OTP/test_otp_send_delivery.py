@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import AsyncMock
+
+import app.core.redis
+from app.auth.OTP.engine import OTPEngine
+from app.auth.OTP.otp_exceptions import OTPRateLimitExceeded
+from app.core.config import settings
+from app.core.redis_memory import InMemoryRedis
+from app.core.security.otp import OTP_EXPIRY
+from app.core.security.otp_keys import _otp_key
+from app.core.security.otp_store import get_otp_store
+from app.domain.auth.otp_purpose import OTPPurpose
+from app.interegation.SMS.base import SMSProvider
+from app.interegation.SMS.queue import SMSDeliveryQueue
+
+PHONE = "+919876543210"
+
+
+class RecordingProvider(SMSProvider):
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, phone: str, message: str) -> None:
+        self.sent.append((phone, message))
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = InMemoryRedis()
+    monkeypatch.setattr(app.core.redis, "redis_client", client)
+    monkeypatch.setattr(settings, "OTP_STATE_LAYOUT", "keys")
+    return client
+
+
+@pytest.fixture
+def sms():
+    return RecordingProvider()
+
+
+@pytest.fixture
+async def queue(sms, monkeypatch):
+    queue = SMSDeliveryQueue(sms, workers=1, maxsize=10, max_attempts=1)
+    monkeypatch.setattr(settings, "SMS_DELIVERY_MODE", "queue")
+    monkeypatch.setattr("app.interegation.SMS.delivery.get_sms_queue", lambda: queue)
+    yield queue
+    await queue.stop()
+
+
+@pytest.fixture
+def engine(redis, queue, mocker):
+    mocker.patch("app.auth.OTP.engine.generate_otp", return_value="123456")
+    return OTPEngine(get_otp_store())
+
+
+@pytest.mark.asyncio
+async def test_send_stores_otp_and_queues_one_sms(engine, queue, sms):
+    await engine.send("+91 98765 43210", OTPPurpose.SIGNUP)
+    await queue.join()
+
+    assert sms.sent == [(PHONE, "Your OTP is 123456")]
+    await engine.verify(PHONE, "123456", OTPPurpose.SIGNUP)
+
+
+@pytest.mark.asyncio
+async def test_send_sets_otp_expiry(engine, redis):
+    await engine.send(PHONE, OTPPurpose.LOGIN)
+
+    assert await redis.ttl(_otp_key(PHONE, OTPPurpose.LOGIN)) == OTP_EXPIRY
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_send_stores_and_queues_nothing(engine, redis, sms, mocker):
+    mocker.patch(
+        "app.auth.OTP.engine.enforce_otp_rate_limit",
+        new=AsyncMock(side_effect=OTPRateLimitExceeded()),
+    )
+
+    with pytest.raises(OTPRateLimitExceeded):
+        await engine.send(PHONE, OTPPurpose.LOGIN)
+
+    assert await redis.get(_otp_key(PHONE, OTPPurpose.LOGIN)) is None
+    assert sms.sent == []
+
+
+@pytest.mark.asyncio
+async def test_generate_otp_failure_propagates(engine, redis, sms, mocker):
+    mocker.patch(
+        "app.auth.OTP.engine.generate_otp",
+        side_effect=RuntimeError("OTP generation failed"),
+    )
+
+    with pytest.raises(RuntimeError):
+        await engine.send(PHONE, OTPPurpose.LOGIN)
+
+    assert await redis.get(_otp_key(PHONE, OTPPurpose.LOGIN)) is None
+    assert sms.sent == []
@@ -0,0 +1,27 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+
+from fastapi import FastAPI
+
+from app.api.v1.auth import router
+from app.domain.auth.otp_purpose import OTPPurpose
+
+
+@pytest.mark.asyncio
+async def test_signup_phone_sends_otp_with_client_ip(mocker):
+    engine = mocker.Mock(send=AsyncMock())
+    mocker.patch("app.orchestration.UserOnboarding.get_otp_engine", return_value=engine)
+    api = FastAPI()
+    api.include_router(router)
+
+    transport = httpx.ASGITransport(app=api, client=("203.0.113.7", 4321))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/auth/signup/phone", json={"phone": "+919876543210"})
+
+    assert response.status_code == 200
+    engine.send.assert_awaited_once_with(
+        "+919876543210",
+        OTPPurpose.SIGNUP,
+        client_ip="203.0.113.7",
+    )
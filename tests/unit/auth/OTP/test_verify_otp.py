@@ -7,16 +7,28 @@ from app.auth.OTP.otp_exceptions import (
     OTPExpired,
     OTPMismatch,
 )
-from app.core.security.otp import OTP_VERIFY_MAX_ATTEMPTS
+from app.core.security.hashing.otp import hash_otp
+from app.core.security.otp import (
+    OTP_VERIFY_MAX_ATTEMPTS,
+    OTP_VERIFY_WINDOW,
+    OTP_LOCKOUT_TTL,
+)
+from app.core.security.verify_rate_limit import OTPVerifyResult, OTPVerifyStatus
 from app.domain.auth.otp_purpose import OTPPurpose
-from app.core.security.otp_keys import _otp_key, _fail_key, _lock_key
+
+
+def _patch_attempt(mocker, status, fail_count=0):
+    return mocker.patch(
+        "app.auth.OTP.engine.verify_otp_attempt",
+        new=AsyncMock(return_value=OTPVerifyResult(status=status, fail_count=fail_count)),
+    )
 
 @pytest.mark.asyncio
 async def test_verify_otp_locked_phone_raises(mocker):
     phone = "+919876543210"
 
-    mocker.patch("app.auth.OTP.service.normalize_phone", return_value=phone)
-    mocker.patch("app.auth.OTP.service.redis_client.exists", new=AsyncMock(return_value=True))
+    mocker.patch("app.auth.OTP.engine.normalize_phone", return_value=phone)
+    _patch_attempt(mocker, OTPVerifyStatus.LOCKED)
 
     with pytest.raises(OTPLocked):
         await verify_otp(phone, "123456", purpose=OTPPurpose.SIGNUP)
@@ -25,9 +37,8 @@ async def test_verify_otp_locked_phone_raises(mocker):
 async def test_verify_otp_expired_or_missing(mocker):
     phone = "+919876543210"
 
-    mocker.patch("app.auth.OTP.service.normalize_phone", return_value=phone)
-    mocker.patch("app.auth.OTP.service.redis_client.get", new=AsyncMock(return_value=None))
-    mocker.patch("app.auth.OTP.service.enforce_otp_verify_rate_limit", new=AsyncMock())
+    mocker.patch("app.auth.OTP.engine.normalize_phone", return_value=phone)
+    _patch_attempt(mocker, OTPVerifyStatus.EXPIRED)
 
     with pytest.raises(OTPExpired):
         await verify_otp(phone, "123456", purpose=OTPPurpose.SIGNUP)
@@ -35,12 +46,9 @@ async def test_verify_otp_expired_or_missing(mocker):
 @pytest.mark.asyncio
 async def test_verify_otp_incorrect_otp(mocker):
     phone = "+919876543210"
-    saved_hash = "hashed_otp"
 
-    mocker.patch("app.auth.OTP.service.normalize_phone", return_value=phone)
-    mocker.patch("app.auth.OTP.service.redis_client.get", new=AsyncMock(return_value=saved_hash))
-    mocker.patch("app.auth.OTP.service.crypto_verify_otp", return_value=False)
-    mocker.patch("app.auth.OTP.service.enforce_otp_verify_rate_limit", new=AsyncMock())
+    mocker.patch("app.auth.OTP.engine.normalize_phone", return_value=phone)
+    _patch_attempt(mocker, OTPVerifyStatus.MISMATCH, fail_count=1)
 
     with pytest.raises(OTPMismatch):
         await verify_otp(phone, "999999", purpose=OTPPurpose.SIGNUP)
@@ -49,57 +57,49 @@ async def test_verify_otp_incorrect_otp(mocker):
 async def test_verify_otp_success(mocker):
     phone = "+919876543210"
     otp = "123456"
-    stored_hash = "hashed_otp"
 
-    mocker.patch("app.auth.OTP.service.normalize_phone", return_value=phone)
-    mocker.patch("app.auth.OTP.service.redis_client.get", new=AsyncMock(return_value=stored_hash))
-    mocker.patch("app.auth.OTP.service.crypto_verify_otp", return_value=True)
-    redis_delete = mocker.patch("app.auth.OTP.service.redis_client.delete", new=AsyncMock())
-    mocker.patch("app.auth.OTP.service.enforce_otp_verify_rate_limit", new=AsyncMock())
+    mocker.patch("app.auth.OTP.engine.normalize_phone", return_value=phone)
+    attempt = _patch_attempt(mocker, OTPVerifyStatus.OK)
 
     result = await verify_otp(phone, otp, purpose=OTPPurpose.SIGNUP)
     assert result is True
-    redis_delete.assert_any_call(_otp_key(phone, OTPPurpose.SIGNUP))
-    redis_delete.assert_any_call(_fail_key(phone, OTPPurpose.SIGNUP))
-    redis_delete.assert_any_call(_lock_key(phone, OTPPurpose.SIGNUP))
+    attempt.assert_awaited_once_with(
+        phone=phone,
+        purpose=OTPPurpose.SIGNUP,
+        otp_hash=hash_otp(otp=otp, identifier=phone),
+        max_attempts=OTP_VERIFY_MAX_ATTEMPTS,
+        fail_ttl=OTP_VERIFY_WINDOW,
+        lock_ttl=OTP_LOCKOUT_TTL,
+        store=mocker.ANY,
+    )
 
 @pytest.mark.asyncio
-async def test_verify_otp_clears_failed_attempts_on_success(mocker):
+async def test_verify_otp_uses_single_atomic_attempt(mocker):
     phone = "+919876543210"
-    stored_hash = "hashed_otp"
 
-    mocker.patch("app.auth.OTP.service.normalize_phone", return_value=phone)
-    mocker.patch("app.auth.OTP.service.redis_client.get", new=AsyncMock(return_value=stored_hash))
-    mocker.patch("app.auth.OTP.service.crypto_verify_otp", return_value=True)
-    redis_delete = mocker.patch("app.auth.OTP.service.redis_client.delete", new=AsyncMock())
-    mocker.patch("app.auth.OTP.service.enforce_otp_verify_rate_limit", new=AsyncMock())
+    mocker.patch("app.auth.OTP.engine.normalize_phone", return_value=phone)
+    attempt = _patch_attempt(mocker, OTPVerifyStatus.OK)
 
     await verify_otp(phone, "123456", purpose=OTPPurpose.SIGNUP)
-    redis_delete.assert_any_call(_fail_key(phone, OTPPurpose.SIGNUP))
+    assert attempt.await_count == 1
 
 @pytest.mark.asyncio
-async def test_verify_otp_deletes_otp_after_success(mocker):
+async def test_verify_otp_malformed_input_counts_as_failure(mocker):
     phone = "+919876543210"
-    stored_hash = "hashed_otp"
 
-    mocker.patch("app.auth.OTP.service.normalize_phone", return_value=phone)
-    mocker.patch("app.auth.OTP.service.redis_client.get", new=AsyncMock(return_value=stored_hash))
-    mocker.patch("app.auth.OTP.service.crypto_verify_otp", return_value=True)
-    redis_delete = mocker.patch("app.auth.OTP.service.redis_client.delete", new=AsyncMock())
-    mocker.patch("app.auth.OTP.service.enforce_otp_verify_rate_limit", new=AsyncMock())
+    mocker.patch("app.auth.OTP.engine.normalize_phone", return_value=phone)
+    attempt = _patch_attempt(mocker, OTPVerifyStatus.MISMATCH, fail_count=1)
 
-    await verify_otp(phone, "123456", purpose=OTPPurpose.SIGNUP)
-    redis_delete.assert_any_call(_otp_key(phone, OTPPurpose.SIGNUP))
+    with pytest.raises(OTPMismatch):
+        await verify_otp(phone, "12ab56", purpose=OTPPurpose.SIGNUP)
+    assert attempt.call_args.kwargs["otp_hash"] == ""
 
 @pytest.mark.asyncio
 async def test_verify_otp_eventually_locks_after_max_attempts(mocker):
     phone = "+919876543210"
-    stored_hash = "hashed_otp"
 
-    mocker.patch("app.auth.OTP.service.normalize_phone", return_value=phone)
-    mocker.patch("app.auth.OTP.service.redis_client.get", new=AsyncMock(return_value=stored_hash))
-    mocker.patch("app.auth.OTP.service.crypto_verify_otp", return_value=False)
-    mocker.patch("app.auth.OTP.service.enforce_otp_verify_rate_limit", new=AsyncMock())
+    mocker.patch("app.auth.OTP.engine.normalize_phone", return_value=phone)
+    _patch_attempt(mocker, OTPVerifyStatus.LOCKOUT, fail_count=5)
 
-    with pytest.raises(OTPMismatch):
+    with pytest.raises(OTPLocked):
         await verify_otp(phone, "000000", purpose=OTPPurpose.SIGNUP)
@@ -0,0 +1,88 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+import app.db.session as db_session
+from app.core.config import settings
+from app.db.pool_metrics import InstrumentedPoolMixin, observe_pool
+from app.db.session import create_db_engine, warm_up
+
+
+class _Pool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_engine_uses_pool_settings(monkeypatch):
+    captured = {}
+    monkeypatch.setattr(
+        db_session, "create_async_engine", lambda url, **kw: captured.update(kw, url=url)
+    )
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+
+    create_db_engine("postgresql+asyncpg://u:p@db/app", name="replica")
+
+    assert captured["pool_size"] == 7
+    assert captured["pool_recycle"] == settings.DB_POOL_RECYCLE
+    assert captured["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+    assert captured["pool_logging_name"] == "replica"
+    assert captured["connect_args"] == {
+        "prepared_statement_cache_size": 0,
+        "statement_cache_size": 0,
+    }
+
+
+def test_pool_records_checkout_time_timeouts_and_saturation():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=_Pool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+        pool_logging_name="unit",
+    )
+    observe_pool(SimpleNamespace(sync_engine=engine), "unit", capacity=1)
+    checkouts = _sample("db_pool_checkout_seconds_count", pool="unit")
+    timeouts = _sample("db_pool_checkout_timeouts_total", pool="unit")
+
+    with engine.connect():
+        assert _sample("db_pool_saturation", pool="unit") == 1.0
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert _sample("db_pool_checkout_seconds_count", pool="unit") == checkouts + 2
+    assert _sample("db_pool_checkout_timeouts_total", pool="unit") == timeouts + 1
+    assert _sample("db_pool_connections", pool="unit", state="idle") == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_holds_connections_open_together():
+    open_now = peak = 0
+
+    class Conn:
+        execute = AsyncMock()
+
+        async def __aenter__(self):
+            nonlocal open_now, peak
+            open_now += 1
+            peak = max(peak, open_now)
+            return self
+
+        async def __aexit__(self, *exc_info):
+            nonlocal open_now
+            open_now -= 1
+
+    engine = SimpleNamespace(connect=Conn)
+
+    await warm_up(engine, 3)
+
+    assert peak == 3
+    assert Conn.execute.await_count == 3
@@ -0,0 +1,59 @@
+import pytest
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+import app.db.session as db_session
+from app.db.session import READ_REPLICA, RoutingSession
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Row(_Base):
+    __tablename__ = "routing_rows"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    source: Mapped[str]
+
+
+def _engine(source):
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO routing_rows VALUES (1, '{source}')"))
+    return engine
+
+
+@pytest.fixture
+def session(monkeypatch):
+    replica = _engine("replica")
+    monkeypatch.setattr(db_session, "replica_engine", SimpleNamespace(sync_engine=replica))
+    with RoutingSession(_engine("primary")) as session:
+        yield session
+
+
+def _source(session, **kw):
+    session.expunge_all()
+    return session.execute(select(_Row.source).where(_Row.id == 1), **kw).scalar_one()
+
+
+def test_only_opted_in_reads_use_the_replica(session):
+    assert _source(session) == "primary"
+    assert _source(session, execution_options=READ_REPLICA) == "replica"
+    assert session.get(_Row, 1, execution_options=READ_REPLICA).source == "replica"
+
+
+def test_reads_stick_to_primary_after_a_write(session):
+    session.add(_Row(id=2, source="new"))
+    session.flush()
+
+    assert _source(session, execution_options=READ_REPLICA) == "primary"
+
+
+def test_reads_use_primary_without_a_replica(session, monkeypatch):
+    monkeypatch.setattr(db_session, "replica_engine", None)
+
+    assert _source(session, execution_options=READ_REPLICA) == "primary"
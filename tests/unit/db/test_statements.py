@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import Executable, create_engine
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.orm import Session
+
+import app.db.statements as statements
+from app.db.session import READ_REPLICA
+from app.db.models.User.pre_user import PreUser
+from app.db.statements import PREUSER_BY_PHONE, PREUSER_SET_STATE, preuser_update
+from app.domain.enums import PreUserOnboardingState
+from app.repository.user.pre_user import PreUserRepository
+
+
+@pytest.mark.parametrize(
+    "name",
+    [name for name in dir(statements) if name.isupper() and not name.startswith("_")],
+)
+def test_prebuilt_statements_compile(name):
+    statement = getattr(statements, name)
+
+    assert isinstance(statement, Executable)
+    statement.compile(dialect=asyncpg_dialect())
+
+
+def test_preuser_update_is_built_once_per_column_set():
+    statement = preuser_update(("risk_decision", "risk_reason"))
+
+    assert preuser_update(("risk_decision", "risk_reason")) is statement
+    assert preuser_update(("risk_reason",)) is not statement
+    assert set(statement.compile().params) == {
+        "preuser_id",
+        "new_risk_decision",
+        "new_risk_reason",
+    }
+
+
+@pytest.mark.asyncio
+async def test_repository_binds_prebuilt_statements():
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+    db.scalars.return_value = MagicMock()
+    repo = PreUserRepository()
+    evaluated_at = datetime(2024, 1, 1)
+
+    await repo.get_by_phone(db, "+919876543210", replica=True)
+    await repo.update_profile(
+        db,
+        preuser_id=7,
+        profile_data={"risk_reason": "AGE_OK", "risk_evaluated_at": evaluated_at},
+    )
+
+    select_call = db.execute.await_args
+    update_call = db.scalars.await_args
+    assert select_call.args == (PREUSER_BY_PHONE, {"phone": "+919876543210"})
+    assert select_call.kwargs == {"execution_options": READ_REPLICA}
+    assert update_call.args == (
+        preuser_update(("risk_evaluated_at", "risk_reason")),
+        {
+            "preuser_id": 7,
+            "new_risk_reason": "AGE_OK",
+            "new_risk_evaluated_at": evaluated_at,
+        },
+    )
+
+
+def test_prebuilt_updates_refresh_loaded_objects():
+    engine = create_engine("sqlite://")
+    PreUser.metadata.create_all(engine, tables=[PreUser.__table__])
+
+    with Session(engine, expire_on_commit=False) as session:
+        preuser = PreUser(
+            phone="+919876543210",
+            onboarding_state=PreUserOnboardingState.OTP_SENT,
+        )
+        session.add(preuser)
+        session.commit()
+
+        session.scalars(
+            preuser_update(("risk_decision", "risk_reason")),
+            {"preuser_id": preuser.id, "new_risk_decision": "ALLOW", "new_risk_reason": "AGE_OK"},
+        ).all()
+        session.scalars(
+            PREUSER_SET_STATE,
+            {
+                "preuser_id": preuser.id,
+                "new_onboarding_state": PreUserOnboardingState.OTP_VERIFIED,
+            },
+        ).all()
+
+        assert (preuser.risk_decision, preuser.risk_reason) == ("ALLOW", "AGE_OK")
+        assert preuser.onboarding_state == PreUserOnboardingState.OTP_VERIFIED
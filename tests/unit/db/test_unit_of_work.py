@@ -0,0 +1,157 @@
+import httpx
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+import app.db.session as db_session
+from app.api.v1.transactions import router as transactions_router
+from app.core.config import settings
+from app.db.session import (
+    DBSession,
+    UnitOfWorkStats,
+    _STATS_KEY,
+    record_units_of_work,
+    unit_of_work,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Row(_Base):
+    __tablename__ = "uow_rows"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+class FakeSession:
+    def __init__(self, commit_error: Exception | None = None) -> None:
+        self.info = {}
+        self.new, self.dirty, self.deleted = set(), set(), set()
+        self.commit = AsyncMock(side_effect=commit_error)
+        self.rollback = AsyncMock()
+
+    def add(self, obj) -> None:
+        self.new.add(obj)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+@pytest.fixture
+def session():
+    fake = FakeSession()
+    return fake, lambda: fake
+
+
+def test_session_events_count_statements_flushes_and_commits():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    stats = UnitOfWorkStats()
+
+    with Session(engine) as sync_session:
+        sync_session.info[_STATS_KEY] = stats
+        sync_session.execute(select(_Row))
+        sync_session.add(_Row(id=1))
+        sync_session.flush()
+        sync_session.commit()
+
+    assert stats == UnitOfWorkStats(statements=1, writes=1, flushes=1, commits=1)
+
+
+@pytest.mark.asyncio
+async def test_read_only_unit_of_work_skips_commit(session):
+    fake, factory = session
+
+    with record_units_of_work() as recorded:
+        async with unit_of_work(factory) as db:
+            assert db is fake
+
+    fake.commit.assert_not_awaited()
+    fake.rollback.assert_awaited_once()
+    assert recorded == [fake.info[_STATS_KEY]]
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_or_rolls_back(session):
+    fake, factory = session
+
+    async with unit_of_work(factory) as db:
+        db.add(object())
+    fake.commit.assert_awaited_once()
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(factory) as db:
+            db.add(object())
+            raise RuntimeError
+    fake.commit.assert_awaited_once()
+    fake.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_fails_the_request(monkeypatch):
+    fake = FakeSession(commit_error=RuntimeError("commit failed"))
+    monkeypatch.setattr(db_session, "AsyncSessionLocal", lambda: fake)
+    api = FastAPI()
+
+    @api.post("/write")
+    async def write(db: DBSession):
+        db.add(object())
+        return {"ok": True}
+
+    transport = httpx.ASGITransport(app=api, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/write")
+
+    assert response.status_code == 500
+    fake.rollback.assert_awaited_once()
+
+
+def _rows(*rows):
+    results = []
+    for row in rows:
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = row
+        results.append(result)
+    return AsyncMock(side_effect=results)
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_commits_once(monkeypatch):
+    fake = FakeSession()
+    sender = SimpleNamespace(id=uuid4(), balance=100)
+    receiver = SimpleNamespace(id=uuid4(), balance=0)
+    # Idempotency lookup, then both accounts locked for update
+    fake.execute = _rows(None, sender, receiver)
+    monkeypatch.setattr(db_session, "AsyncSessionLocal", lambda: fake)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    api = FastAPI()
+    api.include_router(transactions_router)
+
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/transactions/",
+            json={
+                "idempotency_key": "k-1",
+                "sender_account": str(sender.id),
+                "receiver_account": str(receiver.id),
+                "amount": "10",
+                "currency": "INR",
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "SUCCESS"
+    assert fake.execute.await_count == 3
+    fake.commit.assert_awaited_once()
+    fake.rollback.assert_not_awaited()
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.interegation.SMS.base import SMSProvider, SMSDeliveryError
+from app.interegation.SMS.hedged import HedgedSMSProvider, LatencyEWMA
+
+PHONE = "+919876543210"
+
+
+class TimedProvider(SMSProvider):
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+
+    async def send(self, phone: str, message: str) -> None:
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise SMSDeliveryError("gateway down")
+        self.completed += 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    primary, secondary = TimedProvider(0.01), TimedProvider(0.01)
+    hedged = HedgedSMSProvider({"a": primary, "b": secondary}, hedge_delay=0.1)
+
+    await hedged.send(PHONE, "x")
+
+    assert primary.completed == 1
+    assert secondary.started == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    primary, secondary = TimedProvider(1.0), TimedProvider(0.01)
+    hedged = HedgedSMSProvider({"a": primary, "b": secondary}, hedge_delay=0.05)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await hedged.send(PHONE, "x")
+
+    assert loop.time() - started < 0.5
+    assert secondary.completed == 1
+    assert primary.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_fails_over_without_waiting():
+    primary, secondary = TimedProvider(0.0, fail=True), TimedProvider(0.0)
+    hedged = HedgedSMSProvider({"a": primary, "b": secondary}, hedge_delay=5.0)
+
+    await asyncio.wait_for(hedged.send(PHONE, "x"), timeout=1.0)
+
+    assert secondary.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_all_providers_failing_raises():
+    hedged = HedgedSMSProvider(
+        {"a": TimedProvider(0.0, fail=True), "b": TimedProvider(0.0, fail=True)},
+        hedge_delay=0.01,
+    )
+
+    with pytest.raises(SMSDeliveryError):
+        await hedged.send(PHONE, "x")
+
+
+@pytest.mark.asyncio
+async def test_ewma_promotes_faster_provider_to_primary():
+    slow, fast = TimedProvider(0.05), TimedProvider(0.0)
+    hedged = HedgedSMSProvider({"slow": slow, "fast": fast}, hedge_delay=1.0)
+
+    # First sends sample each provider once
+    await hedged.send(PHONE, "x")
+    await hedged.send(PHONE, "x")
+    await hedged.send(PHONE, "x")
+
+    estimates = hedged.latency_estimates
+    assert estimates["fast"] < estimates["slow"]
+    assert fast.completed == 2
+    assert slow.completed == 1
+
+
+def test_ewma_smoothing():
+    ewma = LatencyEWMA(alpha=0.5)
+    ewma.observe(1.0)
+    ewma.observe(3.0)
+
+    assert ewma.value == 2.0
@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.interegation.SMS.base import SMSDeliveryError, SMSRejected
+from app.interegation.SMS.http import HTTPSMSProvider
+from app.interegation.SMS.stub_gateway import create_stub_gateway
+
+PHONE = "+919876543210"
+
+
+def _provider(gateway, **kwargs) -> HTTPSMSProvider:
+    return HTTPSMSProvider(
+        base_url="http://stub",
+        transport=httpx.ASGITransport(app=gateway),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_reaches_gateway():
+    gateway = create_stub_gateway()
+    provider = _provider(gateway)
+
+    await provider.send(PHONE, "Your OTP is 123456")
+    await provider.aclose()
+
+    assert gateway.state.stats.accepted == 1
+    assert PHONE in gateway.state.stats.recipients
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "status, error",
+    [(503, SMSDeliveryError), (429, SMSDeliveryError), (400, SMSRejected)],
+)
+async def test_gateway_errors_are_classified(status, error):
+    provider = _provider(create_stub_gateway(error_rate=1.0, error_status=status))
+
+    with pytest.raises(error) as excinfo:
+        await provider.send(PHONE, "x")
+    await provider.aclose()
+
+    if error is SMSDeliveryError:
+        assert not isinstance(excinfo.value, SMSRejected)
+
+
+@pytest.mark.asyncio
+async def test_timeout_raises_delivery_error():
+    def timeout(request):
+        raise httpx.ReadTimeout("gateway too slow", request=request)
+
+    provider = HTTPSMSProvider(
+        base_url="http://stub",
+        transport=httpx.MockTransport(timeout),
+    )
+
+    with pytest.raises(SMSDeliveryError):
+        await provider.send(PHONE, "x")
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    in_flight = 0
+    peak = 0
+
+    async def app(scope, receive, send):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        await send({"type": "http.response.start", "status": 202, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    provider = _provider(app, max_concurrency=3)
+
+    await asyncio.gather(*(provider.send(PHONE, "x") for _ in range(10)))
+    await provider.aclose()
+
+    assert peak == 3
+
+
+def test_celery_task_closes_the_client_of_each_run(mocker):
+    from app.tasks.sms import send_sms
+
+    provider = HTTPSMSProvider(
+        base_url="http://stub",
+        transport=httpx.MockTransport(lambda request: httpx.Response(202)),
+    )
+    mocker.patch("app.tasks.sms.get_sms_provider", return_value=provider)
+    closed = mocker.spy(httpx.AsyncClient, "aclose")
+
+    send_sms.apply(args=(PHONE, "x"))
+    send_sms.apply(args=(PHONE, "x"))
+
+    assert closed.call_count == 2
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.config import settings
+from app.interegation.SMS.base import SMSProvider, SMSQueueFull
+from app.interegation.SMS.queue import SMSDeliveryQueue, SMSMessage
+
+PHONE = "+919876543210"
+
+
+class FlakyProvider(SMSProvider):
+    def __init__(self, failures: int, delay: float = 0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+
+    async def send(self, phone: str, message: str) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise ConnectionError("gateway down")
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "SMS_RETRY_BASE_DELAY", 0.001)
+    monkeypatch.setattr(settings, "SMS_RETRY_MAX_DELAY", 0.001)
+
+
+@pytest.fixture
+def dead_letter(mocker):
+    return mocker.patch(
+        "app.interegation.SMS.queue.record_dead_letter",
+        new=AsyncMock(),
+    )
+
+
+async def _settle(queue: SMSDeliveryQueue) -> None:
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if not queue.retrying and not queue.depth:
+            break
+    await queue.join()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_before_slow_provider_finishes(dead_letter):
+    provider = FlakyProvider(failures=0, delay=0.2)
+    queue = SMSDeliveryQueue(provider, workers=1, maxsize=10, max_attempts=3)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    queue.enqueue(PHONE, "Your OTP is 123456")
+    assert loop.time() - started < 0.05
+
+    await queue.stop()
+    assert provider.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried_until_it_succeeds(dead_letter):
+    provider = FlakyProvider(failures=2)
+    queue = SMSDeliveryQueue(provider, workers=1, maxsize=10, max_attempts=3)
+
+    queue.enqueue(PHONE, "Your OTP is 123456")
+    await _settle(queue)
+    await queue.stop()
+
+    assert provider.calls == 3
+    dead_letter.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_are_dead_lettered(dead_letter):
+    provider = FlakyProvider(failures=10)
+    queue = SMSDeliveryQueue(provider, workers=1, maxsize=10, max_attempts=3)
+
+    queue.enqueue(PHONE, "Your OTP is 123456")
+    await _settle(queue)
+    await queue.stop()
+
+    assert provider.calls == 3
+    dead_letter.assert_awaited_once()
+    assert dead_letter.call_args.kwargs["phone"] == PHONE
+    assert dead_letter.call_args.kwargs["attempts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_new_messages(dead_letter):
+    provider = FlakyProvider(failures=0, delay=0.5)
+    queue = SMSDeliveryQueue(provider, workers=1, maxsize=1, max_attempts=1)
+
+    queue.enqueue(PHONE, "a")
+    await asyncio.sleep(0)  # worker takes the first message
+    queue.enqueue(PHONE, "b")
+
+    with pytest.raises(SMSQueueFull):
+        queue.enqueue(PHONE, "c")
+
+    await queue.stop(timeout=0.01)
+    # "b" never got a worker before shutdown
+    dead_letter.assert_awaited_once()
+
+
+class RecordingProvider(SMSProvider):
+    def __init__(self):
+        self.bodies = []
+
+    async def send(self, phone: str, message: str) -> None:
+        self.bodies.append(message)
+
+
+LANES = {"login": (3, 1.0), "signup": (1, 0.5)}
+
+
+@pytest.mark.asyncio
+async def test_lanes_are_served_by_weight(dead_letter):
+    provider = RecordingProvider()
+    queue = SMSDeliveryQueue(
+        provider, workers=1, maxsize=100, max_attempts=1, lanes=LANES
+    )
+
+    for i in range(8):
+        queue.enqueue(PHONE, f"signup-{i}", lane="signup")
+    for i in range(8):
+        queue.enqueue(PHONE, f"login-{i}", lane="login")
+    await queue.stop()
+
+    first_eight = provider.bodies[:8]
+    assert sum(b.startswith("login") for b in first_eight) == 6
+
+
+@pytest.mark.asyncio
+async def test_low_priority_lane_is_shed_first(dead_letter):
+    provider = FlakyProvider(failures=0, delay=1.0)
+    queue = SMSDeliveryQueue(
+        provider, workers=1, maxsize=4, max_attempts=1, lanes=LANES
+    )
+    queue.start()
+
+    queue.enqueue(PHONE, "a", lane="signup")
+    queue.enqueue(PHONE, "b", lane="signup")
+
+    assert not queue.accepts("signup")
+    with pytest.raises(SMSQueueFull):
+        queue.enqueue(PHONE, "c", lane="signup")
+
+    assert queue.accepts("login")
+    queue.enqueue(PHONE, "d", lane="login")
+    queue.enqueue(PHONE, "e", lane="login")
+
+    await queue.stop(timeout=0.01)
+
+
+
+@pytest.mark.asyncio
+async def test_retry_over_capacity_is_dead_lettered_before_stop_returns(dead_letter):
+    provider = FlakyProvider(failures=0, delay=0.5)
+    queue = SMSDeliveryQueue(provider, workers=1, maxsize=1, max_attempts=3)
+    queue.enqueue(PHONE, "a")
+    await asyncio.sleep(0)  # worker takes the first message
+    queue.enqueue(PHONE, "b")
+
+    # A backoff expiring while the queue is full
+    queue._requeue(SMSMessage(phone=PHONE, body="c", lane="default"), ConnectionError())
+    await queue.stop(timeout=0.01)
+
+    # "b" was never sent; "c" had no room to go back into the queue
+    assert dead_letter.await_count == 2
+    assert not queue._dead_letter_tasks
@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+import app.repository.user.pre_user as pre_user
+from app.db.models.User.pre_user import PreUser
+from app.repository.user.pre_user import PreUserRepository, _upsert_statement
+
+
+def _db(rows_per_call):
+    db = AsyncMock()
+    results = []
+    for rows in rows_per_call:
+        result = MagicMock()
+        result.one.return_value = rows[0] if rows else None
+        result.one_or_none.return_value = rows[0] if rows else None
+        result.all.return_value = rows
+        results.append(result)
+    db.scalars.side_effect = results
+    return db
+
+
+def test_upsert_statement_is_single_insert_on_conflict_returning():
+    sql = str(
+        _upsert_statement([{"phone": "+919876543210", "onboarding_state": "otp_verified"}])
+        .compile(dialect=postgresql.dialect())
+    )
+
+    assert sql.startswith("INSERT INTO pre_users")
+    assert "ON CONFLICT (phone) DO UPDATE SET onboarding_state = excluded.onboarding_state" in sql
+    assert "RETURNING pre_users.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_upsert_by_phone_is_one_statement():
+    row = object()
+    db = _db([[row]])
+
+    preuser = await PreUserRepository().upsert_by_phone(
+        db, phone="+919876543210", onboarding_state="otp_verified"
+    )
+
+    assert preuser is row
+    assert db.scalars.await_count == 1
+    db.commit.assert_not_awaited()
+    db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_dedupes_and_batches(monkeypatch):
+    monkeypatch.setattr(pre_user, "UPSERT_BATCH_SIZE", 2)
+    db = _db([["a", "b"], ["c"]])
+
+    preusers = await PreUserRepository().upsert_many_by_phone(
+        db, phones=["+911", "+912", "+911", "+913"], onboarding_state="otp_verified"
+    )
+
+    assert preusers == ["a", "b", "c"]
+    batches = [call.args[0].compile().params for call in db.scalars.await_args_list]
+    assert [p for p in batches[0] if p.startswith("phone")] == ["phone_m0", "phone_m1"]
+    assert batches[1]["phone_m0"] == "+913"
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_transition_is_one_guarded_update_returning():
+    row = object()
+    db = _db([[row]])
+
+    preuser = await PreUserRepository().transition_by_phone(
+        db,
+        phone="+919876543210",
+        from_state="OTP_VERIFIED",
+        to_state="CREDENTIALS_SET",
+        write_once=PreUser.hashed_password,
+        values={"hashed_password": "h"},
+    )
+
+    sql = str(db.scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE pre_users SET")
+    assert (
+        "WHERE pre_users.phone = %(phone_1)s"
+        " AND pre_users.onboarding_state = %(onboarding_state_1)s"
+        " AND pre_users.hashed_password IS NULL"
+    ) in sql
+    assert "RETURNING pre_users.id" in sql
+    assert preuser is row
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_transition_without_match_returns_none():
+    db = _db([[]])
+
+    preuser = await PreUserRepository().transition_by_phone(
+        db, phone="+919876543210", from_state="OTP_VERIFIED", to_state="CREDENTIALS_SET"
+    )
+
+    assert preuser is None
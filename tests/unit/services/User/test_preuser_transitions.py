@@ -0,0 +1,110 @@
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from sqlalchemy.exc import NoResultFound
+
+from app.domain.enums import PreUserOnboardingState
+from app.services.User.preuser_credentials import (
+    CredentialsAlreadySet,
+    InvalidPreUserState,
+    set_preuser_password,
+)
+from app.services.User.preuser_profile import (
+    InvalidPreUserState as ProfileInvalidState,
+    ProfileAlreadyCompleted,
+    complete_basic_profile,
+)
+
+PHONE = "+919876543210"
+PROFILE = dict(first_name="A", last_name="B", date_of_birth=date(1990, 1, 1), address="X")
+
+
+@pytest.fixture
+def hash_async(mocker):
+    return mocker.patch(
+        "app.services.User.preuser_credentials.PasswordHasher.hash_async",
+        new=AsyncMock(return_value="hashed"),
+    )
+
+
+@pytest.fixture
+def repo(mocker, hash_async):
+    repo = AsyncMock()
+    mocker.patch("app.services.User.preuser_credentials.PreUserRepository", return_value=repo)
+    mocker.patch("app.services.User.preuser_profile.PreUserRepository", return_value=repo)
+    repo.get_by_phone.return_value = SimpleNamespace(
+        onboarding_state=PreUserOnboardingState.OTP_VERIFIED, hashed_password=None
+    )
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_set_password_is_one_transition(repo):
+    updated = SimpleNamespace(onboarding_state=PreUserOnboardingState.CREDENTIALS_SET)
+    repo.transition_by_phone.return_value = updated
+
+    assert await set_preuser_password(db=None, phone=PHONE, raw_password="pw") is updated
+
+    kwargs = repo.transition_by_phone.await_args.kwargs
+    assert kwargs["from_state"] == PreUserOnboardingState.OTP_VERIFIED
+    assert kwargs["values"] == {"hashed_password": "hashed"}
+    repo.get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "preuser, error",
+    [
+        (SimpleNamespace(onboarding_state=PreUserOnboardingState.OTP_SENT, hashed_password=None),
+         InvalidPreUserState),
+        (SimpleNamespace(onboarding_state=PreUserOnboardingState.OTP_VERIFIED, hashed_password="h"),
+         CredentialsAlreadySet),
+        (NoResultFound(), NoResultFound),
+    ],
+)
+async def test_set_password_rejects_before_hashing(repo, hash_async, preuser, error):
+    if isinstance(preuser, Exception):
+        repo.get_by_phone.side_effect = preuser
+    else:
+        repo.get_by_phone.return_value = preuser
+
+    with pytest.raises(error):
+        await set_preuser_password(db=None, phone=PHONE, raw_password="pw")
+
+    hash_async.assert_not_awaited()
+    repo.transition_by_phone.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_set_password_maps_lost_race(repo):
+    preuser = repo.get_by_phone.return_value
+    repo.transition_by_phone.return_value = None
+
+    async def concurrent_write(obj):
+        obj.hashed_password = "other"
+
+    db = AsyncMock()
+    db.refresh.side_effect = concurrent_write
+    with pytest.raises(CredentialsAlreadySet):
+        await set_preuser_password(db=db, phone=PHONE, raw_password="pw")
+
+    db.refresh.assert_awaited_once_with(preuser)
+
+
+@pytest.mark.asyncio
+async def test_complete_profile_maps_failed_transition(repo):
+    repo.transition_by_phone.return_value = None
+
+    repo.get_by_phone.return_value = SimpleNamespace(
+        onboarding_state=PreUserOnboardingState.OTP_VERIFIED
+    )
+    with pytest.raises(ProfileInvalidState):
+        await complete_basic_profile(db=None, phone=PHONE, **PROFILE)
+
+    repo.get_by_phone.return_value = SimpleNamespace(
+        onboarding_state=PreUserOnboardingState.CREDENTIALS_SET
+    )
+    with pytest.raises(ProfileAlreadyCompleted):
+        await complete_basic_profile(db=None, phone=PHONE, **PROFILE)
@@ -0,0 +1,70 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.security.hashing.issued_secrets import digest_secret, hash_secret, is_digest
+from app.db.statements import USER_AUTH_BY_REFRESH_HASH, USER_AUTH_BY_USER_ID
+from app.services.auth.refresh_store import (
+    find_by_refresh_token,
+    store_refresh_token,
+    verify_refresh_token,
+)
+
+USER_ID = "5f0c6a8e-0000-4000-8000-000000000001"
+TOKEN = "refresh-token-abc"
+
+
+def _db(row):
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalar_one.return_value = row
+    result.scalar_one_or_none.return_value = row
+    db.execute.return_value = result
+    return db
+
+
+@pytest.mark.asyncio
+async def test_stored_digest_is_found_with_one_point_query():
+    auth = SimpleNamespace(refresh_token_hash=None)
+    await store_refresh_token(db=_db(auth), user_id=USER_ID, refresh_token=TOKEN)
+    assert auth.refresh_token_hash == digest_secret(TOKEN)
+
+    db = _db(auth)
+    assert await find_by_refresh_token(db=db, refresh_token=TOKEN) is auth
+
+    db.execute.assert_awaited_once_with(
+        USER_AUTH_BY_REFRESH_HASH, {"refresh_token_hash": auth.refresh_token_hash}
+    )
+
+
+@pytest.mark.asyncio
+async def test_verify_accepts_digest_rows_without_rewriting():
+    stored = digest_secret(TOKEN)
+    auth = SimpleNamespace(refresh_token_hash=stored)
+    db = _db(auth)
+
+    assert await verify_refresh_token(db=db, user_id=USER_ID, refresh_token=TOKEN)
+    assert not await verify_refresh_token(db=db, user_id=USER_ID, refresh_token="other")
+
+    assert auth.refresh_token_hash == stored
+    assert db.execute.await_args.args == (USER_AUTH_BY_USER_ID, {"user_id": USER_ID})
+
+
+@pytest.mark.asyncio
+async def test_verify_upgrades_legacy_argon2_rows_to_digests():
+    legacy = hash_secret(TOKEN)
+    auth = SimpleNamespace(refresh_token_hash=legacy)
+
+    assert not await verify_refresh_token(db=_db(auth), user_id=USER_ID, refresh_token="other")
+    assert auth.refresh_token_hash == legacy
+
+    assert await verify_refresh_token(db=_db(auth), user_id=USER_ID, refresh_token=TOKEN)
+    assert is_digest(auth.refresh_token_hash)
+    # Upgraded rows are then reachable by digest lookup
+    assert auth.refresh_token_hash == digest_secret(TOKEN)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("auth", [None, SimpleNamespace(refresh_token_hash=None)])
+async def test_verify_rejects_missing_tokens(auth):
+    assert not await verify_refresh_token(db=_db(auth), user_id=USER_ID, refresh_token=TOKEN)